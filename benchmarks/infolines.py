@@ -0,0 +1,85 @@
+"""Parsing throughput for colon-formatted key listings.
+
+Compares the lightweight ColonRecord layer (parse_record) against building pydantic InfoLine models
+(parse_infoline, and the previous two-pass InfoLine.from_line + subclass parse) on a synthetic listing.
+
+Usage:
+    python -m benchmarks.infolines [--lines 1000000] [--model-lines 100000]
+"""
+
+import argparse
+import time
+from gpyg.models import InfoLine, parse_infoline, parse_record
+from gpyg.models.infolines import RECORD_TYPES
+
+BLOCK = [
+    "pub:u:3072:1:{id}:1760723963:::u:::scESC:::::::23::0:",
+    "fpr:::::::::{fpr}:",
+    "grp:::::::::{grp}:",
+    "uid:u::::1760723963::{hash}::Test User {n} <test-user-{n}@example.com>::::::::::0:",
+    "sig:!::1:{id}:1760723963::::Test User {n} <test-user-{n}@example.com>:13x::{fpr}:::10:",
+    "sub:u:3072:1:{sub}:1760723963::::::e:::::::23:",
+    "fpr:::::::::{subfpr}:",
+    "grp:::::::::{subgrp}:",
+    "sig:!::1:{id}:1760723963::::::18x::{fpr}:::10:",
+]
+
+
+def synthetic_listing(lines: int) -> list[str]:
+    result = ["tru::1:1760723963:0:3:1:5"]
+    n = 0
+    while len(result) < lines:
+        values = dict(
+            n=n,
+            id=f"{n:016X}",
+            sub=f"{n + 2**40:016X}",
+            fpr=f"{n:040X}",
+            subfpr=f"{n + 2**40:040X}",
+            grp=f"{n + 2**80:040X}",
+            subgrp=f"{n + 2**120:040X}",
+            hash=f"{n:040X}",
+        )
+        result.extend([line.format(**values) for line in BLOCK])
+        n += 1
+    return result[:lines]
+
+
+def legacy_parse(line: str) -> InfoLine:
+    initial = InfoLine.from_line(line)
+    record = RECORD_TYPES.get(initial.record_type)
+    return record.model.from_line(line) if record else initial
+
+
+def measure(name: str, lines: list[str], function) -> None:
+    start = time.perf_counter()
+    for line in lines:
+        function(line)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<36} {len(lines):>9} lines  {elapsed:>8.3f} s  {len(lines) / elapsed:>12,.0f} records/s")
+
+
+def touch_fields(line: str) -> None:
+    record = parse_record(line)
+    if record.record_type in ("pub", "sub"):
+        record.creation_date, record.capabilities, record.validity
+    elif record.record_type == "fpr":
+        record.fingerprint
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", default=1_000_000, type=int)
+    parser.add_argument("--model-lines", default=100_000, type=int)
+    args = parser.parse_args()
+
+    lines = synthetic_listing(args.lines)
+    sample = lines[: args.model_lines]
+
+    measure("parse_record", lines, parse_record)
+    measure("parse_record + typed fields", lines, touch_fields)
+    measure("parse_infoline (pydantic)", sample, parse_infoline)
+    measure("two-pass InfoLine.from_line", sample, legacy_parse)
+
+
+if __name__ == "__main__":
+    main()
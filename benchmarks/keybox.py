@@ -0,0 +1,57 @@
+"""Keybox reader benchmark: listing and single-key lookups served by KeyboxReader versus gpg.
+
+Generates a keyring of ed25519 keys in a temporary homedir, then times full listings and fingerprint
+lookups through `list_keys`/`get_key` (one gpg spawn each) and through `GPG.keybox` (no spawns).
+
+Usage:
+    python -m benchmarks.keybox [--keys 200] [--lookups 50]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from gpyg import GPG, KeySpec
+
+
+def measure(label: str, count: int, function) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        function()
+    elapsed = (time.perf_counter() - start) / count
+    print(f"{label:<28} {elapsed * 1000:>9.2f} ms/op")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", default=200, type=int)
+    parser.add_argument("--lookups", default=50, type=int)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as homedir, GPG(homedir=homedir) as gpg:
+        gpg.keys.generate_keys(
+            [
+                KeySpec(
+                    name=f"User {n}",
+                    email=f"user-{n}@example.com",
+                    algorithm="ed25519",
+                    subkey_algorithm="cv25519",
+                )
+                for n in range(args.keys)
+            ]
+        )
+        fingerprints = gpg.keybox.fingerprints()
+        assert len(fingerprints) == args.keys
+        samples = [random.choice(fingerprints) for _ in range(args.lookups)]
+        print(f"{args.keys} keys, {args.lookups} lookups")
+
+        measure("list_keys (gpg)", 3, lambda: gpg.keys.list_keys(check_sigs=False))
+        measure("keybox.keys", 3, lambda: gpg.keybox.keys())
+        lookups = iter(samples * 2)
+        measure("get_key (gpg)", args.lookups, lambda: gpg.keys.get_key(next(lookups)))
+        measure("keybox.get_key", args.lookups, lambda: gpg.keybox.get_key(next(lookups)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Key assembly benchmark over synthetic keyrings with heavy signature counts.
+
+Measures listing output -> Key objects (KeyOperator._parse_listing) for 1k, 10k and 100k keys, and the
+previous approach (pydantic InfoLine per line, signature rescans on every key boundary, then revalidating
+every model into a Key) on the smaller keyrings for comparison.
+
+Usage:
+    python -m benchmarks.keyring [--sizes 1000,10000,100000] [--signatures 20] [--legacy-max 10000]
+"""
+
+import argparse
+import tempfile
+import time
+from gpyg import GPG, Key, KeyModel
+from gpyg.models import InfoRecord, parse_infoline
+
+KEY = [
+    "pub:f:3072:1:{id}:1760723963:::-:::scESC::::::23::0:",
+    "fpr:::::::::{fpr}:",
+    "grp:::::::::{grp}:",
+    "uid:f::::1760723963::{fpr}::User {n} <user-{n}@example.com>::::::::::0:",
+    "sig:!::1:{id}:1760723963::::User {n} <user-{n}@example.com>:13x::{fpr}:::10:",
+]
+SIGNATURE = "sig:!::1:{signer_id}:{created}::::Signer {signer} <signer-{signer}@example.com>:10x::{signer_fpr}:::10:"
+SUBKEY = [
+    "sub:f:3072:1:{sub}:1760723963::::::e::::::23:",
+    "fpr:::::::::{subfpr}:",
+    "grp:::::::::{subgrp}:",
+    "sig:!::1:{id}:1760723963::::User {n} <user-{n}@example.com>:18x::{fpr}:::10:",
+]
+
+
+def synthetic_keyring(keys: int, signatures: int) -> str:
+    lines = ["tru::1:1760723963:0:3:1:5"]
+    for n in range(keys):
+        values = dict(
+            n=n,
+            id=f"{n:016X}",
+            sub=f"{n + 2**40:016X}",
+            fpr=f"{n:040X}",
+            subfpr=f"{n + 2**40:040X}",
+            grp=f"{n + 2**80:040X}",
+            subgrp=f"{n + 2**120:040X}",
+        )
+        lines.extend([line.format(**values) for line in KEY])
+        for s in range(signatures):
+            signer = (n + s + 1) % keys
+            lines.append(
+                SIGNATURE.format(
+                    signer=signer,
+                    signer_id=f"{signer:016X}",
+                    signer_fpr=f"{signer:040X}",
+                    created=1760723964 + s,
+                )
+            )
+        lines.extend([line.format(**values) for line in SUBKEY])
+    return "\n".join(lines) + "\n"
+
+
+def legacy_get_subkeys(key: KeyModel, subkey_map: dict[str, list[KeyModel]]) -> list[KeyModel]:
+    if key.fingerprint and key.fingerprint in subkey_map.keys():
+        for subkey in subkey_map[key.fingerprint]:
+            subkey.internal_subkeys = legacy_get_subkeys(subkey, subkey_map)
+            key.internal_subkeys.append(subkey)
+        return key.internal_subkeys
+    return []
+
+
+def legacy_apply(operator, model: KeyModel) -> Key:
+    model.internal_subkeys = [legacy_apply(operator, i) for i in model.internal_subkeys]
+    return Key(operator=operator, **dict(model))
+
+
+def legacy_from_infolines(lines) -> list[KeyModel]:
+    key_mapping: dict[str, list[KeyModel]] = {"root": []}
+    context: KeyModel = None
+
+    def close(context: KeyModel):
+        initial_sigs = [
+            i for i in context.signatures if i.creation_date == context.creation_date
+        ]
+        if len(initial_sigs) == 0 or initial_sigs[0].signer_fingerprint == context.fingerprint:
+            key_mapping["root"].append(context)
+        else:
+            key_mapping.setdefault(initial_sigs[0].signer_fingerprint, []).append(context)
+
+    for line in lines:
+        if line.record_type in ["pub", "sec", "sub", "ssb"]:
+            if context:
+                close(context)
+            context = KeyModel(
+                type="public" if line.record_type in ["pub", "sub"] else "secret",
+                is_subkey=line.record_type in ["sub", "ssb"],
+                **line.model_dump(),
+            )
+        elif line.record_type in [InfoRecord.FINGERPRINT, InfoRecord.SHA256_FINGERPRINT] and context:
+            context.fingerprint = line.fingerprint
+        elif line.record_type == InfoRecord.KEYGRIP and context:
+            context.keygrip = line.keygrip
+        elif line.record_type == InfoRecord.USER_ID and context:
+            context.user_ids.append(line)
+        elif line.record_type in [InfoRecord.SIGNATURE, InfoRecord.REVOCATION_SIGNATURE] and context:
+            context.all_signatures.append(line)
+    if context:
+        close(context)
+
+    results = key_mapping["root"][:]
+    for key in results:
+        key.internal_subkeys = legacy_get_subkeys(key, key_mapping)
+    return results
+
+
+def legacy_parse(operator, output: str) -> list[Key]:
+    parsed = [parse_infoline(line) for line in output.splitlines()]
+    return [legacy_apply(operator, i) for i in legacy_from_infolines(parsed)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--signatures", default=20, type=int)
+    parser.add_argument("--legacy-max", default=10000, type=int)
+    args = parser.parse_args()
+
+    # Parsing never runs gpg, so the instance only needs an empty homedir and no agent
+    with tempfile.TemporaryDirectory() as homedir, GPG(homedir=homedir, manage_agent=False) as gpg:
+        operator = gpg.keys
+        for size in [int(i) for i in args.sizes.split(",")]:
+            output = synthetic_keyring(size, args.signatures)
+            lines = output.count("\n")
+
+            start = time.perf_counter()
+            keys = operator._parse_listing(output)
+            elapsed = time.perf_counter() - start
+            assert len(keys) == size and all([len(k.subkeys) == 1 for k in keys])
+            print(f"{size:>7} keys {lines:>9} lines  linear   {elapsed:>8.3f} s  {size / elapsed:>10,.0f} keys/s")
+
+            if size <= args.legacy_max:
+                start = time.perf_counter()
+                legacy = legacy_parse(operator, output)
+                elapsed = time.perf_counter() - start
+                assert len(legacy) == size
+                print(f"{size:>7} keys {lines:>9} lines  legacy   {elapsed:>8.3f} s  {size / elapsed:>10,.0f} keys/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Throughput benchmark for pumping large payloads through a process with ProcessSession.stream.
+Input is fed from repeated blocks and output is only counted, so neither side is held in memory.
+
+Usage:
+    python -m benchmarks.process_pump [--max-size 2G] [--command cat|gpg]
+"""
+
+import argparse
+import os
+import time
+from tempfile import TemporaryDirectory
+from gpyg import Process, ProcessSession
+
+SIZES = [2**20, 16 * 2**20, 128 * 2**20, 512 * 2**20, 2 * 2**30]
+
+
+def parse_size(value: str) -> int:
+    units = {"K": 2**10, "M": 2**20, "G": 2**30}
+    if value[-1].upper() in units:
+        return int(value[:-1]) * units[value[-1].upper()]
+    return int(value)
+
+
+def blocks(block: bytes, size: int):
+    """Yields `size` bytes of `block` repeated, so the payload is never held in memory at once"""
+    for offset in range(0, size, len(block)):
+        yield block[: size - offset]
+
+
+def consume(chunks) -> tuple[int, Process]:
+    """Drains a `ProcessSession.stream` generator, returning the output size and the finished Process"""
+    received = 0
+    while True:
+        try:
+            received += len(next(chunks))
+        except StopIteration as finished:
+            return received, finished.value
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-size", default="2G", type=parse_size)
+    parser.add_argument("--command", choices=["cat", "gpg"], default="cat")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as homedir:
+        command = (
+            ["cat"]
+            if args.command == "cat"
+            else ["gpg", "--homedir", homedir, "--batch", "-z", "0", "--store"]
+        )
+        block = os.urandom(2**20)
+        with ProcessSession() as session:
+            for size in [s for s in SIZES if s <= args.max_size]:
+                start = time.perf_counter()
+                received, process = consume(
+                    session.stream(command, input=blocks(block, size))
+                )
+                elapsed = time.perf_counter() - start
+                assert process.code == 0, process.errors[-500:]
+                assert received >= size
+                print(
+                    f"{size / 2**20:>8.0f} MiB  {elapsed:>8.3f} s  {size / 2**20 / elapsed:>9.1f} MiB/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Spawn overhead benchmark: per-call Python cost of starting a gpg process, before and after the argv fast path.
+
+"before" re-creates the previous spawn path (the command string is tokenized, re-joined and split again,
+`gpg` is looked up on PATH by Popen, and the child's descriptors are swept with close_fds). "after" is the
+current ProcessSession, which takes argv lists as-is and spawns a cached absolute path. Each call is split
+into the Python-side time to build the command and return from Popen, and the time gpg itself runs for.
+
+Usage:
+    python -m benchmarks.spawn [--calls 200]
+"""
+
+import argparse
+import shlex
+import subprocess
+import tempfile
+import time
+from gpyg import GPG, Process
+
+OPERATIONS = {
+    "version": ["gpg", "--version"],
+    "list-keys": [
+        "gpg",
+        "--with-colons",
+        "--fixed-list-mode",
+        "--with-fingerprint",
+        "--with-keygrip",
+        "--list-keys",
+    ],
+}
+
+
+def legacy_spawn(gpg: GPG, command: list[str]) -> Process:
+    parsed = shlex.split(shlex.join(shlex.split(" ".join(command))))
+    popen = subprocess.Popen(
+        parsed,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        pass_fds=(),
+        env=gpg.session.default_options["env"],
+    )
+    return Process(popen, parsed, {})
+
+
+def measure(spawn, command: list[str], calls: int) -> tuple[float, float]:
+    python, runtime = 0.0, 0.0
+    for _ in range(calls):
+        start = time.perf_counter()
+        process = spawn(command)
+        spawned = time.perf_counter()
+        process.wait()
+        python += spawned - start
+        runtime += time.perf_counter() - spawned
+    return python / calls, runtime / calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", default=200, type=int)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as homedir, GPG(homedir=homedir) as gpg:
+        gpg.keys.generate_key("Spawn", algorithm="ed25519")
+        print(f"{args.calls} calls per row, gpg at {gpg.executables['gpg']}")
+        print(f"{'operation':<12} {'path':<7} {'python us':>10} {'gpg us':>10} {'total us':>10}")
+        for name, command in OPERATIONS.items():
+            for label, spawn in [
+                ("before", lambda c: legacy_spawn(gpg, c)),
+                ("after", lambda c: gpg.session.spawn(c)),
+            ]:
+                python, runtime = measure(spawn, command, args.calls)
+                print(
+                    f"{name:<12} {label:<7} {python * 1e6:>10.1f} {runtime * 1e6:>10.1f} {(python + runtime) * 1e6:>10.1f}"
+                )
+
+        start = time.perf_counter()
+        for _ in range(10000):
+            shlex.split(shlex.join(shlex.split(" ".join(OPERATIONS["list-keys"]))))
+        legacy = (time.perf_counter() - start) / 10000
+        start = time.perf_counter()
+        for _ in range(10000):
+            gpg.session.parse_cmd(OPERATIONS["list-keys"], shell=False)
+        current = (time.perf_counter() - start) / 10000
+        print(f"command parsing alone: {legacy * 1e6:.1f} us before, {current * 1e6:.1f} us after")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,25 +14,43 @@ def homedir(tmp_path_factory: pytest.TempPathFactory) -> str:
 
 @pytest.fixture(scope="module")
 def scoped_instance(scoped_homedir) -> GPG:
-    return GPG(homedir=scoped_homedir, kill_existing_agent=True)
+    with GPG(homedir=scoped_homedir, kill_existing_agent=True) as instance:
+        yield instance
 
 
 @pytest.fixture
 def instance(homedir) -> GPG:
-    return GPG(homedir=homedir, kill_existing_agent=True)
+    with GPG(homedir=homedir, kill_existing_agent=True) as instance:
+        yield instance
 
 
-@pytest.fixture(scope="module")
-def environment(scoped_instance: GPG) -> GPG:
+@pytest.fixture(scope="session")
+def environment_snapshot(tmp_path_factory: pytest.TempPathFactory) -> str:
+    instance = GPG(
+        homedir=str(tmp_path_factory.mktemp("gpg-template").absolute()),
+        kill_existing_agent=True,
+    )
     for user in range(4):
-        scoped_instance.keys.generate_key(
+        instance.keys.generate_key(
             name=f"Test User {user}",
             email=f"test-user-{user}@example.com",
             comment=f"Test user # {user}",
             passphrase=f"test-psk-{user}" if user < 2 else None,
         )
 
-    return scoped_instance
+    snapshot = instance.snapshot(str(tmp_path_factory.mktemp("gpg-snapshot")))
+    instance.close()
+    return snapshot
+
+
+@pytest.fixture(scope="module")
+def environment(
+    tmp_path_factory: pytest.TempPathFactory, environment_snapshot: str
+) -> GPG:
+    with GPG.from_snapshot(
+        environment_snapshot, str(tmp_path_factory.mktemp("gpg-homedir").absolute())
+    ) as instance:
+        yield instance
 
 
 @pytest.fixture(scope="module")
@@ -1,3 +1,16 @@
 from .util import *
-from .gpg import GPG, Key, KeyOperator, KeyEditor, MessageOperator, CardOperator
+from .gpg import (
+    GPG,
+    AsyncGPG,
+    Key,
+    KeyOperator,
+    KeyEditor,
+    MessageOperator,
+    CardOperator,
+    AsyncKeyOperator,
+    AsyncMessageOperator,
+    KeyIndex,
+    KeyPool,
+    KeyboxReader,
+)
 from .models import *
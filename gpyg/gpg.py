@@ -3,18 +3,26 @@ from contextlib import contextmanager
 import os
 import subprocess
 from tempfile import TemporaryFile
+from threading import Lock, Timer, current_thread
 from .util import *
 from .models import *
 from .operators import *
-from typing import Any
+from datetime import datetime, timedelta
+from typing import Any, Literal
 
 class GPG:
     """Main GPyG class, provides a context within which to perform all operations.
 
+    An instance can be shared between threads. Read operations run in parallel, while operations that modify
+    the keyring are serialized through `writer`, whose contention is reported by `lock_metrics`.
+
     Args:
         homedir (str | None, optional): Homedir, or the system's default if None. Defaults to None.
-        kill_existing_agent (bool, optional): Whether to attempt to kill running GPG agents. Defaults to False.
+        kill_existing_agent (bool, optional): Whether to restart the gpg-agent already running for this homedir. Agents of other homedirs are left alone. Defaults to False.
         write_configs (bool, optional): Whether to write some best-practice configs to the specified homedir (only if a homedir is specified). Defaults to True.
+        index_keys (bool, optional): Whether to keep an in-process KeyIndex, so key lookups are served from memory until the keyring changes. Defaults to False.
+        manage_agent (bool, optional): Whether to start this homedir's gpg-agent up front (waiting until it accepts connections) and stop it in `close` if this instance started it. The default homedir's agent is never stopped. Defaults to True.
+        process_history (int, optional): Number of finished gpg processes to keep metadata of in `session.history`. Defaults to 0.
     """
 
     def __init__(
@@ -22,17 +30,272 @@ class GPG:
         homedir: str | None = None,
         kill_existing_agent: bool = False,
         write_configs: bool = True,
+        index_keys: bool = False,
+        manage_agent: bool = True,
+        process_history: int = 0,
     ) -> None:
+        self.session = ProcessSession(
+            environment={"GNUPGHOME": homedir} if homedir else None,
+            history_size=process_history,
+        ).activate()
+        self.executables = {
+            name: self.session.resolve_executable(name) for name in ("gpg", "gpgconf")
+        }
 
         if kill_existing_agent:
-            subprocess.run(["gpgconf", "--kill", "gpg-agent"])
+            kill_agent(homedir, gpgconf=self.executables["gpgconf"])
 
         if write_configs and homedir:
             with open(os.path.join(homedir, "scdaemon.conf"), "w") as scdc:
                 scdc.write("disable-ccid")
+            self._write_agent_config(homedir)
         self.homedir = homedir
-        self.session = ProcessSession(environment={"GNUPGHOME": homedir} if homedir else None).activate()
         self._config = None
+        self.index = KeyIndex(self) if index_keys else None
+        self.pool: KeyPool | None = None
+        self._agent: AgentPool | None = None
+        self._keybox: KeyboxReader | None = None
+        self._agent_pid: int | None = None
+        self._presets: dict[str, Timer | None] = {}
+        self._presets_lock = Lock()
+        self._init_lock = Lock()
+        self.writer = WriterLock()
+
+        if manage_agent and not agent_running(homedir):
+            launch_agent(homedir, gpgconf=self.executables["gpgconf"])
+            # The default homedir's agent is shared with the user's own gpg use, so it is never taken over
+            if homedir:
+                with self.agent.connection() as agent:
+                    self._agent_pid = agent.pid()
+
+    def __enter__(self) -> "GPG":
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.close()
+
+    def warmup(self) -> "GPG":
+        """Loads everything the first operation would otherwise pay for: the gpg config, a connection to
+        gpg-agent and, if `index_keys` is enabled, the key index.
+
+        Returns:
+            GPG: This instance
+        """
+        self.config
+        with self.agent.connection():
+            pass
+        if self.index:
+            self.index.keys("public")
+            self.index.keys("secret")
+        return self
+
+    def close(self) -> None:
+        """Releases this instance's resources: closes any attached KeyPool and agent connections, forgets
+        passphrases preset through this instance and stops gpg-agent if this instance started it (and it has not
+        been restarted since).
+        """
+        if self.pool:
+            self.pool.close()
+
+        with self._presets_lock:
+            keygrips = list(self._presets.keys())
+            for timer in self._presets.values():
+                if timer:
+                    timer.cancel()
+            self._presets.clear()
+        owned = False
+        if agent_running(self.homedir):
+            with self.agent.connection() as agent:
+                # Another instance may have restarted the agent since; only stop the one this instance launched
+                owned = self._agent_pid != None and agent.pid() == self._agent_pid
+                if not owned:
+                    for keygrip in keygrips:
+                        agent.clear_passphrase(keygrip)
+
+        if self._agent:
+            self._agent.close()
+            self._agent = None
+        if self._keybox:
+            self._keybox.close()
+            self._keybox = None
+        if owned:
+            kill_agent(self.homedir, gpgconf=self.executables["gpgconf"])
+        self._agent_pid = None
+
+    def _write_agent_config(self, homedir: str) -> None:
+        path = os.path.join(homedir, "gpg-agent.conf")
+        existing = ""
+        if os.path.exists(path):
+            with open(path, "r") as conf:
+                existing = conf.read()
+        if "allow-preset-passphrase" in existing.split():
+            return
+
+        with open(path, "a") as conf:
+            conf.write(
+                ("\n" if existing and not existing.endswith("\n") else "")
+                + "allow-preset-passphrase\n"
+            )
+        if os.path.exists(agent_socket(homedir)):
+            subprocess.run(
+                [self.executables["gpgconf"], "--reload", "gpg-agent"],
+                env={**os.environ, "GNUPGHOME": homedir},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+
+    @property
+    def keybox(self) -> KeyboxReader:
+        """Read-only reader of this homedir's `pubring.kbx`, which lists public keys without spawning gpg
+
+        Returns:
+            KeyboxReader: The reader, returning Keys bound to a (blocking) KeyOperator of this instance
+        """
+        with self._init_lock:
+            if not self._keybox:
+                homedir = self.homedir or os.environ.get(
+                    "GNUPGHOME", os.path.expanduser("~/.gnupg")
+                )
+                self._keybox = KeyboxReader(
+                    os.path.join(homedir, "pubring.kbx"), operator=KeyOperator(self)
+                )
+            return self._keybox
+
+    @property
+    def agent(self) -> AgentPool:
+        """Pooled Assuan connections to this homedir's gpg-agent
+
+        Returns:
+            AgentPool: The connection pool
+        """
+        with self._init_lock:
+            if not self._agent:
+                self._agent = AgentPool(self.homedir)
+            return self._agent
+
+    def preset_passphrases(
+        self, passphrases: dict[str, str], ttl: float | None = None
+    ) -> None:
+        """Caches passphrases in gpg-agent, so operations on these keys no longer need a passphrase.
+        Requires `allow-preset-passphrase`, which is written to the homedir's gpg-agent.conf unless `write_configs` is disabled.
+
+        Args:
+            passphrases (dict[str, str]): Mapping of keygrip -> passphrase
+            ttl (float | None, optional): Seconds after which to forget the passphrases, or keep them until `forget_passphrases` is called or the agent stops. Defaults to None.
+
+        Raises:
+            AssuanError: If the agent refuses to preset passphrases
+        """
+        with self.agent.connection() as agent:
+            for keygrip, passphrase in passphrases.items():
+                agent.preset_passphrase(keygrip, passphrase)
+
+        with self._presets_lock:
+            for keygrip in passphrases.keys():
+                previous = self._presets.get(keygrip)
+                if previous:
+                    previous.cancel()
+                timer = None
+                if ttl != None:
+                    timer = Timer(ttl, self._expire_passphrase, args=[keygrip])
+                    timer.daemon = True
+                    timer.start()
+                self._presets[keygrip] = timer
+
+    def forget_passphrases(self, *keygrips: str) -> None:
+        """Removes cached passphrases from gpg-agent
+
+        Args:
+            *keygrips (str): Keygrips to forget, or every keygrip preset through this instance if none are given
+        """
+        with self._presets_lock:
+            if len(keygrips) == 0:
+                keygrips = tuple(self._presets.keys())
+            for keygrip in keygrips:
+                timer = self._presets.pop(keygrip, None)
+                if timer:
+                    timer.cancel()
+
+        with self.agent.connection() as agent:
+            for keygrip in keygrips:
+                agent.clear_passphrase(keygrip)
+
+    def _expire_passphrase(self, keygrip: str) -> None:
+        with self._presets_lock:
+            # Timers run on their own thread; skip if this preset was renewed or forgotten meanwhile
+            if self._presets.get(keygrip) is not current_thread():
+                return
+            del self._presets[keygrip]
+        with self.agent.connection() as agent:
+            agent.clear_passphrase(keygrip)
+
+    def attach_pool(
+        self,
+        size: int = 4,
+        low_water: int = 1,
+        algorithm: str | None = None,
+        usage: list[Literal["sign", "auth", "encr", "cert"]] | None = None,
+        expiration: datetime | timedelta | int | None = None,
+        batch_size: int | None = None,
+    ) -> KeyPool:
+        """Attaches a KeyPool of pre-generated keys, which `generate_key` then serves matching requests from.
+        Any previously attached pool is closed.
+
+        Args:
+            size (int, optional): Number of keys to keep ready. Defaults to 4.
+            low_water (int, optional): Refill once this many or fewer keys remain. Defaults to 1.
+            algorithm (str | None, optional): Key algorithm, as in `generate_key`. Defaults to None.
+            usage (list[sign | auth | encr | cert] | None, optional): Key usages, as in `generate_key`. Defaults to None.
+            expiration (datetime | timedelta | int | None, optional): Key expiration, as in `generate_key`. Defaults to None.
+            batch_size (int | None, optional): Maximum keys per gpg generation run, or `size` if None. Defaults to None.
+
+        Returns:
+            KeyPool: The attached pool
+        """
+        if self.pool:
+            self.pool.close()
+        self.pool = KeyPool(
+            self,
+            size=size,
+            low_water=low_water,
+            algorithm=algorithm,
+            usage=usage,
+            expiration=expiration,
+            batch_size=batch_size,
+        )
+        return self.pool
+
+    def snapshot(self, path: str) -> str:
+        """Captures this instance's homedir (keyring, trust database, secret keys and configs) into a snapshot
+        directory, from which populated instances can be cloned with `GPG.from_snapshot`.
+
+        Args:
+            path (str): Snapshot directory, which must not exist or be empty
+
+        Returns:
+            str: The absolute snapshot path
+        """
+        homedir = self.homedir or os.environ.get(
+            "GNUPGHOME", os.path.expanduser("~/.gnupg")
+        )
+        return clone_homedir(homedir, path)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: str, homedir: str, **kwargs) -> "GPG":
+        """Creates an instance whose homedir is a copy of a snapshot taken with `GPG.snapshot`.
+        Files are reflinked where the filesystem supports it, and any agent left running for `homedir` is
+        stopped, so a fresh one starts on the cloned keys.
+
+        Args:
+            snapshot (str): Snapshot directory
+            homedir (str): New homedir, which must not exist or be empty
+            **kwargs: Other arguments to the constructor (ie `index_keys`)
+
+        Returns:
+            GPG: The new instance
+        """
+        homedir = clone_homedir(snapshot, homedir)
+        return cls(homedir=homedir, **{**kwargs, "kill_existing_agent": True})
 
     @property
     def config(self) -> GPGConfig:
@@ -42,11 +305,21 @@ class GPG:
             GPGConfig: Config details
         """
         if not self._config:
-            proc = self.session.spawn("gpg --with-colons --list-config")
-            proc.wait()
-            self._config = GPGConfig.from_config_text(proc.output)
+            with self._init_lock:
+                if not self._config:
+                    proc = self.session.run(["gpg", "--with-colons", "--list-config"])
+                    self._config = GPGConfig.from_config_text(proc.output)
         return self._config
 
+    @property
+    def lock_metrics(self) -> LockMetrics:
+        """Contention of the writer lock that serializes keyring mutations, ie to size thread pools
+
+        Returns:
+            LockMetrics: Acquisition count, contended acquisitions and wait/hold times
+        """
+        return self.writer.metrics()
+
     @property
     def keys(self) -> KeyOperator:
         """Creates a KeyOperator for this instance
@@ -74,10 +347,76 @@ class GPG:
         """
         with StatusInteractive(
             self.session,
-            "gpg --status-fd 1 --command-fd 0 --pinentry-mode loopback --no-tty --card-edit",
+            [
+                "gpg",
+                "--status-fd",
+                "1",
+                "--command-fd",
+                "0",
+                "--pinentry-mode",
+                "loopback",
+                "--no-tty",
+                "--card-edit",
+            ],
         ) as interactive:
             interactive.wait_for_status(StatusCodes.GET_LINE)
             interactive.writelines("admin")
 
             yield CardOperator(self, interactive)
             interactive.writelines("quit")
+
+
+class AsyncGPG(GPG):
+    """asyncio-native GPyG instance. `keys` and `messages` return operators whose methods are awaitable
+    and run gpg through asyncio subprocesses, so many operations can be in flight without blocking the
+    event loop. Keys returned by these operators keep their regular (blocking) methods.
+
+    Args:
+        homedir (str | None, optional): Homedir, or the system's default if None. Defaults to None.
+        kill_existing_agent (bool, optional): Whether to restart the gpg-agent already running for this homedir. Agents of other homedirs are left alone. Defaults to False.
+        write_configs (bool, optional): Whether to write some best-practice configs to the specified homedir (only if a homedir is specified). Defaults to True.
+        index_keys (bool, optional): Whether to keep an in-process KeyIndex, so key lookups are served from memory until the keyring changes. Defaults to False.
+        manage_agent (bool, optional): Whether to start this homedir's gpg-agent up front (waiting until it accepts connections) and stop it in `close` if this instance started it. The default homedir's agent is never stopped. Defaults to True.
+        process_history (int, optional): Number of finished gpg processes to keep metadata of in `session.history`. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        homedir: str | None = None,
+        kill_existing_agent: bool = False,
+        write_configs: bool = True,
+        index_keys: bool = False,
+        manage_agent: bool = True,
+        process_history: int = 0,
+    ) -> None:
+        super().__init__(
+            homedir=homedir,
+            kill_existing_agent=kill_existing_agent,
+            write_configs=write_configs,
+            index_keys=index_keys,
+            manage_agent=manage_agent,
+            process_history=process_history,
+        )
+        self.async_session = AsyncProcessSession(
+            environment={"GNUPGHOME": homedir} if homedir else None,
+            executables=self.executables,
+            history_size=process_history,
+        ).activate()
+
+    @property
+    def keys(self) -> AsyncKeyOperator:
+        """Creates an AsyncKeyOperator for this instance
+
+        Returns:
+            AsyncKeyOperator: The AsyncKeyOperator
+        """
+        return AsyncKeyOperator(self)
+
+    @property
+    def messages(self) -> AsyncMessageOperator:
+        """Creates an AsyncMessageOperator for this instance
+
+        Returns:
+            AsyncMessageOperator: The AsyncMessageOperator
+        """
+        return AsyncMessageOperator(self)
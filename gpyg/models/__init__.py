@@ -3,3 +3,6 @@ from .infolines import *
 from .key import KeyModel
 from .key_editing import *
 from .card import SmartCard, Sex, PinData, KeyData, UIFData
+from .batch import BatchResult, BatchReport
+from .imports import ImportFlags, ImportProblem, ImportedKey, ImportReport
+from .generation import KeySpec
@@ -0,0 +1,80 @@
+from typing import Any
+from pydantic import BaseModel, computed_field
+
+
+class BatchResult(BaseModel):
+    """The outcome of a single item in a batch operation.
+
+    Attributes:
+        index (int): Position of the item in the input
+        value (Any): The operation's return value, if it succeeded
+        error (Exception | None): The raised exception, if it failed
+        duration (float): Time spent on this item, in seconds
+    """
+
+    model_config = {"arbitrary_types_allowed": True}
+    index: int
+    value: Any = None
+    error: Exception | None = None
+    duration: float = 0.0
+
+    @computed_field
+    @property
+    def ok(self) -> bool:
+        """Whether the item succeeded
+
+        Returns:
+            bool: True if no error was raised
+        """
+        return self.error == None
+
+
+class BatchReport(BaseModel):
+    """Aggregate results of a batch operation, in input order.
+
+    Attributes:
+        results (list[BatchResult]): Per-item results, ordered by index
+        duration (float): Wall-clock time of the whole batch, in seconds
+    """
+
+    results: list[BatchResult]
+    duration: float
+
+    @computed_field
+    @property
+    def succeeded(self) -> int:
+        """Number of items that succeeded
+
+        Returns:
+            int: Success count
+        """
+        return len([i for i in self.results if i.ok])
+
+    @computed_field
+    @property
+    def failed(self) -> int:
+        """Number of items that failed
+
+        Returns:
+            int: Failure count
+        """
+        return len([i for i in self.results if not i.ok])
+
+    @computed_field
+    @property
+    def item_time(self) -> float:
+        """Sum of all per-item durations (exceeds `duration` when items ran concurrently)
+
+        Returns:
+            float: Total item time, in seconds
+        """
+        return sum([i.duration for i in self.results])
+
+    @property
+    def values(self) -> list[Any]:
+        """Return values of all items, in input order (None for failed items)
+
+        Returns:
+            list[Any]: Values
+        """
+        return [i.value for i in self.results]
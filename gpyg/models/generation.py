@@ -0,0 +1,147 @@
+from datetime import date, datetime, timedelta
+import re
+from typing import Literal
+from pydantic import BaseModel, field_validator
+
+ALGORITHM_SIZE = re.compile(r"^(rsa|dsa|elg)(\d+)?$", re.IGNORECASE)
+EDDSA_CURVES = ["ed25519", "ed448"]
+ECDH_CURVES = ["cv25519", "cv448"]
+ECC_CURVES = [
+    "nistp256",
+    "nistp384",
+    "nistp521",
+    "brainpoolp256r1",
+    "brainpoolp384r1",
+    "brainpoolp512r1",
+    "secp256k1",
+]
+USAGE_NAMES = {"sign": "sign", "auth": "auth", "encr": "encrypt", "cert": "cert"}
+
+
+def algorithm_parameters(
+    algorithm: str | None, prefix: Literal["Key", "Subkey"], encrypt: bool = False
+) -> list[str]:
+    """Translates a `--quick-gen-key` style algorithm name (ie `rsa3072`, `ed25519`) into unattended generation parameters
+
+    Args:
+        algorithm (str | None): Algorithm name, or None/"default" for gpg's default
+        prefix (Key | Subkey): Parameter prefix
+        encrypt (bool, optional): Whether the key will be used for encryption, which selects ECDH for ECC curves. Defaults to False.
+
+    Raises:
+        ValueError: If the algorithm is not recognized
+
+    Returns:
+        list[str]: Parameter lines
+    """
+    name = (algorithm or "default").lower()
+    if name in ["default", "future-default"]:
+        return [f"{prefix}-Type: default"]
+
+    sized = ALGORITHM_SIZE.match(name)
+    if sized:
+        kind = {"rsa": "RSA", "dsa": "DSA", "elg": "ELG"}[sized.group(1).lower()]
+        return [f"{prefix}-Type: {kind}"] + (
+            [f"{prefix}-Length: {sized.group(2)}"] if sized.group(2) else []
+        )
+
+    if name in EDDSA_CURVES or name in ECDH_CURVES:
+        kind = "ECDH" if name in ECDH_CURVES else "EDDSA"
+    elif name in ECC_CURVES:
+        kind = "ECDH" if encrypt else "ECDSA"
+    else:
+        raise ValueError(f"Unknown key algorithm: {algorithm}")
+    curve = name.replace("brainpoolp", "brainpoolP")
+    return [f"{prefix}-Type: {kind}", f"{prefix}-Curve: {curve}"]
+
+
+class KeySpec(BaseModel):
+    """Parameters of a single key to generate with `KeyOperator.generate_keys`
+
+    Attributes:
+        name (str): UID Name
+        email (str | None): Optional UID email
+        comment (str | None): Optional UID comment
+        algorithm (str | None): Primary key algorithm (ie `rsa3072`, `ed25519`), or None for the default
+        usage (list[sign | auth | encr | cert] | None): Primary key usages, or None for the default
+        subkey_algorithm (str | None): Subkey algorithm. If None, a default encryption subkey is created only when neither `algorithm` nor `usage` are set, like `generate_key`.
+        subkey_usage (list[sign | auth | encr] | None): Subkey usages, or None for the default
+        expiration (datetime | date | timedelta | int | None): Key expiration, or None for no expiration
+        passphrase (str | None): Key passphrase (if left empty, no passphrase)
+    """
+
+    name: str
+    email: str | None = None
+    comment: str | None = None
+    algorithm: str | None = None
+    usage: list[Literal["sign", "auth", "encr", "cert"]] | None = None
+    subkey_algorithm: str | None = None
+    subkey_usage: list[Literal["sign", "auth", "encr"]] | None = None
+    expiration: datetime | date | timedelta | int | None = None
+    passphrase: str | None = None
+
+    @field_validator("name", "email", "comment", "passphrase")
+    @classmethod
+    def single_line(cls, value: str | None) -> str | None:
+        if value != None and ("\n" in value or "\r" in value):
+            raise ValueError("Key parameters cannot contain line breaks")
+        return value
+
+    def parameters(self, handle: str | None = None) -> list[str]:
+        """Renders this spec as a block of gpg's unattended key generation parameters
+
+        Args:
+            handle (str | None, optional): Handle reported back in KEY_CREATED/KEY_NOT_CREATED. Defaults to None.
+
+        Returns:
+            list[str]: Parameter lines, ending in `%commit`
+        """
+        lines = algorithm_parameters(self.algorithm, "Key")
+        if self.usage:
+            lines.append(
+                "Key-Usage: " + ",".join([USAGE_NAMES[i] for i in self.usage])
+            )
+
+        if self.subkey_algorithm != None or (
+            self.algorithm == None and self.usage == None
+        ):
+            lines.extend(
+                algorithm_parameters(
+                    self.subkey_algorithm,
+                    "Subkey",
+                    encrypt=self.subkey_usage == None or "encr" in self.subkey_usage,
+                )
+            )
+            if self.subkey_usage:
+                lines.append(
+                    "Subkey-Usage: "
+                    + ",".join([USAGE_NAMES[i] for i in self.subkey_usage])
+                )
+
+        lines.append(f"Name-Real: {self.name}")
+        if self.email:
+            lines.append(f"Name-Email: {self.email}")
+        if self.comment:
+            lines.append(f"Name-Comment: {self.comment}")
+
+        if isinstance(self.expiration, datetime):
+            lines.append(f"Expire-Date: {self.expiration.strftime('%Y%m%dT%H%M%S')}")
+        elif isinstance(self.expiration, date):
+            lines.append(f"Expire-Date: {self.expiration.isoformat()}")
+        elif isinstance(self.expiration, timedelta):
+            lines.append(
+                f"Expire-Date: seconds={int(self.expiration.total_seconds())}"
+            )
+        elif type(self.expiration) == int:
+            lines.append(f"Expire-Date: seconds={self.expiration}")
+        else:
+            lines.append("Expire-Date: 0")
+
+        if self.passphrase:
+            lines.append(f"Passphrase: {self.passphrase}")
+        else:
+            lines.append("%no-protection")
+        if handle != None:
+            lines.append(f"Handle: {handle}")
+        lines.append("%commit")
+        return lines
@@ -0,0 +1,179 @@
+from enum import IntEnum, IntFlag
+from typing import Literal
+from pydantic import BaseModel, computed_field
+from .key_editing import StatusCodes
+
+
+class ImportFlags(IntFlag):
+    """Reason flags of an IMPORT_OK status (see https://github.com/gpg/gnupg/blob/master/doc/DETAILS)"""
+    UNCHANGED = 0
+    NEW_KEY = 1
+    NEW_USER_IDS = 2
+    NEW_SIGNATURES = 4
+    NEW_SUBKEYS = 8
+    SECRET_KEY = 16
+
+
+class ImportProblem(IntEnum):
+    """Reason codes of an IMPORT_PROBLEM status (see https://github.com/gpg/gnupg/blob/master/doc/DETAILS)"""
+    UNSPECIFIED = 0
+    INVALID_CERTIFICATE = 1
+    MISSING_ISSUER = 2
+    CHAIN_TOO_LONG = 3
+    STORAGE_ERROR = 4
+
+
+class ImportedKey(BaseModel):
+    """The outcome of importing a single key
+
+    Attributes:
+        fingerprint (str | None): Key fingerprint, if gpg reported one
+        flags (ImportFlags): Combined IMPORT_OK flags for this key
+        problem (ImportProblem | None): The IMPORT_PROBLEM reason, if the key failed to import
+    """
+
+    fingerprint: str | None = None
+    flags: ImportFlags = ImportFlags.UNCHANGED
+    problem: ImportProblem | None = None
+
+    @computed_field
+    @property
+    def status(self) -> Literal["new", "updated", "unchanged", "failed"]:
+        """Summarized outcome of the import
+
+        Returns:
+            new | updated | unchanged | failed: The outcome
+        """
+        if self.problem != None:
+            return "failed"
+        if ImportFlags.NEW_KEY in self.flags:
+            return "new"
+        if self.flags & ~ImportFlags.SECRET_KEY:
+            return "updated"
+        return "unchanged"
+
+
+class ImportReport(BaseModel):
+    """Structured result of a bulk import, built from IMPORT_OK, IMPORT_PROBLEM and IMPORT_RES statuses
+
+    Attributes:
+        keys (list[ImportedKey]): Per-key outcomes, in the order gpg first reported them
+        processed (int): Total number of keys processed
+        no_user_id (int): Keys skipped for lacking a user ID
+        imported (int): Number of newly imported keys
+        unchanged (int): Number of keys that were already present and unchanged
+        new_user_ids (int): Number of new user IDs
+        new_subkeys (int): Number of new subkeys
+        new_signatures (int): Number of new signatures
+        new_revocations (int): Number of new revocations
+        secret_read (int): Secret keys read
+        secret_imported (int): Secret keys imported
+        secret_unchanged (int): Secret keys that were already present
+        skipped_new_keys (int): New keys skipped (ie with `--import-options merge-only`)
+        not_imported (int): Keys that could not be imported
+        skipped_v3_keys (int): Legacy v3 keys skipped
+        code (int): gpg's exit code
+        errors (str): gpg's STDERR output
+    """
+
+    keys: list[ImportedKey] = []
+    processed: int = 0
+    no_user_id: int = 0
+    imported: int = 0
+    unchanged: int = 0
+    new_user_ids: int = 0
+    new_subkeys: int = 0
+    new_signatures: int = 0
+    new_revocations: int = 0
+    secret_read: int = 0
+    secret_imported: int = 0
+    secret_unchanged: int = 0
+    skipped_new_keys: int = 0
+    not_imported: int = 0
+    skipped_v3_keys: int = 0
+    code: int = 0
+    errors: str = ""
+
+    @computed_field
+    @property
+    def new_keys(self) -> list[ImportedKey]:
+        """Keys that did not previously exist in the keyring"""
+        return [i for i in self.keys if i.status == "new"]
+
+    @computed_field
+    @property
+    def updated_keys(self) -> list[ImportedKey]:
+        """Existing keys that gained user IDs, signatures or subkeys"""
+        return [i for i in self.keys if i.status == "updated"]
+
+    @computed_field
+    @property
+    def unchanged_keys(self) -> list[ImportedKey]:
+        """Existing keys that were not modified"""
+        return [i for i in self.keys if i.status == "unchanged"]
+
+    @computed_field
+    @property
+    def failed_keys(self) -> list[ImportedKey]:
+        """Keys that gpg reported a problem for"""
+        return [i for i in self.keys if i.status == "failed"]
+
+    @classmethod
+    def from_status(
+        cls, lines: list, code: int = 0, errors: str = ""
+    ) -> "ImportReport":
+        """Builds a report from the status lines of a `gpg --import` run
+
+        Args:
+            lines (list[StatusLine]): Status lines, as in `Process.status`
+            code (int, optional): gpg's exit code. Defaults to 0.
+            errors (str, optional): gpg's STDERR output. Defaults to "".
+
+        Returns:
+            ImportReport: The parsed report
+        """
+        keys: dict[str, ImportedKey] = {}
+        unnamed: list[ImportedKey] = []
+        counts: dict[str, int] = {}
+        for line in lines:
+            if line.code == StatusCodes.IMPORT_OK and len(line.arguments) > 0:
+                fingerprint = line.arguments[1] if len(line.arguments) > 1 else None
+                key = keys.setdefault(fingerprint, ImportedKey(fingerprint=fingerprint))
+                key.flags |= ImportFlags(int(line.arguments[0]))
+            elif line.code == StatusCodes.IMPORT_PROBLEM and len(line.arguments) > 0:
+                problem = ImportProblem(int(line.arguments[0]))
+                if len(line.arguments) > 1:
+                    key = keys.setdefault(
+                        line.arguments[1], ImportedKey(fingerprint=line.arguments[1])
+                    )
+                    key.problem = problem
+                else:
+                    unnamed.append(ImportedKey(problem=problem))
+            elif line.code == StatusCodes.IMPORT_RES:
+                counts = dict(
+                    zip(
+                        [
+                            "processed",
+                            "no_user_id",
+                            "imported",
+                            None,
+                            "unchanged",
+                            "new_user_ids",
+                            "new_subkeys",
+                            "new_signatures",
+                            "new_revocations",
+                            "secret_read",
+                            "secret_imported",
+                            "secret_unchanged",
+                            "skipped_new_keys",
+                            "not_imported",
+                            "skipped_v3_keys",
+                        ],
+                        [int(i) for i in line.arguments],
+                    )
+                )
+                counts.pop(None, None)
+
+        return cls(
+            keys=[*keys.values(), *unnamed], code=code, errors=errors, **counts
+        )
@@ -1,5 +1,7 @@
+from collections.abc import Generator, Iterable
 import datetime
 from enum import IntEnum, StrEnum
+from typing import Any
 from pydantic import BaseModel, computed_field
 
 
@@ -492,49 +494,292 @@ class TrustInfo(InfoLine):
         return int(self.field(8))
 
 
-def parse_infoline(line: str) -> InfoLine:
-    """Parses a raw infoline into either a generic InfoLine or one of the specific types
+def _parse_date(value: str | None) -> datetime.datetime | None:
+    if value:
+        if "T" in value:
+            return datetime.datetime.fromisoformat(value)
+        else:
+            return datetime.datetime.fromtimestamp(float(value))
+    return None
+
+
+_UNSET = object()
+_RECORD_ENUM = {i.value: i for i in InfoRecord}
+
+
+class record_field:
+    """Lazily converted, memoized field of a ColonRecord.
+
+    Converted values are stored in the slot named `_<attribute>`, which the owning record class must declare.
+    Fields without a conversion are returned as-is and need no slot.
 
     Args:
-        line (str): Line to parse
+        number (int): Field number (1-21), as in InfoLine.field
+        convert (Callable[[str | None], Any] | None, optional): Conversion applied on first access. Defaults to None.
+    """
 
-    Returns:
-        InfoLine: InfoLine or a subclass
+    __slots__ = ("number", "convert", "slot")
+
+    def __init__(self, number: int, convert=None) -> None:
+        self.number = number
+        self.convert = convert
+        self.slot = None
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.slot = "_" + name
+
+    def __get__(self, instance, owner=None):
+        if instance == None:
+            return self
+        if self.convert == None:
+            return instance.field(self.number)
+        value = getattr(instance, self.slot, _UNSET)
+        if value is _UNSET:
+            value = self.convert(instance.field(self.number))
+            setattr(instance, self.slot, value)
+        return value
+
+
+class ColonRecord:
+    """Lightweight counterpart to InfoLine: a single split of one colon-separated line, with typed fields
+    converted lazily on first access. Use `to_model()` to get the equivalent pydantic InfoLine.
+
+    Args:
+        record_type (str): The record type (first field)
+        raw_fields (list[str]): Remaining fields, exactly as split (empty fields are "")
     """
-    initial_parse = InfoLine.from_line(line)
-    match initial_parse.record_type:
-        case InfoRecord.PUBLIC_KEY:
-            return KeyInfo.from_line(line)
 
-        case InfoRecord.SUBKEY:
-            return KeyInfo.from_line(line)
+    __slots__ = ("record_type", "raw_fields")
+    model: type[InfoLine] = InfoLine
+
+    def __init__(self, record_type: str, raw_fields: list[str]) -> None:
+        self.record_type = record_type
+        self.raw_fields = raw_fields
+
+    @property
+    def field_array(self) -> list[str | None]:
+        """Remaining fields, with empty fields as None (as in InfoLine.field_array)
+
+        Returns:
+            list[str | None]: Field values
+        """
+        return [i or None for i in self.raw_fields]
+
+    def field(self, field: int) -> str | None:
+        """Get field value based on indices from https://github.com/gpg/gnupg/blob/master/doc/DETAILS
+
+        Args:
+            field (int): Field number (1-21)
+
+        Raises:
+            KeyError: If field is unknown
+
+        Returns:
+            str | None: Field value or None if empty.
+        """
+        if field < 1 or field > 21:
+            raise KeyError("Unknown field number.")
+
+        if field == 1:
+            return self.record_type
+
+        if field - 2 < len(self.raw_fields):
+            return self.raw_fields[field - 2] or None
+        return None
+
+    def to_model(self) -> InfoLine:
+        """Converts this record to the matching InfoLine model
+
+        Returns:
+            InfoLine: InfoLine or a subclass
+        """
+        # Equivalent to model_construct: InfoLine models have no defaults, extras or private attributes to fill in
+        instance = self.model.__new__(self.model)
+        object.__setattr__(
+            instance,
+            "__dict__",
+            {
+                "record_type": _RECORD_ENUM.get(self.record_type)
+                or InfoRecord(self.record_type),
+                "field_array": [i or None for i in self.raw_fields],
+            },
+        )
+        object.__setattr__(instance, "__pydantic_fields_set__", {"record_type", "field_array"})
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.record_type!r}, {self.raw_fields!r})"
+
+
+def _capabilities(value: str | None) -> list[KeyCapability]:
+    return [KeyCapability(i) for i in value if i.lower() == i] if value else []
+
+
+def _overall_capabilities(value: str | None) -> list[KeyCapability]:
+    return [KeyCapability(i.lower()) for i in value if i.lower() != i] if value else []
+
+
+class KeyRecord(ColonRecord):
+    """Lightweight counterpart to KeyInfo (pub, sub)"""
+
+    __slots__ = (
+        "_validity",
+        "_length",
+        "_algorithm",
+        "_creation_date",
+        "_expiration_date",
+        "_capabilities",
+        "_overall_capabilities",
+    )
+    model = KeyInfo
+
+    validity = record_field(2, lambda v: FieldValidity(v) if v else None)
+    length = record_field(3, int)
+    algorithm = record_field(4, int)
+    key_id = record_field(5)
+    creation_date = record_field(6, _parse_date)
+    expiration_date = record_field(7, _parse_date)
+    owner_trust = record_field(9)
+    capabilities = record_field(12, _capabilities)
+    overall_capabilities = record_field(12, _overall_capabilities)
+    curve_name = record_field(17)
+
+
+class SecretKeyRecord(KeyRecord):
+    """Lightweight counterpart to SecretKeyInfo (sec, ssb)"""
+
+    __slots__ = ()
+    model = SecretKeyInfo
 
-        case InfoRecord.SECRET_KEY:
-            return SecretKeyInfo.from_line(line)
+    serial_number = record_field(15)
 
-        case InfoRecord.SECRET_SUBKEY:
-            return SecretKeyInfo.from_line(line)
 
-        case InfoRecord.FINGERPRINT:
-            return FingerprintInfo.from_line(line)
+class FingerprintRecord(ColonRecord):
+    """Lightweight counterpart to FingerprintInfo (fpr, fp2)"""
 
-        case InfoRecord.SHA256_FINGERPRINT:
-            return FingerprintInfo.from_line(line)
+    __slots__ = ()
+    model = FingerprintInfo
 
-        case InfoRecord.USER_ID:
-            return UserIDInfo.from_line(line)
+    fingerprint = record_field(10)
 
-        case InfoRecord.SIGNATURE:
-            return SignatureInfo.from_line(line)
 
-        case InfoRecord.REVOCATION_SIGNATURE:
-            return SignatureInfo.from_line(line)
+class KeygripRecord(ColonRecord):
+    """Lightweight counterpart to KeygripInfo (grp)"""
 
-        case InfoRecord.TRUST_INFO:
-            return TrustInfo.from_line(line)
+    __slots__ = ()
+    model = KeygripInfo
 
-        case InfoRecord.KEYGRIP:
-            return KeygripInfo.from_line(line)
+    keygrip = record_field(10)
+
+
+class UserIDRecord(ColonRecord):
+    """Lightweight counterpart to UserIDInfo (uid)"""
+
+    __slots__ = ("_validity", "_creation_date", "_expiration_date")
+    model = UserIDInfo
+
+    validity = record_field(2, lambda v: FieldValidity(v) if v else None)
+    creation_date = record_field(6, _parse_date)
+    expiration_date = record_field(7, _parse_date)
+    uid_hash = record_field(8)
+    uid = record_field(10)
+
+
+class SignatureRecord(ColonRecord):
+    """Lightweight counterpart to SignatureInfo (sig, rev)"""
+
+    __slots__ = ("_validity", "_algorithm", "_creation_date", "_expiration_date")
+    model = SignatureInfo
+
+    validity = record_field(2, lambda v: SignatureValidity(v[0]) if v else None)
+    algorithm = record_field(4, int)
+    key_id = record_field(5)
+    creation_date = record_field(6, _parse_date)
+    expiration_date = record_field(7, _parse_date)
+    uid = record_field(10)
+    signature_class = record_field(11)
+    signer_fingerprint = record_field(13)
+
+    @property
+    def is_revocation(self) -> bool:
+        return self.record_type == InfoRecord.REVOCATION_SIGNATURE
 
-        case _:
-            return initial_parse
+
+class TrustRecord(ColonRecord):
+    """Lightweight counterpart to TrustInfo (tru)"""
+
+    __slots__ = (
+        "_staleness",
+        "_trust_model",
+        "_creation_date",
+        "_expiration_date",
+        "_marginals_needed",
+        "_completes_needed",
+        "_max_cert_depth",
+    )
+    model = TrustInfo
+
+    staleness = record_field(2, lambda v: StaleTrustReason(v) if v else None)
+    trust_model = record_field(3, lambda v: TrustModel(int(v)))
+    creation_date = record_field(4, lambda v: datetime.datetime.fromtimestamp(float(v)))
+    expiration_date = record_field(5, lambda v: datetime.datetime.fromtimestamp(float(v)))
+    marginals_needed = record_field(6, int)
+    completes_needed = record_field(7, int)
+    max_cert_depth = record_field(8, int)
+
+
+RECORD_TYPES: dict[str, type[ColonRecord]] = {
+    "pub": KeyRecord,
+    "sub": KeyRecord,
+    "sec": SecretKeyRecord,
+    "ssb": SecretKeyRecord,
+    "fpr": FingerprintRecord,
+    "fp2": FingerprintRecord,
+    "grp": KeygripRecord,
+    "uid": UserIDRecord,
+    "sig": SignatureRecord,
+    "rev": SignatureRecord,
+    "tru": TrustRecord,
+}
+"""Mapping of record type to ColonRecord class, used by `parse_record`"""
+
+
+def parse_record(line: str) -> ColonRecord:
+    """Parses a raw infoline into a ColonRecord (or a subclass) with a single split and no validation
+
+    Args:
+        line (str): Line to parse
+
+    Returns:
+        ColonRecord: ColonRecord or a subclass
+    """
+    record_type, _, rest = line.partition(":")
+    return RECORD_TYPES.get(record_type, ColonRecord)(record_type, rest.split(":"))
+
+
+def iter_records(lines: Iterable[str]) -> Generator[ColonRecord, Any, None]:
+    """Lazily parses lines of colon-separated output, skipping empty lines
+
+    Args:
+        lines (Iterable[str]): Lines to parse
+
+    Yields:
+        ColonRecord: Parsed records
+    """
+    for line in lines:
+        if line:
+            yield parse_record(line)
+
+
+def parse_infoline(line: str) -> InfoLine:
+    """Parses a raw infoline into either a generic InfoLine or one of the specific types
+
+    Args:
+        line (str): Line to parse
+
+    Returns:
+        InfoLine: InfoLine or a subclass
+    """
+    return parse_record(line).to_model()
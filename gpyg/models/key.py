@@ -1,4 +1,5 @@
-from typing import Literal
+from collections.abc import Iterable
+from typing import Any, Literal, Self
 from pydantic import BaseModel, Field, computed_field
 from .infolines import *
 from datetime import datetime
@@ -78,99 +79,103 @@ class KeyModel(BaseModel):
         """
         return [i for i in self.all_signatures if i.is_revocation]
 
-    @staticmethod
-    def get_subkeys(
-        key: "KeyModel", subkey_map: dict[str, list["KeyModel"]]
-    ) -> list["KeyModel"]:
-        if key.fingerprint and key.fingerprint in subkey_map.keys():
-            for subkey in subkey_map[key.fingerprint]:
-                subkey.internal_subkeys = KeyModel.get_subkeys(subkey, subkey_map)
-                key.internal_subkeys.append(subkey)
-            return key.internal_subkeys
-        else:
-            return []
-
     @classmethod
-    def from_infolines(cls, lines: list[InfoLine]) -> list["KeyModel"]:
-        key_mapping: dict[str, list[KeyModel]] = {"root": []}
-        context: KeyModel = None
-        for line in lines:
-            if line.record_type in [
-                InfoRecord.PUBLIC_KEY,
-                InfoRecord.SECRET_KEY,
-                InfoRecord.SUBKEY,
-                InfoRecord.SECRET_SUBKEY,
-            ]:
-                if context:
-                    initial_sigs = [
-                        i
-                        for i in context.signatures
-                        if i.creation_date == context.creation_date
-                    ]
-                    if (
-                        len(initial_sigs) == 0
-                        or initial_sigs[0].signer_fingerprint == context.fingerprint
-                    ):
-                        key_mapping["root"].append(context)
-                    else:
-                        if not initial_sigs[0].signer_fingerprint in key_mapping.keys():
-                            key_mapping[initial_sigs[0].signer_fingerprint] = []
-                        key_mapping[initial_sigs[0].signer_fingerprint].append(context)
-
-                context = (
-                    KeyModel(
-                        type=(
-                            "public"
-                            if line.record_type == InfoRecord.PUBLIC_KEY
-                            else "secret"
-                        ),
-                        **line.model_dump(),
-                    )
-                    if line.record_type
-                    in [InfoRecord.PUBLIC_KEY, InfoRecord.SECRET_KEY]
-                    else KeyModel(
-                        type=(
-                            "public"
-                            if line.record_type == InfoRecord.SUBKEY
-                            else "secret"
-                        ),
-                        is_subkey=True,
-                        **line.model_dump(),
-                    )
-                )
-            elif (
-                line.record_type
-                in [InfoRecord.FINGERPRINT, InfoRecord.SHA256_FINGERPRINT]
-                and context
-            ):
-                context.fingerprint = line.fingerprint
-            elif line.record_type == InfoRecord.KEYGRIP and context:
-                context.keygrip = line.keygrip
-            elif line.record_type == InfoRecord.USER_ID and context:
-                context.user_ids.append(line)
-            elif line.record_type == InfoRecord.SIGNATURE and context:
-                context.all_signatures.append(line)
-            elif line.record_type == InfoRecord.REVOCATION_SIGNATURE and context:
-                context.all_signatures.append(line)
-
-        if context:
-            initial_sigs = [
-                i
-                for i in context.signatures
-                if i.creation_date == context.creation_date
-            ]
-            if (
-                len(initial_sigs) == 0
-                or initial_sigs[0].signer_fingerprint == context.fingerprint
-            ):
-                key_mapping["root"].append(context)
-            else:
-                if not initial_sigs[0].signer_fingerprint in key_mapping.keys():
-                    key_mapping[initial_sigs[0].signer_fingerprint] = []
-                key_mapping[initial_sigs[0].signer_fingerprint].append(context)
+    def from_infolines(
+        cls, lines: Iterable[InfoLine | ColonRecord], **extra: Any
+    ) -> list[Self]:
+        """Assembles keys (with nested subkeys) from parsed listing lines in a single linear pass.
+        Models are constructed without revalidation, since every value is already typed by the parser.
+
+        Args:
+            lines (Iterable[InfoLine | ColonRecord]): Parsed lines, as from `parse_record` or `parse_infoline`
+            **extra (Any): Additional field values set on every constructed key
 
-        results = key_mapping["root"][:]
-        for key in results:
-            key.internal_subkeys = KeyModel.get_subkeys(key, key_mapping)
+        Returns:
+            list[Self]: Top-level keys, in listing order
+        """
+        roots: list[KeyModel] = []
+        children: dict[str | None, list[KeyModel]] = {}
+        context: dict[str, Any] | None = None
+        created: str | None = None
+        signer: Any = _NO_SIGNER
+
+        def close():
+            key = cls.model_construct(**context, **extra)
+            if signer is _NO_SIGNER or signer == key.fingerprint:
+                roots.append(key)
+            else:
+                children.setdefault(signer, []).append(key)
 
-        return results
+        for line in lines:
+            record_type = line.record_type
+            if record_type in _KEY_RECORDS:
+                if context != None:
+                    close()
+
+                context = dict(
+                    type="public" if record_type in _PUBLIC_RECORDS else "secret",
+                    is_subkey=record_type in _SUBKEY_RECORDS,
+                    validity=line.validity,
+                    length=line.length,
+                    algorithm=line.algorithm,
+                    key_id=line.key_id,
+                    creation_date=line.creation_date,
+                    expiration_date=line.expiration_date,
+                    owner_trust=line.owner_trust,
+                    capabilities=line.capabilities,
+                    overall_capabilities=line.overall_capabilities,
+                    curve_name=line.curve_name,
+                    serial_number=getattr(line, "serial_number", None),
+                    fingerprint=None,
+                    keygrip=None,
+                    all_signatures=[],
+                    user_ids=[],
+                    internal_subkeys=[],
+                )
+                created = line.field(6)
+                signer = _NO_SIGNER
+            elif context == None:
+                continue
+            elif record_type in _FINGERPRINT_RECORDS:
+                context["fingerprint"] = line.fingerprint
+            elif record_type == InfoRecord.KEYGRIP:
+                context["keygrip"] = line.keygrip
+            elif record_type == InfoRecord.USER_ID:
+                context["user_ids"].append(_as_model(line))
+            elif record_type in _SIGNATURE_RECORDS:
+                if (
+                    signer is _NO_SIGNER
+                    and record_type == InfoRecord.SIGNATURE
+                    and line.field(6) == created
+                ):
+                    signer = line.signer_fingerprint
+                context["all_signatures"].append(_as_model(line))
+
+        if context != None:
+            close()
+
+        for root in roots:
+            stack = [root]
+            seen = {root.fingerprint}
+            while len(stack) > 0:
+                key = stack.pop()
+                for subkey in children.get(key.fingerprint, []) if key.fingerprint else []:
+                    if subkey.fingerprint in seen:
+                        continue
+                    seen.add(subkey.fingerprint)
+                    key.internal_subkeys.append(subkey)
+                    stack.append(subkey)
+
+        return roots
+
+
+_NO_SIGNER = object()
+_KEY_RECORDS = {"pub", "sec", "sub", "ssb"}
+_PUBLIC_RECORDS = {"pub", "sub"}
+_SUBKEY_RECORDS = {"sub", "ssb"}
+_FINGERPRINT_RECORDS = {"fpr", "fp2"}
+_SIGNATURE_RECORDS = {"sig", "rev"}
+
+
+def _as_model(line: InfoLine | ColonRecord) -> InfoLine:
+    return line.to_model() if isinstance(line, ColonRecord) else line
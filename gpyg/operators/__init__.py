@@ -1,3 +1,6 @@
-from .keys import KeyOperator, Key, KeyEditor
-from .messages import MessageOperator
+from .keys import KeyOperator, Key, KeyEditor, AsyncKeyOperator
+from .messages import MessageOperator, AsyncMessageOperator
 from .card import CardOperator, SmartCard
+from .index import KeyIndex
+from .pool import KeyPool
+from .keybox import KeyboxReader
@@ -28,7 +28,7 @@ class CardOperator(BaseOperator):
         Returns:
             SmartCard | None: Card data, or None if no card is present.
         """
-        result = self.session.run("gpg --with-colons --card-status")
+        result = self.session.run(["gpg", "--with-colons", "--card-status"])
         if result.code == 0:
             return SmartCard.from_status(result.output)
         else:
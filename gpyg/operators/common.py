@@ -1,5 +1,34 @@
+from collections.abc import Callable
+from functools import wraps
 from typing import Any
-from ..util import Process, ProcessSession
+from ..util import Process, ProcessSession, AsyncProcessSession
+
+
+def mutating(method: Callable) -> Callable:
+    """Runs a method that modifies the keyring under its GPG instance's writer lock, so concurrent
+    mutations from other threads are serialized instead of contending for gpg's own keyring lock.
+    The decorated object must expose the instance as `gpg`.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.gpg.writer:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def async_mutating(method: Callable) -> Callable:
+    """Awaitable counterpart to `mutating`: runs a coroutine method under its GPG instance's writer lock,
+    waiting for the lock without blocking the event loop.
+    """
+
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        async with self.gpg.writer:
+            return await method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class BaseOperator:
@@ -8,4 +37,13 @@ class BaseOperator:
         
     @property
     def session(self) -> ProcessSession:
-        return self.gpg.session
\ No newline at end of file
+        return self.gpg.session
+
+
+class AsyncBaseOperator:
+    def __init__(self, gpg: Any) -> None:
+        self.gpg = gpg
+
+    @property
+    def session(self) -> AsyncProcessSession:
+        return self.gpg.async_session
\ No newline at end of file
@@ -0,0 +1,109 @@
+import os
+from threading import RLock
+from typing import Any, Literal
+
+from .keys import Key, KeyOperator, key_identifiers, normalize_identifier
+
+KEYRING_FILES = ["pubring.kbx", "pubring.gpg", "trustdb.gpg", "private-keys-v1.d"]
+"""Homedir entries whose modification invalidates a KeyIndex"""
+
+
+class KeyIndex:
+    """In-process index of the keyring, mapping identifiers to parsed Keys.
+
+    The index is rebuilt lazily (one listing per key type) whenever the keyring files in the homedir
+    change, or when `invalidate` is called by one of GPyG's own mutating operations. Fresh lookups are
+    plain dict hits and never spawn gpg.
+
+    Args:
+        gpg (GPG): The GPG instance to index
+    """
+
+    def __init__(self, gpg: Any) -> None:
+        self.gpg = gpg
+        self.generation = 0
+        self._lock = RLock()
+        self._tables: dict[str, tuple[Any, dict[str, list[Key]], list[Key]]] = {}
+
+    @property
+    def homedir(self) -> str:
+        """The homedir whose files are watched
+
+        Returns:
+            str: Path to the homedir
+        """
+        if self.gpg.homedir:
+            return self.gpg.homedir
+        return os.environ.get("GNUPGHOME", os.path.expanduser("~/.gnupg"))
+
+    def invalidate(self) -> None:
+        """Drops all cached listings, forcing the next lookup to reload from gpg"""
+        with self._lock:
+            self.generation += 1
+            self._tables.clear()
+
+    def _stamp(self) -> tuple:
+        stamp = [self.generation]
+        for name in KEYRING_FILES:
+            try:
+                result = os.stat(os.path.join(self.homedir, name))
+                stamp.append((result.st_ino, result.st_mtime_ns, result.st_size))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _table(
+        self, key_type: Literal["public", "secret"]
+    ) -> tuple[dict[str, list[Key]], list[Key]]:
+        with self._lock:
+            stamp = self._stamp()
+            cached = self._tables.get(key_type)
+            if cached and cached[0] == stamp:
+                return cached[1], cached[2]
+
+            operator = KeyOperator(self.gpg)
+            process = self.gpg.session.spawn(
+                operator._list_command(None, key_type, True)
+            )
+            process.wait()
+            keys = operator._parse_listing(process.output)
+
+            mapping: dict[str, list[Key]] = {}
+            for key in keys:
+                for identifier in key_identifiers(key):
+                    mapping.setdefault(identifier, []).append(key)
+
+            self._tables[key_type] = (stamp, mapping, keys)
+            return mapping, keys
+
+    def keys(self, key_type: Literal["public", "secret"] = "public") -> list[Key]:
+        """Returns every indexed key of a type
+
+        Args:
+            key_type (public | secret, optional): What key type to return. Defaults to "public".
+
+        Returns:
+            list[Key]: All keys, in keyring order
+        """
+        return self._table(key_type)[1][:]
+
+    def lookup(
+        self, identifier: str, key_type: Literal["public", "secret"] = "public"
+    ) -> list[Key] | None:
+        """Looks up keys by fingerprint, key ID, keygrip or UID email
+
+        Args:
+            identifier (str): Identifier to search for
+            key_type (public | secret, optional): What key type to return. Defaults to "public".
+
+        Returns:
+            list[Key] | None: Matching keys, or None if the identifier can't be answered from the index and gpg should be asked instead.
+        """
+        normalized = normalize_identifier(identifier)
+        if normalized == None:
+            return None
+
+        found = self._table(key_type)[0].get(normalized)
+        if found:
+            return found[:]
+        return None if "@" in normalized else []
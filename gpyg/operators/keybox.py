@@ -0,0 +1,507 @@
+from collections.abc import Generator
+import hashlib
+import mmap
+import os
+import re
+from threading import RLock
+import time
+from typing import Any
+
+from ..models import (
+    ColonRecord,
+    FingerprintRecord,
+    KeygripRecord,
+    KeyModel,
+    KeyRecord,
+    SignatureRecord,
+    UserIDRecord,
+)
+from ..util import (
+    PUBLIC_KEY,
+    PUBLIC_SUBKEY,
+    SIGNATURE,
+    USER_ATTRIBUTE,
+    USER_ID,
+    PacketError,
+    SignaturePacket,
+    iter_packets,
+    key_fingerprint,
+    key_parameters,
+    compute_keygrip,
+    parse_signature,
+)
+from .keys import Key, normalize_identifier
+
+KEYBOX_OPENPGP = 2
+"""Keybox blob type holding an OpenPGP keyblock"""
+
+KEYBOX_EPHEMERAL = 0x02
+"""Blob flag of keys gpg only stored temporarily (ie while verifying), which listings skip"""
+
+SIGNER_NOT_FOUND = "[User ID not found]"
+"""Signer UID gpg lists for signatures by keys missing from the keyring"""
+
+ALGORITHM_USAGE = {
+    1: "esca",
+    2: "e",
+    3: "sc",
+    16: "e",
+    17: "sca",
+    18: "e",
+    19: "sca",
+    20: "e",
+    22: "sca",
+}
+"""Capabilities gpg assumes for keys without a key flags subpacket, by algorithm"""
+
+_CAPABILITY_FLAGS = [("e", 0x0C), ("s", 0x02), ("c", 0x01), ("a", 0x20)]
+_CERTIFICATIONS = (0x10, 0x11, 0x12, 0x13)
+
+
+class KeyboxReader:
+    """Read-only parser of a keybox (`pubring.kbx`), listing public keys without spawning gpg.
+
+    The file is memory-mapped, and an index of the fingerprints and key IDs in each blob's header is
+    built without parsing any keys, so `get_key` only parses the matching keyblock. Both are rebuilt
+    whenever the file changes. Keys have the same shape as `list_keys` results (`--with-sig-list`),
+    except that validity is only known to be revoked (`r`) or expired (`e`), and otherwise reported as
+    unknown (`-`), and owner trust is always unknown (`-`), since both live in the trust database.
+    Signatures are not verified.
+
+    Args:
+        path (str): Path of the keybox file
+        operator (KeyOperator | None, optional): If given, keys are returned as `Key`s bound to this operator instead of plain `KeyModel`s. Defaults to None.
+    """
+
+    def __init__(self, path: str, operator: Any = None) -> None:
+        self.path = path
+        self.operator = operator
+        self._lock = RLock()
+        self._stamp: tuple | None = None
+        self._loaded = False
+        self._map: mmap.mmap | None = None
+        self._blobs: list[int] = []
+        self._index: dict[str, list[int]] = {}
+        self._primary_uids: dict[int, str | None] = {}
+
+    def __enter__(self) -> "KeyboxReader":
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmaps the keybox file"""
+        with self._lock:
+            if self._map:
+                self._map.close()
+            self._map = None
+            self._stamp = None
+            self._loaded = False
+            self._blobs = []
+            self._index = {}
+            self._primary_uids = {}
+
+    def refresh(self) -> bool:
+        """Remaps and reindexes the file if it changed since it was last read
+
+        Returns:
+            bool: True if the file was (re)loaded
+        """
+        with self._lock:
+            try:
+                result = os.stat(self.path)
+                stamp = (result.st_ino, result.st_mtime_ns, result.st_size)
+            except FileNotFoundError:
+                stamp = None
+            if self._loaded and stamp == self._stamp:
+                return False
+
+            self.close()
+            self._stamp = stamp
+            self._loaded = True
+            if stamp != None and stamp[2] > 0:
+                with open(self.path, "rb") as file:
+                    self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._build_index()
+            return True
+
+    def fingerprints(self) -> list[str]:
+        """Lists the primary key fingerprints in the keybox, without parsing any keys
+
+        Returns:
+            list[str]: Fingerprints, in keybox order
+        """
+        with self._lock:
+            self.refresh()
+            return [self._header_fingerprints(offset)[0] for offset in self._blobs]
+
+    def iter_keys(self) -> Generator[KeyModel, Any, None]:
+        """Lazily parses every key in the keybox
+
+        Raises:
+            RuntimeError: If the keybox was reloaded (by another call on this reader) during iteration
+
+        Yields:
+            KeyModel: Keys (with nested subkeys), in keybox order
+        """
+        with self._lock:
+            self.refresh()
+            data, blobs = self._map, self._blobs[:]
+        for offset in blobs:
+            with self._lock:
+                if self._map is not data:
+                    raise RuntimeError("Keybox changed during iteration")
+                keys = self._build(offset)
+            yield from keys
+
+    def keys(self) -> list[KeyModel]:
+        """Parses every key in the keybox
+
+        Returns:
+            list[KeyModel]: Keys (with nested subkeys), in keybox order
+        """
+        return list(self.iter_keys())
+
+    def get_key(self, identifier: str) -> KeyModel | None:
+        """Looks up the key owning a fingerprint or key ID (of the primary key or any subkey)
+
+        Args:
+            identifier (str): Fingerprint or (long or short) key ID
+
+        Returns:
+            KeyModel | None: The matching key, or None if it isn't in the keybox
+        """
+        with self._lock:
+            self.refresh()
+            offsets = self._index.get(normalize_identifier(identifier) or "", [])
+            if len(offsets) == 0:
+                return None
+            keys = self._build(offsets[0])
+        return keys[0] if len(keys) > 0 else None
+
+    def _build_index(self) -> None:
+        # Only blob headers are read here; keyblocks are parsed on demand
+        data = self._map
+        offset = 0
+        while offset + 6 <= len(data):
+            length = int.from_bytes(data[offset : offset + 4], "big")
+            if length < 6 or offset + length > len(data):
+                raise PacketError(f"Invalid keybox blob at offset {offset}")
+            if (
+                data[offset + 4] == KEYBOX_OPENPGP
+                and not int.from_bytes(data[offset + 6 : offset + 8], "big")
+                & KEYBOX_EPHEMERAL
+            ):
+                self._blobs.append(offset)
+                for fingerprint in self._header_fingerprints(offset):
+                    key_id = _key_id(fingerprint)
+                    for identifier in (fingerprint, key_id, key_id[-8:]):
+                        self._index.setdefault(identifier, []).append(offset)
+            offset += length
+
+    def _header_fingerprints(self, offset: int) -> list[str]:
+        # Version 1 blobs store 20-byte fingerprints; version 2 blobs pad them to 32 bytes and flag the long ones
+        data = self._map
+        version = data[offset + 5]
+        count = int.from_bytes(data[offset + 16 : offset + 18], "big")
+        size = int.from_bytes(data[offset + 18 : offset + 20], "big")
+        result = []
+        for index in range(count):
+            start = offset + 20 + index * size
+            width = 20
+            if version >= 2 and data[start + 33] & 0x80:
+                width = 32
+            result.append(data[start : start + width].hex().upper())
+        return result
+
+    def _keyblock(self, offset: int) -> bytes:
+        # Copied out of the map, so no buffer exports keep it from being closed
+        data = self._map
+        start = offset + int.from_bytes(data[offset + 8 : offset + 12], "big")
+        length = int.from_bytes(data[offset + 12 : offset + 16], "big")
+        return data[start : start + length]
+
+    def _parse(self, offset: int) -> list[tuple[int, bytes, list[SignaturePacket]]]:
+        keyblock = self._keyblock(offset)
+        entries: list[tuple[int, bytes, list[SignaturePacket]]] = []
+        for tag, _, body_start, end in iter_packets(keyblock):
+            if tag in (PUBLIC_KEY, PUBLIC_SUBKEY, USER_ID, USER_ATTRIBUTE):
+                entries.append((tag, keyblock[body_start:end], []))
+            elif tag == SIGNATURE and len(entries) > 0:
+                entries[-1][2].append(parse_signature(keyblock[body_start:end]))
+
+        if len(entries) == 0 or entries[0][0] != PUBLIC_KEY:
+            raise PacketError(f"Keybox blob at offset {offset} does not hold a public key")
+        return entries
+
+    def _primary_uid(self, offset: int) -> str | None:
+        if offset not in self._primary_uids:
+            entries = self._parse(offset)
+            primary = _KeyState(entries[0])
+            uids = [
+                _UserID(body, sigs, primary) for tag, body, sigs in entries if tag == USER_ID
+            ]
+            self._primary_uids[offset] = _choose_primary_uid(uids)
+        return self._primary_uids[offset]
+
+    def _signer(self, signature: SignaturePacket) -> str | None:
+        offsets = self._index.get(signature.issuer or "", [])
+        return self._primary_uid(offsets[0]) if len(offsets) > 0 else None
+
+    def _build(self, offset: int) -> list[KeyModel]:
+        records = self._records(offset)
+        if self.operator != None:
+            return Key.from_infolines(self.operator, records)
+        return KeyModel.from_infolines(records)
+
+    def _records(self, offset: int) -> list[ColonRecord]:
+        entries = self._parse(offset)
+        primary = _KeyState(entries[0])
+        now = time.time()
+
+        uids = [_UserID(body, sigs, primary) for tag, body, sigs in entries if tag == USER_ID]
+        self._primary_uids[offset] = _choose_primary_uid(uids)
+
+        certifications = [
+            sig
+            for tag, _, sigs in entries
+            if tag == USER_ID
+            for sig in sigs
+            if sig.signature_class in _CERTIFICATIONS and primary.issued(sig)
+        ] + [
+            sig
+            for sig in primary.signatures
+            if sig.signature_class == 0x1F and primary.issued(sig)
+        ]
+        primary.apply(
+            max(certifications, key=lambda i: i.created, default=None),
+            any([i.signature_class == 0x20 and primary.issued(i) for i in primary.signatures]),
+            now,
+        )
+
+        subkeys = []
+        for tag, body, sigs in entries:
+            if tag != PUBLIC_SUBKEY:
+                continue
+            subkey = _KeyState((tag, body, sigs))
+            bindings = [i for i in sigs if i.signature_class == 0x18 and primary.issued(i)]
+            subkey.apply(
+                max(bindings, key=lambda i: i.created, default=None),
+                primary.validity == "r"
+                or any([i.signature_class == 0x28 and primary.issued(i) for i in sigs]),
+                now,
+                subkey=True,
+            )
+            subkeys.append(subkey)
+
+        overall = set()
+        if primary.validity == "-":
+            for key in [primary, *subkeys]:
+                if key.validity == "-":
+                    overall.update(key.capabilities)
+
+        records = []
+        uid_iter = iter(uids)
+        for tag, body, sigs in entries:
+            if tag == PUBLIC_KEY:
+                capabilities = primary.capabilities + "".join(
+                    [i.upper() for i, _ in _CAPABILITY_FLAGS if i in overall]
+                )
+                records.extend(primary.records("pub", capabilities, "-"))
+            elif tag == PUBLIC_SUBKEY:
+                subkey = subkeys.pop(0)
+                records.extend(subkey.records("sub", subkey.capabilities, None))
+            elif tag == USER_ID:
+                records.append(next(uid_iter).record(primary))
+            else:
+                records.append(_attribute_record(body, sigs, primary))
+            records.extend([self._signature_record(i) for i in sigs])
+        return records
+
+    def _signature_record(self, signature: SignaturePacket) -> SignatureRecord:
+        signer = self._signer(signature)
+        signature_class = f"{signature.signature_class:02x}" + (
+            "x" if signature.exportable else "l"
+        )
+        if signature.is_revocation and signature.revocation_reason != None:
+            signature_class += f",{signature.revocation_reason:02x}"
+        return _record(
+            SignatureRecord,
+            "rev" if signature.is_revocation else "sig",
+            {
+                2: "" if signer != None else "?",
+                4: str(signature.algorithm),
+                5: signature.issuer or "",
+                6: str(signature.created),
+                7: str(signature.created + signature.expires) if signature.expires else "",
+                10: _escape(signer.encode()) if signer != None else SIGNER_NOT_FOUND,
+                11: signature_class,
+                13: signature.issuer_fingerprint or "",
+                16: str(signature.hash_algorithm),
+            },
+        )
+
+
+class _KeyState:
+    # A (sub)key packet, with the state gpg derives from its self-signatures
+    def __init__(self, entry: tuple[int, bytes, list[SignaturePacket]]) -> None:
+        _, body, self.signatures = entry
+        self.body = body
+        self.fingerprint = key_fingerprint(body)
+        self.key_id = _key_id(self.fingerprint)
+        self.algorithm, self.length, self.curve = key_parameters(body)
+        self.created = int.from_bytes(body[1:5], "big")
+        self.expires: int | None = None
+        self.capabilities = ""
+        self.validity = "-"
+
+    def issued(self, signature: SignaturePacket) -> bool:
+        return signature.issuer == self.key_id or signature.issuer_fingerprint == self.fingerprint
+
+    def apply(
+        self, selfsig: SignaturePacket | None, revoked: bool, now: float, subkey: bool = False
+    ) -> None:
+        flags = selfsig.key_flags if selfsig else None
+        if flags == None:
+            default = ALGORITHM_USAGE.get(self.algorithm, "")
+            self.capabilities = default.replace("c", "") if subkey else default
+        else:
+            self.capabilities = "".join([i for i, bit in _CAPABILITY_FLAGS if flags & bit])
+        if selfsig and selfsig.key_expires:
+            self.expires = self.created + selfsig.key_expires
+        if revoked:
+            self.validity = "r"
+        elif self.expires and self.expires <= now:
+            self.validity = "e"
+
+    def records(self, record_type: str, capabilities: str, owner_trust: str | None) -> list[ColonRecord]:
+        grip = compute_keygrip(self.body)
+        return [
+            _record(
+                KeyRecord,
+                record_type,
+                {
+                    2: self.validity,
+                    3: str(self.length),
+                    4: str(self.algorithm),
+                    5: self.key_id,
+                    6: str(self.created),
+                    7: str(self.expires) if self.expires else "",
+                    9: owner_trust or "",
+                    12: capabilities,
+                    17: self.curve or "",
+                },
+            ),
+            _record(FingerprintRecord, "fpr", {10: self.fingerprint}),
+            *([_record(KeygripRecord, "grp", {10: grip})] if grip else []),
+        ]
+
+
+class _UserID:
+    # A user ID packet, with its latest self-certification or revocation
+    def __init__(self, body: bytes, signatures: list[SignaturePacket], primary: _KeyState) -> None:
+        self.body = body
+        latest = max(
+            [
+                i
+                for i in signatures
+                if primary.issued(i) and (i.signature_class in _CERTIFICATIONS or i.signature_class == 0x30)
+            ],
+            key=lambda i: (i.created, i.signature_class == 0x30),
+            default=None,
+        )
+        self.revoked = latest != None and latest.signature_class == 0x30
+        self.certification = latest if latest and not self.revoked else None
+        self.expires = (
+            self.certification.created + self.certification.expires
+            if self.certification and self.certification.expires
+            else None
+        )
+
+    def valid(self, now: float) -> bool:
+        return self.certification != None and (self.expires == None or self.expires > now)
+
+    def record(self, primary: _KeyState) -> UserIDRecord:
+        validity = "r" if self.revoked else primary.validity
+        return _record(
+            UserIDRecord,
+            "uid",
+            {
+                2: validity,
+                6: str(self.certification.created) if self.certification else "",
+                7: str(self.expires) if self.expires else "",
+                8: _uid_hash(self.body),
+                10: _escape(self.body),
+            },
+        )
+
+
+def _choose_primary_uid(uids: list[_UserID]) -> str | None:
+    # Like gpg: the newest valid UID flagged as primary, else the newest valid UID
+    now = time.time()
+    valid = [i for i in uids if i.valid(now)]
+    if len(valid) == 0:
+        return uids[0].body.decode(errors="replace") if len(uids) > 0 else None
+    best = max(valid, key=lambda i: (i.certification.primary_uid, i.certification.created))
+    return best.body.decode(errors="replace")
+
+
+def _attribute_record(body: bytes, signatures: list[SignaturePacket], primary: _KeyState) -> ColonRecord:
+    uid = _UserID(body, signatures, primary)
+    count = sum([1 for _ in _iter_attributes(body)])
+    return _record(
+        ColonRecord,
+        "uat",
+        {
+            2: "r" if uid.revoked else primary.validity,
+            6: str(uid.certification.created) if uid.certification else "",
+            8: _uid_hash(body),
+            10: f"{count} {len(body)}",
+        },
+    )
+
+
+def _iter_attributes(body: bytes) -> Generator[int, Any, None]:
+    offset = 0
+    while offset < len(body):
+        first = body[offset]
+        if first < 192:
+            length, offset = first, offset + 1
+        elif first < 255:
+            length, offset = ((first - 192) << 8) + body[offset + 1] + 192, offset + 2
+        else:
+            length, offset = int.from_bytes(body[offset + 1 : offset + 5], "big"), offset + 5
+        yield length
+        offset += length
+
+
+def _key_id(fingerprint: str) -> str:
+    # v4 key IDs are the low 64 bits of the fingerprint, v5/v6 key IDs the high 64 bits
+    return fingerprint[-16:] if len(fingerprint) == 40 else fingerprint[:16]
+
+
+def _record(cls: type[ColonRecord], record_type: str, values: dict[int, str]) -> ColonRecord:
+    fields = [""] * 19
+    for number, value in values.items():
+        fields[number - 2] = value
+    return cls(record_type, fields)
+
+
+def _uid_hash(body: bytes) -> str:
+    try:
+        return hashlib.new("ripemd160", body).hexdigest().upper()
+    except ValueError:
+        # RIPEMD-160 is missing from some OpenSSL builds
+        return ""
+
+
+_NEEDS_ESCAPE = re.compile(rb"[\x00-\x1f:\\\x7f]")
+_ESCAPES = {0x0A: "\\n", 0x0D: "\\r", 0x0C: "\\f", 0x0B: "\\v", 0x08: "\\b", 0x00: "\\0", 0x5C: "\\\\"}
+
+
+def _escape(value: bytes) -> str:
+    # Mirrors gpg's colon-listing sanitizer: control characters, colons and backslashes are escaped
+    return _NEEDS_ESCAPE.sub(
+        lambda match: _ESCAPES.get(match[0][0], f"\\x{match[0][0]:02x}").encode(), value
+    ).decode(errors="replace")
@@ -1,18 +1,33 @@
-from collections.abc import Generator
+import asyncio
+from collections.abc import AsyncGenerator, Generator, Iterable
 from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 from enum import StrEnum
-import shlex
-from tempfile import NamedTemporaryFile
-from typing import Any, Literal
+import os
+import re
+from typing import TYPE_CHECKING, Any, BinaryIO, Literal
 
 from pydantic import Field, PrivateAttr, computed_field
 
 from gpyg.util import interactive
-from .common import BaseOperator
-from ..util import ExecutionError, ProcessSession, StatusInteractive, StatusLine
+from .common import AsyncBaseOperator, BaseOperator, async_mutating, mutating
+from ..util import (
+    AsyncProcess,
+    armor,
+    ExecutionError,
+    pipe_source,
+    split_keys,
+    Process,
+    ProcessSession,
+    StatusInteractive,
+    StatusLine,
+)
 from ..models import (
+    ColonRecord,
+    ImportReport,
     InfoLine,
+    KeySpec,
+    iter_records,
     parse_infoline,
     KeyModel,
     StatusCodes,
@@ -23,8 +38,194 @@ from ..models import (
     KeyTrust,
 )
 
+if TYPE_CHECKING:
+    from .index import KeyIndex
+
+ImportSource = str | os.PathLike | bytes | BinaryIO
+
+HEX_IDENTIFIER = re.compile(r"^(?:0x|&)?([0-9A-Fa-f]{8}|[0-9A-Fa-f]{16}|[0-9A-Fa-f]{40})!?$")
+EMAIL_IDENTIFIER = re.compile(r"^<?([^<>\s@]+@[^<>\s@]+)>?$")
+UID_EMAIL = re.compile(r"<([^<>\s@]+@[^<>\s@]+)>")
+
+
+def normalize_identifier(identifier: str) -> str | None:
+    """Normalizes a fingerprint, key ID, keygrip or email pattern
+
+    Args:
+        identifier (str): The pattern to normalize
+
+    Returns:
+        str | None: Upper-case hex for key identifiers, lower-case address for emails, or None for other patterns
+    """
+    hex_match = HEX_IDENTIFIER.match(identifier.strip())
+    if hex_match:
+        return hex_match.group(1).upper()
+
+    email_match = EMAIL_IDENTIFIER.match(identifier.strip())
+    if email_match:
+        return email_match.group(1).lower()
+    return None
+
+
+def key_identifiers(key: KeyModel) -> set[str]:
+    """Returns all normalized identifiers a key may be looked up by
+
+    Args:
+        key (KeyModel): A primary key
+
+    Returns:
+        set[str]: Fingerprints, key IDs and keygrips of the key and its subkeys, and its UID emails
+    """
+    result = set()
+    for item in [key, *key.internal_subkeys]:
+        if item.fingerprint:
+            result.add(item.fingerprint.upper())
+        if item.key_id:
+            result.add(item.key_id.upper())
+            result.add(item.key_id.upper()[-8:])
+        if item.keygrip:
+            result.add(item.keygrip.upper())
+
+    for uid in key.user_ids:
+        for email in UID_EMAIL.findall(uid.uid or ""):
+            result.add(email.lower())
+        if uid.uid and EMAIL_IDENTIFIER.match(uid.uid):
+            result.add(EMAIL_IDENTIFIER.match(uid.uid).group(1).lower())
+    return result
+
+
+def key_matches(key: KeyModel, identifier: str) -> bool:
+    """Checks whether a listed key is the one gpg matched for a given pattern
+
+    Args:
+        key (KeyModel): A primary key
+        identifier (str): The pattern passed to gpg
+
+    Returns:
+        bool: True if the key matches
+    """
+    normalized = normalize_identifier(identifier)
+    if normalized and normalized in key_identifiers(key):
+        return True
+    return uid_matches(key, identifier)
+
+
+def uid_matches(key: KeyModel, identifier: str) -> bool:
+    """Checks whether a non-identifier pattern (ie a name) matches one of a key's UIDs, as gpg does
+
+    Args:
+        key (KeyModel): A primary key
+        identifier (str): The pattern passed to gpg
+
+    Returns:
+        bool: True if a UID matches. Always False for hex patterns, which only match identifiers.
+    """
+    if HEX_IDENTIFIER.match(identifier.strip()):
+        return False
+
+    uids = [(uid.uid or "") for uid in key.user_ids]
+    if identifier.startswith("="):
+        return identifier[1:] in uids
+    needle = identifier.lstrip("*<").rstrip(">").casefold()
+    return any([needle in uid.casefold() for uid in uids])
+
+
+def chunk_arguments(
+    arguments: list[str], reserved: list[str] = []
+) -> Generator[list[str], Any, None]:
+    """Splits arguments into chunks that fit on a single command line
+
+    Args:
+        arguments (list[str]): Arguments to split
+        reserved (list[str], optional): Arguments that will be present in every invocation. Defaults to [].
+
+    Yields:
+        list[str]: Chunks of arguments
+    """
+    try:
+        limit = os.sysconf("SC_ARG_MAX")
+    except (ValueError, OSError):
+        limit = 128 * 1024
+    environment = sum([len(k) + len(v) + 2 + 8 for k, v in os.environ.items()])
+    budget = max(
+        4096,
+        min(limit // 2, limit - environment - 4096)
+        - sum([len(i.encode()) + 1 + 8 for i in reserved]),
+    )
+
+    chunk: list[str] = []
+    size = 0
+    for argument in arguments:
+        cost = len(argument.encode()) + 1 + 8
+        if len(chunk) > 0 and size + cost > budget:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(argument)
+        size += cost
+    if len(chunk) > 0:
+        yield chunk
+
+
+class KeyBlocks:
+    """Incrementally splits colon-formatted listing output into per-key blocks.
+    Only the lines of the key currently being read (plus one partial line) are held in memory.
+    """
+
+    def __init__(self) -> None:
+        self.partial = b""
+        self.block: list[str] = []
+
+    def feed(self, chunk: bytes) -> list[list[str]]:
+        """Consumes a chunk of output
+
+        Args:
+            chunk (bytes): Raw stdout data
+
+        Returns:
+            list[list[str]]: Any key blocks completed by this chunk
+        """
+        lines = (self.partial + chunk).split(b"\n")
+        self.partial = lines.pop()
+        completed = []
+        for raw in lines:
+            line = raw.decode(errors="replace").rstrip("\r")
+            if line.startswith(("pub:", "sec:")):
+                if len(self.block) > 0:
+                    completed.append(self.block)
+                self.block = [line]
+            elif len(self.block) > 0 and len(line) > 0:
+                self.block.append(line)
+        return completed
+
+    def close(self) -> list[list[str]]:
+        """Flushes the final block once output has ended
+
+        Returns:
+            list[list[str]]: The remaining key block, if any
+        """
+        completed = self.feed(b"\n") if len(self.partial) > 0 else []
+        if len(self.block) > 0:
+            completed.append(self.block)
+        self.block = []
+        return completed
+
 
 class KeyOperator(BaseOperator):
+    @property
+    def index(self) -> "KeyIndex | None":
+        """The GPG instance's KeyIndex, if indexing is enabled
+
+        Returns:
+            KeyIndex | None: The index, or None
+        """
+        return getattr(self.gpg, "index", None)
+
+    def invalidate(self) -> None:
+        """Marks cached keyring data as stale after a mutating operation"""
+        if self.index:
+            self.index.invalidate()
+
+    @mutating
     def generate_key(
         self,
         name: str,
@@ -54,11 +255,109 @@ class KeyOperator(BaseOperator):
         Returns:
             Returns the generated key
         """
-        uid = "{name}{email}{comment}".format(
-            name=name,
-            email=f" <{email}> " if email else " ",
-            comment=f"({comment})" if comment else "",
-        ).strip()
+        pool = getattr(self.gpg, "pool", None)
+        if pool and pool.matches(algorithm, usage, expiration):
+            uid = self._generated_uid(name, email, comment)
+            if not force and len(self.list_keys(pattern="=" + uid)) > 0:
+                raise ExecutionError(f"A key for {uid} already exists")
+            return pool.take(name, email=email, comment=comment, passphrase=passphrase)
+
+        return self._generate_key(
+            name, email, comment, algorithm, usage, expiration, passphrase, force
+        )
+
+    @mutating
+    def _generate_key(
+        self,
+        name: str,
+        email: str | None = None,
+        comment: str | None = None,
+        algorithm: str | None = None,
+        usage: list[str] | None = None,
+        expiration: datetime | timedelta | int | None = None,
+        passphrase: str | None = None,
+        force: bool = False,
+    ) -> "Key":
+        command = self._generate_command(
+            name, email, comment, algorithm, usage, expiration, force
+        )
+        proc = self.session.run(
+            command, input=passphrase if passphrase else "", status=True
+        )
+        self.invalidate()
+        fingerprint = self._generated_fingerprint(proc)
+        if fingerprint:
+            return self.list_keys(pattern=fingerprint)[0]
+        else:
+            raise ExecutionError(proc.errors)
+
+    @mutating
+    def generate_keys(
+        self, specs: Iterable[KeySpec | dict[str, Any]]
+    ) -> list["Key | None"]:
+        """Generates any number of keys with a single unattended `gpg --generate-key` run
+
+        Args:
+            specs (Iterable[KeySpec | dict[str, Any]]): Key parameters, as KeySpecs or dicts of their fields
+
+        Raises:
+            ExecutionError: If gpg failed without generating any key
+
+        Returns:
+            list[Key | None]: Generated keys, in the order of `specs`. Keys that gpg failed to generate are None.
+        """
+        specs = [i if isinstance(i, KeySpec) else KeySpec(**i) for i in specs]
+        if len(specs) == 0:
+            return []
+
+        proc = self.session.run(
+            self._generate_batch_command(),
+            input=self._generate_parameters(specs),
+            status=True,
+        )
+        self.invalidate()
+        fingerprints = self._generated_fingerprints(proc, len(specs))
+        created = [i for i in fingerprints if i != None]
+        if len(created) == 0:
+            raise ExecutionError(proc.errors)
+
+        keys = self.get_keys(*created)
+        return [keys.get(i) if i != None else None for i in fingerprints]
+
+    def _generate_batch_command(self) -> list[str]:
+        return ["gpg", "--batch", "--pinentry-mode", "loopback", "--generate-key"]
+
+    def _generate_parameters(self, specs: list[KeySpec]) -> str:
+        return "".join(
+            [
+                line + "\n"
+                for handle, spec in enumerate(specs)
+                for line in spec.parameters(handle=str(handle))
+            ]
+        )
+
+    def _generated_fingerprints(
+        self, process: Process | AsyncProcess, count: int
+    ) -> list[str | None]:
+        fingerprints: list[str | None] = [None] * count
+        for line in process.get_status(StatusCodes.KEY_CREATED):
+            if len(line.arguments) > 2 and line.arguments[2].isdigit():
+                handle = int(line.arguments[2])
+                if handle < count:
+                    fingerprints[handle] = line.arguments[1]
+        return fingerprints
+
+    def _generate_command(
+        self,
+        name: str,
+        email: str | None,
+        comment: str | None,
+        algorithm: str | None,
+        usage: list[str] | None,
+        expiration: datetime | timedelta | int | None,
+        force: bool,
+    ) -> list[str]:
+        uid = self._generated_uid(name, email, comment)
 
         if isinstance(expiration, datetime):
             expire_str = expiration.isoformat()
@@ -69,21 +368,35 @@ class KeyOperator(BaseOperator):
         else:
             expire_str = "none"
 
-        command = "gpg {force} --batch --pinentry-mode loopback --passphrase-fd 0 --quick-gen-key {uid} {algo} {usage} {expire}".format(
-            force="--yes" if force else "",
-            uid=shlex.quote(uid),
-            algo=shlex.quote(algorithm if algorithm else "default"),
-            usage=shlex.quote(",".join(usage)) if usage else "default",
-            expire=shlex.quote(expire_str),
-        )
-        print(command)
-        proc = self.session.run(command, input=passphrase if passphrase else "")
-        if "certificate stored" in proc.output.strip().split("\n")[-1]:
-            return self.list_keys(
-                pattern=proc.output.strip().split("\n")[-1].split("/")[-1].split(".")[0]
-            )[0]
-        else:
-            raise ExecutionError(proc.output)
+        return [
+            "gpg",
+            *(["--yes"] if force else []),
+            "--batch",
+            "--pinentry-mode",
+            "loopback",
+            "--passphrase-fd",
+            "0",
+            "--quick-gen-key",
+            uid,
+            algorithm if algorithm else "default",
+            ",".join(usage) if usage else "default",
+            expire_str,
+        ]
+
+    def _generated_uid(
+        self, name: str, email: str | None, comment: str | None
+    ) -> str:
+        return "{name}{email}{comment}".format(
+            name=name,
+            email=f" <{email}> " if email else " ",
+            comment=f"({comment})" if comment else "",
+        ).strip()
+
+    def _generated_fingerprint(self, process: Process | AsyncProcess) -> str | None:
+        created = process.get_status(StatusCodes.KEY_CREATED)
+        if len(created) > 0 and len(created[0].arguments) > 1:
+            return created[0].arguments[1]
+        return None
 
     def list_keys(
         self,
@@ -101,27 +414,75 @@ class KeyOperator(BaseOperator):
         Returns:
             List of results
         """
+        indexed = self._indexed(pattern, key_type, check_sigs)
+        if indexed != None:
+            return indexed
 
-        args = [
-            i
-            for i in [
-                "gpg",
-                "--with-colons",
-                "--with-fingerprint",
-                "--with-subkey-fingerprint",
-                "--with-keygrip",
-                "--with-sig-check" if check_sigs else "--with-sig-list",
-                f"--list-{"public" if key_type == "public" else "secret"}-keys",
-                shlex.quote(pattern) if pattern else None,
-            ]
-            if i != None
-        ]
-        proc = self.session.spawn(args)
+        proc = self.session.spawn(self._list_command(pattern, key_type, check_sigs))
         proc.wait()
+        return self._parse_listing(proc.output)
+
+    def _indexed(
+        self,
+        pattern: str | None,
+        key_type: Literal["public", "secret"],
+        check_sigs: bool,
+    ) -> list["Key"] | None:
+        if not self.index or not check_sigs:
+            return None
+        if pattern == None:
+            return self.index.keys(key_type=key_type)
+        return self.index.lookup(pattern, key_type=key_type)
+
+    def _list_command(
+        self,
+        pattern: str | list[str] | None,
+        key_type: Literal["public", "secret"],
+        check_sigs: bool,
+    ) -> list[str]:
+        return [
+            "gpg",
+            "--with-colons",
+            "--with-fingerprint",
+            "--with-subkey-fingerprint",
+            "--with-keygrip",
+            "--with-sig-check" if check_sigs else "--with-sig-list",
+            f"--list-{"public" if key_type == "public" else "secret"}-keys",
+            *([pattern] if type(pattern) == str else (pattern if pattern else [])),
+        ]
+
+    def _parse_listing(self, output: str) -> list["Key"]:
+        return Key.from_infolines(self, iter_records(output.splitlines()))
+
+    def iter_keys(
+        self,
+        pattern: str | list[str] | None = None,
+        key_type: Literal["public", "secret"] = "public",
+        check_sigs: bool = True,
+    ) -> Generator["Key", Any, None]:
+        """Lazily lists keys, yielding each one as soon as gpg has finished printing it.
+        Memory use is bounded by the size of a single key, and gpg is killed if the generator is closed early.
+
+        Args:
+            pattern (str | list[str] | None, optional): Optional pattern(s) to filter results by. Defaults to None.
+            key_type (public | secret, optional): What key type to return. Defaults to "public".
+            check_sigs (bool, optional): Whether to check signatures or just list them. Defaults to True.
+
+        Yields:
+            Key: Keys, in keyring order
+        """
+        blocks = KeyBlocks()
+        for chunk in self.session.stream(
+            self._list_command(pattern, key_type, check_sigs)
+        ):
+            for block in blocks.feed(chunk):
+                yield from self._parse_block(block)
 
-        lines = [i for i in proc.output.splitlines() if not i.startswith("gpg: ")]
-        parsed = [parse_infoline(line) for line in lines]
-        return Key.from_infolines(self, parsed)
+        for block in blocks.close():
+            yield from self._parse_block(block)
+
+    def _parse_block(self, block: list[str]) -> list["Key"]:
+        return Key.from_infolines(self, iter_records(block))
 
     def get_key(
         self, fingerprint: str, key_type: Literal["public", "secret"] = "public"
@@ -141,6 +502,73 @@ class KeyOperator(BaseOperator):
 
         return results[0]
 
+    def get_keys(
+        self,
+        *identifiers: str,
+        key_type: Literal["public", "secret"] = "public",
+        check_sigs: bool = True,
+    ) -> dict[str, "Key | None"]:
+        """Resolves many identifiers at once, using a single gpg listing (split into chunks to stay under ARG_MAX)
+
+        Args:
+            *identifiers (str): Fingerprints, key IDs, keygrips, emails or other gpg patterns
+            key_type (public | secret, optional): What key type to return. Defaults to "public".
+            check_sigs (bool, optional): Whether to check signatures or just list them. Defaults to True.
+
+        Returns:
+            dict[str, Key | None]: Mapping of each identifier to the first matching Key, or None if not found
+        """
+        results, chunks = self._lookup_plan(identifiers, key_type, check_sigs)
+        for chunk in chunks:
+            proc = self.session.spawn(self._list_command(chunk, key_type, check_sigs))
+            proc.wait()
+            self._match_listing(chunk, self._parse_listing(proc.output), results)
+
+        return {identifier: results[identifier] for identifier in identifiers}
+
+    def _lookup_plan(
+        self,
+        identifiers: tuple[str, ...],
+        key_type: Literal["public", "secret"],
+        check_sigs: bool,
+    ) -> tuple[dict[str, "Key | None"], list[list[str]]]:
+        results: dict[str, Key | None] = {}
+        remaining: list[str] = []
+        for identifier in dict.fromkeys(identifiers):
+            indexed = (
+                self.index.lookup(identifier, key_type=key_type)
+                if self.index and check_sigs
+                else None
+            )
+            if indexed != None:
+                results[identifier] = indexed[0] if len(indexed) > 0 else None
+            else:
+                remaining.append(identifier)
+
+        return results, list(
+            chunk_arguments(
+                remaining, reserved=self._list_command(None, key_type, check_sigs)
+            )
+        )
+
+    def _match_listing(
+        self, chunk: list[str], keys: list["Key"], results: dict[str, "Key | None"]
+    ) -> None:
+        mapping: dict[str, Key] = {}
+        for key in keys:
+            for identifier in key_identifiers(key):
+                mapping.setdefault(identifier, key)
+
+        for identifier in chunk:
+            normalized = normalize_identifier(identifier)
+            if normalized and normalized in mapping:
+                results[identifier] = mapping[normalized]
+            else:
+                results[identifier] = next(
+                    (key for key in keys if uid_matches(key, identifier)), None
+                )
+
+    @mutating
     def import_key(self, *keyfiles: str):
         """Imports keys from file paths into the keyring
 
@@ -151,13 +579,194 @@ class KeyOperator(BaseOperator):
             ExecutionError: If operation fails
         """
         for file in keyfiles:
-            result = self.session.run(f"gpg --batch --yes --import {shlex.quote(file)
-                                      }")
+            result = self.session.run(["gpg", "--batch", "--yes", "--import", file])
+            self.invalidate()
             if result.code != 0:
                 raise ExecutionError(
-                    f"Failed to import {file} with code {result.code}:\n{result.output}"
+                    f"Failed to import {file} with code {result.code}:\n{result.errors}"
                 )
 
+    @mutating
+    def import_keys(self, *sources: ImportSource) -> ImportReport:
+        """Imports any number of keyfiles and in-memory keys with a single gpg invocation
+
+        Args:
+            *sources (str | PathLike | bytes | BinaryIO): File paths, raw key data (armored or binary), or readable binary streams. In-memory sources are streamed through their own pipes.
+
+        Raises:
+            ExecutionError: If gpg did not produce an import summary at all
+
+        Returns:
+            ImportReport: Per-key outcomes and gpg's summary counts
+        """
+        command, descriptors = self._import_command(sources)
+        try:
+            proc = self.session.run(
+                command, decode=False, pass_fds=descriptors, status=True
+            )
+        finally:
+            for fd in descriptors:
+                os.close(fd)
+        self.invalidate()
+        return self._import_report(proc)
+
+    @mutating
+    def import_data(self, data: bytes | Iterable[bytes]) -> ImportReport:
+        """Imports key material held in memory by streaming it to gpg's STDIN, without touching disk
+
+        Args:
+            data (bytes | Iterable[bytes]): Key data (armored or binary), or an iterable of chunks of it
+
+        Raises:
+            ExecutionError: If gpg did not produce an import summary at all
+
+        Returns:
+            ImportReport: Per-key outcomes and gpg's summary counts
+        """
+        proc = self.session.run(
+            ["gpg", "--batch", "--yes", "--import"], decode=False, input=data, status=True
+        )
+        self.invalidate()
+        return self._import_report(proc)
+
+    def _import_command(
+        self, sources: tuple[ImportSource, ...]
+    ) -> tuple[list[str], tuple[int, ...]]:
+        arguments: list[str] = []
+        descriptors: list[int] = []
+        for source in sources:
+            if isinstance(source, (str, os.PathLike)):
+                arguments.append(os.fspath(source))
+            else:
+                fd, _ = pipe_source(source)
+                descriptors.append(fd)
+                arguments.append(f"-&{fd}")
+
+        return [
+            "gpg",
+            "--batch",
+            "--yes",
+            "--enable-special-filenames",
+            "--import",
+            "--",
+            *arguments,
+        ], tuple(descriptors)
+
+    def _import_report(self, process: Process | AsyncProcess) -> ImportReport:
+        if len(process.get_status(StatusCodes.IMPORT_RES)) == 0:
+            raise ExecutionError(
+                f"Failed to import keys with code {process.code}:\n{process.errors.decode(errors="replace")}"
+            )
+        return ImportReport.from_status(
+            process.status,
+            code=process.code,
+            errors=process.errors.decode(errors="replace"),
+        )
+
+
+    def export_keys(
+        self,
+        keys: Iterable["Key | str"],
+        mode: Literal["gpg", "ascii"] = "ascii",
+        secret: bool = False,
+        password: str | None = None,
+        options: dict[str, bool | None] | None = None,
+        filters: list[tuple[Literal["keep-uid", "drop-subkey"], str]] = [],
+        output: BinaryIO | None = None,
+        split: bool = False,
+    ) -> bytes | dict[str, bytes] | None:
+        """Exports any number of keys with a single gpg invocation
+
+        Args:
+            keys (Iterable[Key | str]): Keys or patterns (fingerprints, key IDs, emails...) to export
+            mode (gpg | ascii, optional): Whether to output as GPG binary or ASCII armor. Defaults to "ascii".
+            secret (bool, optional): Whether to export secret keys. Defaults to False.
+            password (str | None, optional): Password required to unlock secret keys, which may or may not be relevant. Defaults to None.
+            options (dict[str, bool | None] | None, optional): Export options, by name (ie `{"export-minimal": True}` or `{"export_minimal": True}`). See `Key.export` for the supported options. Defaults to None.
+            filters (list[tuple[keep-uid | drop-subkey, str]], optional): List of export filters. For more information, see the GPG manual. Defaults to [].
+            output (BinaryIO | None, optional): Writable binary sink to stream the export into instead of returning it. Defaults to None.
+            split (bool, optional): Whether to split the export into one blob per key, keyed by primary fingerprint. Defaults to False.
+
+        Raises:
+            ValueError: If both `output` and `split` are given
+            ExecutionError: Raised if the attempted export operation fails.
+
+        Returns:
+            bytes | dict[str, bytes] | None: The combined export, a mapping of fingerprint -> export if `split`, or None if streamed into `output`.
+        """
+        if output != None and split:
+            raise ValueError("Cannot both split the export and stream it to an output")
+
+        targets = [i.fingerprint if isinstance(i, Key) else i for i in keys]
+        if len(targets) == 0:
+            return {} if split else (None if output != None else b"")
+
+        command = self._export_command(
+            "gpg" if split else mode, secret, password, options, filters
+        )
+        stream = self._export_stream(
+            command, targets, password + "\n" if password else None
+        )
+        if output != None:
+            for chunk in stream:
+                output.write(chunk)
+            return None
+
+        exported = b"".join(stream)
+        return self._split_export(exported, mode) if split else exported
+
+    def _split_export(
+        self, exported: bytes, mode: Literal["gpg", "ascii"]
+    ) -> dict[str, bytes]:
+        blobs: dict[str, bytes] = {}
+        for fingerprint, key_type, data in split_keys(exported):
+            if mode == "ascii":
+                data = armor(
+                    data,
+                    block=(
+                        "PGP PRIVATE KEY BLOCK"
+                        if key_type == "secret"
+                        else "PGP PUBLIC KEY BLOCK"
+                    ),
+                )
+            blobs[fingerprint] = data
+        return blobs
+
+    def _export_stream(
+        self, command: list[str], targets: list[str], stdin: str | None
+    ) -> Generator[bytes, Any, None]:
+        for chunk in chunk_arguments(targets, reserved=command):
+            process = yield from self.session.stream([*command, *chunk], input=stdin)
+            if process.code != 0:
+                raise ExecutionError(process.errors.decode(errors="replace"))
+
+    def _export_command(
+        self,
+        mode: Literal["gpg", "ascii"],
+        secret: bool,
+        password: str | None,
+        options: dict[str, bool | None] | None,
+        filters: list[tuple[str, str]],
+    ) -> list[str]:
+        command = ["gpg", "--pinentry-mode", "loopback", "--batch"]
+        if mode == "ascii":
+            command.append("--armor")
+        if password:
+            command.extend(["--passphrase-fd", "0"])
+        export_options = ",".join(
+            [
+                ("" if v else "no-") + k.replace("_", "-")
+                for k, v in (options or {}).items()
+                if v != None
+            ]
+        )
+        if export_options:
+            command.extend(["--export-options", export_options])
+        for name, expr in filters:
+            command.extend(["--export-filter", f"{name}={expr}"])
+        command.extend(["--export-secret-keys" if secret else "--export", "--"])
+        return command
+
 
 class Key(KeyModel):
     operator: KeyOperator = Field(exclude=True)
@@ -173,24 +782,26 @@ class Key(KeyModel):
         """
         return self.operator.session
 
+    @property
+    def gpg(self) -> Any:
+        """Gets the GPG instance this key was loaded through
+
+        Returns:
+            GPG: The GPG instance
+        """
+        return self.operator.gpg
+
     @computed_field
     def subkeys(self) -> list["Key"] | None:
         if self.is_subkey:
             return None
         return self.internal_subkeys
 
-    @staticmethod
-    def apply(operator: KeyOperator, model: KeyModel) -> "Key":
-        model.internal_subkeys = [
-            Key.apply(operator, i) for i in model.internal_subkeys
-        ][:]
-        return Key(operator=operator, **dict(model))
-
     @classmethod
     def from_infolines(
-        cls, operator: KeyOperator, lines: list[InfoLine]
+        cls, operator: KeyOperator, lines: Iterable[InfoLine | ColonRecord]
     ) -> list["Key"]:
-        return [Key.apply(operator, i) for i in super().from_infolines(lines)]
+        return super().from_infolines(lines, operator=operator)
 
     def reload(self) -> "Key":
         """Reloads cached information from the keyring.
@@ -262,34 +873,16 @@ class Key(KeyModel):
             mode1003=mode1003,
         )
 
-        cmd = "gpg{format} --pinentry-mode loopback --batch{passphrase} --export-options '{options}' {filters} --export{secret} {fingerprint}".format(
-            format=" --armor" if mode == "ascii" else "",
-            secret="-secret-keys" if self.type == "secret" else "",
-            fingerprint=self.fingerprint,
-            passphrase=" --passphrase-fd 0" if password else "",
-            options=",".join(
-                [
-                    ("" if v else "no-") + k.replace("_", "-")
-                    for k, v in options.items()
-                    if v != None
-                ]
-            ),
-            filters=(
-                " ".join(
-                    ["--export-filter " + name + "=" + expr for name, expr in filters]
-                )
-                if len(filters) > 0
-                else ""
-            ),
-        )
-
-        result = self.session.run(
-            cmd, decode=False, input=password + "\n" if password else None
-        )
-        if result.code == 0:
-            return result.output.strip()
-        raise ExecutionError(result.output.decode())
+        return self.operator.export_keys(
+            [self],
+            mode=mode,
+            secret=self.type == "secret",
+            password=password,
+            options=options,
+            filters=filters,
+        ).strip()
 
+    @mutating
     def set_expiration(
         self,
         expiration: date | None = None,
@@ -309,16 +902,19 @@ class Key(KeyModel):
         Returns:
             Key: Updated reference to self
         """
-        cmd = "gpg --batch --pinentry-mode loopback --passphrase-fd 0 --quick-set-expire {fingerprint} {expiry} {targets}".format(
-            fingerprint=self.fingerprint,
-            expiry=expiration.isoformat() if expiration else "0",
-            targets=(" ".join(subkeys) if subkeys != "*" else "'*'") if subkeys else "",
-        )
+        cmd = [
+            *self._loopback_command(bool(password)),
+            "--quick-set-expire",
+            self.fingerprint,
+            expiration.isoformat() if expiration else "0",
+            *((subkeys if subkeys != "*" else ["*"]) if subkeys else []),
+        ]
 
         result = self.session.run(cmd, input=password + "\n" if password else None)
         if result.code == 0:
+            self.operator.invalidate()
             return self.reload()
-        raise ExecutionError(result.output)
+        raise ExecutionError(result.errors)
 
     def is_protected(self) -> bool:
         """Checks if the current key is password-protected
@@ -327,10 +923,20 @@ class Key(KeyModel):
             bool: True if protected, False otherwise
         """
         proc = self.session.run(
-            f"gpg --dry-run --batch --passphrase-fd 0 --pinentry-mode loopback --passwd '{self.fingerprint}'",
+            [
+                "gpg",
+                "--dry-run",
+                "--batch",
+                "--passphrase-fd",
+                "0",
+                "--pinentry-mode",
+                "loopback",
+                "--passwd",
+                self.fingerprint,
+            ],
             input="\n",
         )
-        return "error" in proc.output
+        return "error" in proc.errors
 
     def check_password(self, password: str) -> bool:
         """Checks whether the given password is valid for this key
@@ -345,11 +951,66 @@ class Key(KeyModel):
             return True
 
         proc = self.session.run(
-            f"gpg --dry-run --batch --passphrase-fd 0 --pinentry-mode loopback --passwd '{self.fingerprint}'",
+            [
+                "gpg",
+                "--dry-run",
+                "--batch",
+                "--passphrase-fd",
+                "0",
+                "--pinentry-mode",
+                "loopback",
+                "--passwd",
+                self.fingerprint,
+            ],
             input=password + "\n",
         )
-        return not "error" in proc.output
+        return not "error" in proc.errors
+
+    def unlock(self, passphrase: str, ttl: float | None = None) -> "Key":
+        """Caches this key's passphrase (for the primary key and all subkeys) in gpg-agent, so further
+        operations on it can be called without a passphrase
+
+        Args:
+            passphrase (str): The key's passphrase
+            ttl (float | None, optional): Seconds after which to forget the passphrase, or keep it until `lock` is called. Defaults to None.
+
+        Raises:
+            ExecutionError: If the passphrase is incorrect
+
+        Returns:
+            Key: Reference to self
+        """
+        if not self.check_password(passphrase):
+            raise ExecutionError(f"Incorrect passphrase for {self.fingerprint}")
+        self.operator.gpg.preset_passphrases(
+            {keygrip: passphrase for keygrip in self._keygrips()}, ttl=ttl
+        )
+        return self
+
+    def lock(self) -> "Key":
+        """Forgets this key's cached passphrase
+
+        Returns:
+            Key: Reference to self
+        """
+        self.operator.gpg.forget_passphrases(*self._keygrips())
+        return self
 
+    def _loopback_command(self, passphrase_fd: bool) -> list[str]:
+        return [
+            "gpg",
+            "--batch",
+            "--pinentry-mode",
+            "loopback",
+            *(["--passphrase-fd", "0"] if passphrase_fd else []),
+        ]
+
+    def _keygrips(self) -> list[str]:
+        return [
+            i.keygrip for i in [self, *(self.subkeys or [])] if i.keygrip != None
+        ]
+
+    @mutating
     def sign_key(
         self,
         target: "str | Key",
@@ -378,22 +1039,26 @@ class Key(KeyModel):
         else:
             parsed_target = target
 
-        cmd = "gpg --batch --pinentry-mode loopback --passphrase-fd 0 -u {current} {force} --quick-{local}sign-key {fingerprint} {names}".format(
-            current=self.fingerprint,
-            force="--force-sign-key" if force else "",
-            local="" if exportable else "l",
-            fingerprint=shlex.quote(parsed_target),
-            names=" ".join([shlex.quote(name) for name in users]) if users else "",
-        )
+        cmd = [
+            *self._loopback_command(bool(password)),
+            "-u",
+            self.fingerprint,
+            *(["--force-sign-key"] if force else []),
+            "--quick-sign-key" if exportable else "--quick-lsign-key",
+            parsed_target,
+            *(users if users else []),
+        ]
         proc = self.session.run(cmd, input=password + "\n" if password else None)
         if proc.code == 0:
+            self.operator.invalidate()
             if isinstance(target, Key):
                 return target.reload()
             else:
                 return self.operator.get_key(target)
         else:
-            raise ExecutionError(proc.output)
+            raise ExecutionError(proc.errors)
 
+    @mutating
     def add_subkey(
         self,
         password: str | None = None,
@@ -427,12 +1092,15 @@ class Key(KeyModel):
             expire_str = expiration
         else:
             expire_str = "none"
-        cmd = "gpg --batch --pinentry-mode loopback --passphrase-fd 0 --yes --quick-add-key {fingerprint} {algo} {usage} {expiration}".format(
-            fingerprint=self.fingerprint,
-            algo=shlex.quote(algorithm if algorithm else "default"),
-            usage=shlex.quote(",".join(usage) if usage else "default"),
-            expiration=shlex.quote(expire_str),
-        )
+        cmd = [
+            *self._loopback_command(True),
+            "--yes",
+            "--quick-add-key",
+            self.fingerprint,
+            algorithm if algorithm else "default",
+            ",".join(usage) if usage else "default",
+            expire_str,
+        ]
 
         proc = self.session.run(
             cmd,
@@ -442,10 +1110,12 @@ class Key(KeyModel):
             + "\n",
         )
         if proc.code == 0:
+            self.operator.invalidate()
             return self.reload()
         else:
-            raise ExecutionError(proc.output)
+            raise ExecutionError(proc.errors)
 
+    @mutating
     def add_user_id(
         self,
         uid: str = None,
@@ -491,16 +1161,23 @@ class Key(KeyModel):
                 ]
             )
 
-        cmd = f"gpg --batch --pinentry-mode loopback --passphrase-fd 0 --quick-add-uid {self.fingerprint} {shlex.quote(parsed)}"
+        cmd = [
+            *self._loopback_command(bool(passphrase)),
+            "--quick-add-uid",
+            self.fingerprint,
+            parsed,
+        ]
         proc = self.session.run(
             cmd,
             input=passphrase + "\n" if passphrase else None,
         )
         if proc.code == 0:
+            self.operator.invalidate()
             return self.reload()
         else:
-            raise ExecutionError(proc.output)
+            raise ExecutionError(proc.errors)
 
+    @mutating
     def revoke_uid(self, uid: str, passphrase: str = None) -> "Key":
         """Revokes a given UID on the current Key
 
@@ -514,17 +1191,24 @@ class Key(KeyModel):
         Returns:
             Key: Reference to updated key
         """
-        cmd = f"gpg --batch --pinentry-mode loopback --passphrase-fd 0 --quick-revoke-uid {self.fingerprint} {shlex.quote(uid)}"
+        cmd = [
+            *self._loopback_command(bool(passphrase)),
+            "--quick-revoke-uid",
+            self.fingerprint,
+            uid,
+        ]
         proc = self.session.run(
             cmd,
             input=passphrase + "\n" if passphrase else None,
         )
 
         if proc.code == 0:
+            self.operator.invalidate()
             return self.reload()
         else:
-            raise ExecutionError(proc.output)
+            raise ExecutionError(proc.errors)
 
+    @mutating
     def delete(self, delete_both: bool = True) -> None:
         """Deletes self.
 
@@ -534,14 +1218,26 @@ class Key(KeyModel):
         Raises:
             ExecutionError: If the operation fails
         """
-        cmd = f"gpg --batch --yes {'--delete-secret-and-public-key' if delete_both else ('--delete-keys' if self.type == 'public' else '--delete-secret-keys')} {self.fingerprint}{'!' if self.is_subkey else ''}"
+        cmd = [
+            "gpg",
+            "--batch",
+            "--yes",
+            (
+                "--delete-secret-and-public-key"
+                if delete_both
+                else ("--delete-keys" if self.type == "public" else "--delete-secret-keys")
+            ),
+            self.fingerprint + ("!" if self.is_subkey else ""),
+        ]
         proc = self.session.run(cmd)
+        self.operator.invalidate()
 
         if proc.code == 0:
             return
         else:
-            raise ExecutionError(proc.output)
+            raise ExecutionError(proc.errors)
 
+    @mutating
     def revoke_signature(
         self,
         signer: "Key | str",
@@ -561,20 +1257,24 @@ class Key(KeyModel):
         Returns:
             Key: Reference to updated key
         """
-        cmd = "gpg --batch --pinentry-mode loopback --passphrase-fd 0 --quick-revoke-sig {fingerprint} {signer} {names}".format(
-            fingerprint=self.fingerprint,
-            signer=shlex.quote(signer.fingerprint if isinstance(signer, Key) else signer),
-            names=shlex.quote(" ".join(users) if users else ""),
-        ).strip()
+        cmd = [
+            *self._loopback_command(bool(passphrase)),
+            "--quick-revoke-sig",
+            self.fingerprint,
+            signer.fingerprint if isinstance(signer, Key) else signer,
+            *(users if users else []),
+        ]
         proc = self.session.run(
             cmd,
             input=passphrase + "\n" if passphrase else None,
         )
         if proc.code == 0:
+            self.operator.invalidate()
             return self.reload()
         else:
-            raise ExecutionError(proc.output)
+            raise ExecutionError(proc.errors)
 
+    @mutating
     def set_primary_uid(self, uid: str, passphrase: str | None = None) -> "Key":
         """Set the primary UID of the current Key
 
@@ -588,17 +1288,21 @@ class Key(KeyModel):
         Returns:
             Key: An updated reference to the Key
         """
-        cmd = "gpg --batch --pinentry-mode loopback --passphrase-fd 0 --quick-set-primary-uid {fingerprint} {uid}".format(
-            fingerprint=self.fingerprint, uid=shlex.quote(uid)
-        ).strip()
+        cmd = [
+            *self._loopback_command(bool(passphrase)),
+            "--quick-set-primary-uid",
+            self.fingerprint,
+            uid,
+        ]
         proc = self.session.run(
             cmd,
             input=passphrase + "\n" if passphrase else None,
         )
         if proc.code == 0:
+            self.operator.invalidate()
             return self.reload()
         else:
-            raise ExecutionError(proc.output)
+            raise ExecutionError(proc.errors)
 
     @contextmanager
     def edit(self, user: str | None = None) -> Generator["KeyEditor", Any, Any]:
@@ -608,11 +1312,27 @@ class Key(KeyModel):
             user (str | None, optional): Optional user to run as. If left as None, uses the current Key's user ID. Defaults to None.
 
         Yields:
-            KeyEditor: An initialized interactive instance
+            KeyEditor: An initialized interactive instance, holding the writer lock until the block exits
         """
-        with StatusInteractive(
+        with self.gpg.writer, StatusInteractive(
             self.session,
-            f"gpg --command-fd 0 --status-fd 1 -u {user if user else self.fingerprint} --with-sig-list --pinentry-mode loopback --yes --with-colons --no-tty --edit-key {self.fingerprint}",
+            [
+                "gpg",
+                "--command-fd",
+                "0",
+                "--status-fd",
+                "1",
+                "-u",
+                user if user else self.fingerprint,
+                "--with-sig-list",
+                "--pinentry-mode",
+                "loopback",
+                "--yes",
+                "--with-colons",
+                "--no-tty",
+                "--edit-key",
+                self.fingerprint,
+            ],
         ) as interactive:
             editor = KeyEditor(self, user if user else self.fingerprint, interactive)
             yield editor
@@ -639,7 +1359,18 @@ class Key(KeyModel):
         """
         with StatusInteractive(
             self.session,
-            f"gpg --status-fd 1 --pinentry-mode loopback --command-fd 0 --no-tty --gen-revoke {self.fingerprint}",
+            [
+                "gpg",
+                "--status-fd",
+                "1",
+                "--pinentry-mode",
+                "loopback",
+                "--command-fd",
+                "0",
+                "--no-tty",
+                "--gen-revoke",
+                self.fingerprint,
+            ],
         ) as inter:
             result = []
             reading_result = False
@@ -689,12 +1420,13 @@ class Key(KeyModel):
                             and line.arguments[0] == "passphrase.enter"
                         ):
                             inter.writelines(passphrase if passphrase else "")
-                elif inter.code:
-                    inter.seek()
-                    raise ExecutionError("Failed to execute:\n" + inter.read().decode())
+            else:
+                inter.seek()
+                raise ExecutionError("Failed to execute:\n" + inter.read().decode(errors="replace"))
 
         return "\n".join(result)
 
+    @mutating
     def revoke(
         self,
         passphrase: str | None = None,
@@ -711,10 +1443,9 @@ class Key(KeyModel):
         cert = self.generate_revocation(
             passphrase=passphrase, reason=reason, description=description
         )
-        with NamedTemporaryFile() as revocfile:
-            revocfile.write(cert.encode())
-            revocfile.seek(0)
-            self.operator.import_key(revocfile.name)
+        report = self.operator.import_data(cert.encode())
+        if report.code != 0:
+            raise ExecutionError(report.errors)
 
         self.reload()
 
@@ -736,13 +1467,8 @@ class KeyEditor:
         for line in self.interactive.readlines(yield_empty=False):
             print(line)
 
-    def wait_for_status(self, *code: str):
-        lines: list[StatusLine] = []
-        for line in self.interactive.readlines():
-            if line:
-                lines.append(line)
-                if line.is_status and (len(code) == 0 or line.code in code):
-                    return lines
+    def wait_for_status(self, *code: str, timeout: float | None = None):
+        return self.interactive.wait_for_status(*code, timeout=timeout)
 
     def list(self) -> list[InfoLine]:
         self.interactive.writelines("list")
@@ -753,12 +1479,13 @@ class KeyEditor:
     def quit(self):
         """Quit without saving"""
         self.interactive.writelines("quit")
-        self.interactive.process.wait()
+        self.interactive.wait()
 
     def save(self):
         """Save changes & quit"""
         self.interactive.writelines("save")
-        self.interactive.process.wait()
+        self.interactive.wait()
+        self.key.operator.invalidate()
 
     def set_uid(self, uid: str):
         """Select a specific UID within the current key
@@ -805,12 +1532,12 @@ class KeyEditor:
         lines = self.wait_for_status(StatusCodes.GET_LINE, StatusCodes.GET_BOOL)
         if lines[-1].code == StatusCodes.GET_LINE:
             self.interactive.seek(0)
-            raise ExecutionError(output=self.interactive.read().decode())
+            raise ExecutionError(output=self.interactive.read().decode(errors="replace"))
         self.interactive.writelines("y")
         lines = self.wait_for_status(StatusCodes.GET_LINE, StatusCodes.GET_HIDDEN)
         if lines[-1].code == StatusCodes.GET_LINE:
             self.interactive.seek(0)
-            raise ExecutionError(output=self.interactive.read().decode())
+            raise ExecutionError(output=self.interactive.read().decode(errors="replace"))
 
         if signer_passphrase:
             self.interactive.writelines(signer_passphrase)
@@ -834,7 +1561,7 @@ class KeyEditor:
             self.interactive.seek(0)
             raise ExecutionError(
                 output="Failed: UID/KEY not selected?\n"
-                + self.interactive.read().decode()
+                + self.interactive.read().decode(errors="replace")
             )
 
         while True:
@@ -872,7 +1599,7 @@ class KeyEditor:
             self.interactive.seek(0)
             raise ExecutionError(
                 output="Failed: UID/KEY not selected?\n"
-                + self.interactive.read().decode()
+                + self.interactive.read().decode(errors="replace")
             )
 
         signer_ids = [s.key_id if isinstance(s, Key) else s for s in signers]
@@ -952,7 +1679,7 @@ class KeyEditor:
                     self.interactive.writelines("")
             elif lines[-1].is_status and lines[-1].code == StatusCodes.ERROR:
                 self.interactive.seek(0)
-                raise ExecutionError(self.interactive.read().decode())
+                raise ExecutionError(self.interactive.read().decode(errors="replace"))
 
     def delete_uid(self):
         """Delete the selected UID
@@ -1162,3 +1889,341 @@ class KeyEditor:
         """Run the `minimize` command"""
         self.interactive.writelines("minimize")
         self.wait_for_status(StatusCodes.GET_LINE)
+
+
+class AsyncKeyOperator(AsyncBaseOperator):
+    """Awaitable counterpart to KeyOperator. Returned Keys are bound to a regular KeyOperator."""
+
+    def __init__(self, gpg: Any) -> None:
+        super().__init__(gpg)
+        self.operator = KeyOperator(gpg)
+
+    async def generate_key(
+        self,
+        name: str,
+        email: str | None = None,
+        comment: str | None = None,
+        algorithm: str | None = None,
+        usage: list[Literal["sign", "auth", "encr", "cert"]] | None = None,
+        expiration: datetime | timedelta | int | None = None,
+        passphrase: str | None = None,
+        force: bool = False,
+    ) -> "Key | None":
+        """Generate a key given a set of parameters.
+
+        Args:
+            name (str): UID Name
+            email (str | None, optional): Optional UID email. Defaults to None.
+            comment (str | None, optional): Optional UID comment. Defaults to None.
+            algorithm (str | None, optional): Algorithm name. Defaults to None.
+            usage (list["sign" | "auth" | "encr" | "cert"] | None, optional): List of usages, or None for default. Defaults to None.
+            expiration (datetime | timedelta | int | None, optional): Key expiration. Defaults to None.
+            passphrase (str | None, optional): Key passphrase (if left empty, no passphrase). Defaults to None.
+            force (bool, optional): Force creation. Defaults to False.
+
+        Raises:
+            ExecutionError: If key generation fails
+
+        Returns:
+            Returns the generated key
+        """
+        pool = getattr(self.gpg, "pool", None)
+        if pool and pool.matches(algorithm, usage, expiration):
+            uid = self.operator._generated_uid(name, email, comment)
+            if not force and len(await self.list_keys(pattern="=" + uid)) > 0:
+                raise ExecutionError(f"A key for {uid} already exists")
+            return await asyncio.to_thread(
+                pool.take, name, email=email, comment=comment, passphrase=passphrase
+            )
+
+        return await self._generate_key(
+            name, email, comment, algorithm, usage, expiration, passphrase, force
+        )
+
+    @async_mutating
+    async def _generate_key(
+        self,
+        name: str,
+        email: str | None = None,
+        comment: str | None = None,
+        algorithm: str | None = None,
+        usage: list[str] | None = None,
+        expiration: datetime | timedelta | int | None = None,
+        passphrase: str | None = None,
+        force: bool = False,
+    ) -> "Key":
+        command = self.operator._generate_command(
+            name, email, comment, algorithm, usage, expiration, force
+        )
+        proc = await self.session.run(
+            command, input=passphrase if passphrase else "", status=True
+        )
+        self.operator.invalidate()
+        fingerprint = self.operator._generated_fingerprint(proc)
+        if fingerprint:
+            return (await self.list_keys(pattern=fingerprint))[0]
+        else:
+            raise ExecutionError(proc.errors)
+
+    @async_mutating
+    async def generate_keys(
+        self, specs: Iterable[KeySpec | dict[str, Any]]
+    ) -> list["Key | None"]:
+        """Generates any number of keys with a single unattended `gpg --generate-key` run
+
+        Args:
+            specs (Iterable[KeySpec | dict[str, Any]]): Key parameters, as KeySpecs or dicts of their fields
+
+        Raises:
+            ExecutionError: If gpg failed without generating any key
+
+        Returns:
+            list[Key | None]: Generated keys, in the order of `specs`. Keys that gpg failed to generate are None.
+        """
+        specs = [i if isinstance(i, KeySpec) else KeySpec(**i) for i in specs]
+        if len(specs) == 0:
+            return []
+
+        proc = await self.session.run(
+            self.operator._generate_batch_command(),
+            input=self.operator._generate_parameters(specs),
+            status=True,
+        )
+        self.operator.invalidate()
+        fingerprints = self.operator._generated_fingerprints(proc, len(specs))
+        created = [i for i in fingerprints if i != None]
+        if len(created) == 0:
+            raise ExecutionError(proc.errors)
+
+        keys = await self.get_keys(*created)
+        return [keys.get(i) if i != None else None for i in fingerprints]
+
+    async def list_keys(
+        self,
+        pattern: str = None,
+        key_type: Literal["public", "secret"] = "public",
+        check_sigs: bool = True,
+    ) -> list["Key"]:
+        """List keys, optionally filtering by a pattern.
+
+        Args:
+            pattern (str | None, optional): Optional pattern to filter results by
+            key_type (public | secret, optional): What key type to return
+            check_sigs (bool, optional): Whether to check signatures or just list them
+
+        Returns:
+            List of results
+        """
+        if self.operator.index and check_sigs:
+            # The index may have to reload (and stat the homedir), so it is consulted off the event loop
+            indexed = await asyncio.to_thread(
+                self.operator._indexed, pattern, key_type, check_sigs
+            )
+            if indexed != None:
+                return indexed
+
+        proc = await self.session.run(
+            self.operator._list_command(pattern, key_type, check_sigs)
+        )
+        return self.operator._parse_listing(proc.output)
+
+    async def iter_keys(
+        self,
+        pattern: str | list[str] | None = None,
+        key_type: Literal["public", "secret"] = "public",
+        check_sigs: bool = True,
+    ) -> AsyncGenerator["Key", Any]:
+        """Lazily lists keys, yielding each one as soon as gpg has finished printing it.
+
+        Args:
+            pattern (str | list[str] | None, optional): Optional pattern(s) to filter results by. Defaults to None.
+            key_type (public | secret, optional): What key type to return. Defaults to "public".
+            check_sigs (bool, optional): Whether to check signatures or just list them. Defaults to True.
+
+        Yields:
+            Key: Keys, in keyring order
+        """
+        blocks = KeyBlocks()
+        async for chunk in self.session.stream(
+            self.operator._list_command(pattern, key_type, check_sigs)
+        ):
+            for block in blocks.feed(chunk):
+                for key in self.operator._parse_block(block):
+                    yield key
+
+        for block in blocks.close():
+            for key in self.operator._parse_block(block):
+                yield key
+
+    async def get_key(
+        self, fingerprint: str, key_type: Literal["public", "secret"] = "public"
+    ) -> "Key | None":
+        """Gets a specific key given a fingerprint
+
+        Args:
+            fingerprint (str): Fingerprint to search for
+            key_type (public | secret, optional): What key type to return. Defaults to "public".
+
+        Returns:
+            The located Key, or None if not found.
+        """
+        results = await self.list_keys(pattern=fingerprint, key_type=key_type)
+        if len(results) == 0:
+            return None
+
+        return results[0]
+
+    async def get_keys(
+        self,
+        *identifiers: str,
+        key_type: Literal["public", "secret"] = "public",
+        check_sigs: bool = True,
+    ) -> dict[str, "Key | None"]:
+        """Resolves many identifiers at once, using a single gpg listing (split into chunks to stay under ARG_MAX)
+
+        Args:
+            *identifiers (str): Fingerprints, key IDs, keygrips, emails or other gpg patterns
+            key_type (public | secret, optional): What key type to return. Defaults to "public".
+            check_sigs (bool, optional): Whether to check signatures or just list them. Defaults to True.
+
+        Returns:
+            dict[str, Key | None]: Mapping of each identifier to the first matching Key, or None if not found
+        """
+        if self.operator.index and check_sigs:
+            results, chunks = await asyncio.to_thread(
+                self.operator._lookup_plan, identifiers, key_type, check_sigs
+            )
+        else:
+            results, chunks = self.operator._lookup_plan(
+                identifiers, key_type, check_sigs
+            )
+        for chunk in chunks:
+            proc = await self.session.run(
+                self.operator._list_command(chunk, key_type, check_sigs)
+            )
+            self.operator._match_listing(
+                chunk, self.operator._parse_listing(proc.output), results
+            )
+
+        return {identifier: results[identifier] for identifier in identifiers}
+
+    @async_mutating
+    async def import_key(self, *keyfiles: str):
+        """Imports keys from file paths into the keyring
+
+        Args:
+            *keyfiles (str): Any number of files to import
+
+        Raises:
+            ExecutionError: If operation fails
+        """
+        for file in keyfiles:
+            result = await self.session.run(
+                ["gpg", "--batch", "--yes", "--import", file]
+            )
+            self.operator.invalidate()
+            if result.code != 0:
+                raise ExecutionError(
+                    f"Failed to import {file} with code {result.code}:\n{result.errors}"
+                )
+
+    @async_mutating
+    async def import_data(self, data: bytes | Iterable[bytes]) -> ImportReport:
+        """Imports key material held in memory by streaming it to gpg's STDIN, without touching disk
+
+        Args:
+            data (bytes | Iterable[bytes]): Key data (armored or binary), or an iterable of chunks of it
+
+        Raises:
+            ExecutionError: If gpg did not produce an import summary at all
+
+        Returns:
+            ImportReport: Per-key outcomes and gpg's summary counts
+        """
+        proc = await self.session.run(
+            ["gpg", "--batch", "--yes", "--import"], decode=False, input=data, status=True
+        )
+        self.operator.invalidate()
+        return self.operator._import_report(proc)
+
+    @async_mutating
+    async def import_keys(self, *sources: ImportSource) -> ImportReport:
+        """Imports any number of keyfiles and in-memory keys with a single gpg invocation
+
+        Args:
+            *sources (str | PathLike | bytes | BinaryIO): File paths, raw key data (armored or binary), or readable binary streams. In-memory sources are streamed through their own pipes.
+
+        Raises:
+            ExecutionError: If gpg did not produce an import summary at all
+
+        Returns:
+            ImportReport: Per-key outcomes and gpg's summary counts
+        """
+        command, descriptors = self.operator._import_command(sources)
+        try:
+            proc = await self.session.run(
+                command, decode=False, pass_fds=descriptors, status=True
+            )
+        finally:
+            for fd in descriptors:
+                os.close(fd)
+        self.operator.invalidate()
+        return self.operator._import_report(proc)
+
+    async def export_keys(
+        self,
+        keys: Iterable["Key | str"],
+        mode: Literal["gpg", "ascii"] = "ascii",
+        secret: bool = False,
+        password: str | None = None,
+        options: dict[str, bool | None] | None = None,
+        filters: list[tuple[Literal["keep-uid", "drop-subkey"], str]] = [],
+        output: BinaryIO | None = None,
+        split: bool = False,
+    ) -> bytes | dict[str, bytes] | None:
+        """Exports any number of keys with a single gpg invocation
+
+        Args:
+            keys (Iterable[Key | str]): Keys or patterns (fingerprints, key IDs, emails...) to export
+            mode (gpg | ascii, optional): Whether to output as GPG binary or ASCII armor. Defaults to "ascii".
+            secret (bool, optional): Whether to export secret keys. Defaults to False.
+            password (str | None, optional): Password required to unlock secret keys, which may or may not be relevant. Defaults to None.
+            options (dict[str, bool | None] | None, optional): Export options, by name (ie `{"export-minimal": True}`). Defaults to None.
+            filters (list[tuple[keep-uid | drop-subkey, str]], optional): List of export filters. Defaults to [].
+            output (BinaryIO | None, optional): Writable binary sink to stream the export into instead of returning it. Defaults to None.
+            split (bool, optional): Whether to split the export into one blob per key, keyed by primary fingerprint. Defaults to False.
+
+        Raises:
+            ValueError: If both `output` and `split` are given
+            ExecutionError: Raised if the attempted export operation fails.
+
+        Returns:
+            bytes | dict[str, bytes] | None: The combined export, a mapping of fingerprint -> export if `split`, or None if streamed into `output`.
+        """
+        if output != None and split:
+            raise ValueError("Cannot both split the export and stream it to an output")
+
+        targets = [i.fingerprint if isinstance(i, Key) else i for i in keys]
+        command = self.operator._export_command(
+            "gpg" if split else mode, secret, password, options, filters
+        )
+        exported = bytearray()
+        for chunk in chunk_arguments(targets, reserved=command):
+            process = await self.session.spawn(
+                [*command, *chunk], decode=False, merge_stderr=False
+            )
+            async for data in process.stream(
+                input=password + "\n" if password else None
+            ):
+                if output != None:
+                    output.write(data)
+                else:
+                    exported.extend(data)
+            if process.code != 0:
+                raise ExecutionError(process.errors.decode(errors="replace"))
+
+        if output != None:
+            return None
+        if split:
+            return self.operator._split_export(bytes(exported), mode)
+        return bytes(exported)
@@ -1,12 +1,356 @@
-import shlex
-from tempfile import NamedTemporaryFile
-from typing import Literal
-from .common import BaseOperator
+from collections.abc import AsyncGenerator, Generator, Iterable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from multiprocessing import util
+import os
+import time
+from typing import Any, BinaryIO, Literal
+from .common import AsyncBaseOperator, BaseOperator
 from .keys import Key
-from ..util import ExecutionError
+from ..models import BatchResult, BatchReport, StatusCodes
+from ..util import (
+    AsyncInputSource,
+    AsyncProcess,
+    ExecutionError,
+    InputSource,
+    PacketError,
+    Process,
+    pipe_input,
+    pipe_source,
+    scan_recipients,
+)
+
+
+class _KeyReference:
+    """Picklable stand-in for a Key passed to a process pool worker"""
+
+    def __init__(self, key: Key):
+        self.fingerprint = key.fingerprint
+        self.type = key.type
+
+
+_worker_instances: dict[str | None, Any] = {}
+
+
+def _close_worker_instances() -> None:
+    """Closes the GPG instances cached by a process pool worker, stopping any agents they launched"""
+    for gpg in _worker_instances.values():
+        gpg.close()
+    _worker_instances.clear()
+
+
+def _batch_worker(
+    homedir: str | None,
+    method: str,
+    index: int,
+    item: Any,
+    args: tuple,
+    kwargs: dict[str, Any],
+) -> BatchResult:
+    """Runs a single batch item inside a process pool worker, with one GPG instance per homedir"""
+    if not homedir in _worker_instances.keys():
+        from ..gpg import GPG
+
+        if len(_worker_instances) == 0:
+            util.Finalize(None, _close_worker_instances, exitpriority=10)
+        _worker_instances[homedir] = GPG(homedir=homedir, write_configs=False)
+    gpg = _worker_instances[homedir]
+
+    def attach(value: Any) -> Any:
+        if isinstance(value, _KeyReference):
+            return gpg.keys.get_key(value.fingerprint, key_type=value.type)
+        return value
+
+    return gpg.messages._batch_item(
+        method,
+        index,
+        item,
+        tuple([attach(i) for i in args]),
+        {k: attach(v) for k, v in kwargs.items()},
+    )
 
 
 class MessageOperator(BaseOperator):
+    def _run_stream(
+        self,
+        command: list[str],
+        source: InputSource,
+        passphrase: str | None,
+        message: str,
+    ) -> Generator[bytes, Any, None]:
+        """Runs a gpg command over a streamed payload, with the passphrase (if any) on its own pipe
+
+        Args:
+            command (list[str]): Command arguments, to which the passphrase option is added
+            source (InputSource): Payload to stream to STDIN
+            passphrase (str | None): Passphrase, if required
+            message (str): Error message prefix
+
+        Raises:
+            ExecutionError: If the command fails
+
+        Yields:
+            Generator[bytes, Any, None]: Output chunks
+        """
+        passphrase_fd = pipe_input(passphrase + "\n") if passphrase != None else None
+        try:
+            process = yield from self.session.stream(
+                self._with_passphrase_fd(command, passphrase_fd),
+                input=source,
+                pass_fds=(passphrase_fd,) if passphrase_fd else (),
+            )
+        finally:
+            if passphrase_fd:
+                os.close(passphrase_fd)
+
+        if process.code != 0:
+            raise ExecutionError(
+                f"{message}:\n{process.errors.decode(errors='replace')}"
+            )
+
+    def _with_passphrase_fd(
+        self, command: list[str], passphrase_fd: int | None
+    ) -> list[str]:
+        if passphrase_fd:
+            return [command[0], "--passphrase-fd", str(passphrase_fd), *command[1:]]
+        return command
+
+    def _encrypt_command(
+        self,
+        recipients: tuple[Key | str, ...],
+        compress: bool,
+        format: Literal["ascii", "pgp"],
+    ) -> list[str]:
+        if len(recipients) == 0:
+            raise ValueError("Must specify at least one recipient")
+        command = ["gpg", *(["-z", "0"] if not compress else []), "--batch", "--encrypt"]
+        for r in recipients:
+            command.extend(["-r", r.key_id if isinstance(r, Key) else r])
+        return [*command, *(["--armor"] if format == "ascii" else []), "--output", "-"]
+
+    def _decrypt_command(self, key: Key | None) -> list[str]:
+        return [
+            "gpg",
+            *(["-u", key.fingerprint] if key else []),
+            "--batch",
+            "--pinentry-mode",
+            "loopback",
+            "--output",
+            "-",
+            "--decrypt",
+        ]
+
+    def _symmetric_command(
+        self, algo: str, format: Literal["ascii", "pgp"]
+    ) -> list[str]:
+        return [
+            "gpg",
+            *(["--armor"] if format == "ascii" else []),
+            "--batch",
+            "--cipher-algo",
+            algo,
+            "--output",
+            "-",
+            "--pinentry-mode",
+            "loopback",
+            "--symmetric",
+        ]
+
+    def _sign_command(
+        self,
+        key: Key,
+        mode: Literal["standard", "clear", "detach"],
+        format: Literal["ascii", "pgp"],
+    ) -> list[str]:
+        return [
+            "gpg",
+            "--default-key",
+            key.key_id,
+            "--batch",
+            "--yes",
+            "--pinentry-mode",
+            "loopback",
+            *(["--armor"] if format == "ascii" else []),
+            "-o",
+            "-",
+            {
+                "standard": "--sign",
+                "clear": "--clear-sign",
+                "detach": "--detach-sign",
+            }[mode],
+        ]
+
+    def _scan_recipients(self, data: bytes | BinaryIO | Iterable[bytes]) -> list[str]:
+        try:
+            return scan_recipients(data)
+        except PacketError as e:
+            raise ExecutionError(f"Failed to get recipients:\n{e}")
+
+    def _resolve_recipients(
+        self,
+        key_ids: list[str],
+        found: dict[str, Key | None],
+        include: list[Literal["known", "unknown"]],
+    ) -> list[Key | str]:
+        keys = []
+        for i in key_ids:
+            existing = found[i]
+            if existing:
+                if "known" in include:
+                    keys.append(existing)
+            else:
+                if "unknown" in include:
+                    keys.append(i)
+        return keys
+
+    def _parse_verification(
+        self, process: Process | AsyncProcess
+    ) -> list[tuple[str, str]]:
+        return [
+            (i.arguments[0], " ".join(i.arguments[1:]))
+            for i in process.get_status(StatusCodes.GOODSIG)
+        ]
+
+    def _batch_item(
+        self, method: str, index: int, item: Any, args: tuple, kwargs: dict[str, Any]
+    ) -> BatchResult:
+        start = time.perf_counter()
+        try:
+            if isinstance(item, tuple):
+                value = getattr(self, method)(*item, *args, **kwargs)
+            else:
+                value = getattr(self, method)(item, *args, **kwargs)
+            return BatchResult(
+                index=index, value=value, duration=time.perf_counter() - start
+            )
+        except Exception as e:
+            return BatchResult(index=index, error=e, duration=time.perf_counter() - start)
+
+    def _run_many(
+        self,
+        method: str,
+        items: Iterable[Any],
+        args: tuple,
+        kwargs: dict[str, Any],
+        concurrency: int | None,
+        pool: Literal["thread", "process"] | Executor,
+        as_completed: bool,
+    ) -> BatchReport | Generator[BatchResult, Any, None]:
+        """Fans `method` out over `items` with at most `concurrency` items in flight at once
+
+        Args:
+            method (str): Name of the MessageOperator method to run
+            items (Iterable[Any]): Inputs, consumed lazily. Tuples are unpacked into positional arguments.
+            args (tuple): Extra positional arguments for every call
+            kwargs (dict[str, Any]): Extra keyword arguments for every call
+            concurrency (int | None): Maximum items in flight, or the CPU count if None
+            pool (thread | process | Executor): Pool type, or an existing Executor to submit to. Process pools run items through `_batch_worker`, since operators can't be pickled.
+            as_completed (bool): Whether to yield results as they finish instead of returning a report
+
+        Returns:
+            BatchReport | Generator[BatchResult, Any, None]: Ordered report, or a generator of results in completion order
+        """
+        limit = concurrency if concurrency else (os.cpu_count() or 1)
+
+        def generate() -> Generator[BatchResult, Any, None]:
+            if isinstance(pool, Executor):
+                executor, owned = pool, False
+            elif pool == "process":
+                executor, owned = ProcessPoolExecutor(max_workers=limit), True
+            else:
+                executor, owned = ThreadPoolExecutor(max_workers=limit), True
+
+            if isinstance(executor, ProcessPoolExecutor):
+                detach = lambda v: _KeyReference(v) if isinstance(v, Key) else v
+                submit = lambda index, item: executor.submit(
+                    _batch_worker,
+                    self.gpg.homedir,
+                    method,
+                    index,
+                    item,
+                    tuple([detach(i) for i in args]),
+                    {k: detach(v) for k, v in kwargs.items()},
+                )
+            else:
+                submit = lambda index, item: executor.submit(
+                    self._batch_item, method, index, item, args, kwargs
+                )
+
+            pending = {}
+            source = enumerate(items)
+            try:
+                while True:
+                    for index, item in source:
+                        pending[submit(index, item)] = index
+                        if len(pending) >= limit:
+                            break
+
+                    if len(pending) == 0:
+                        return
+
+                    done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = pending.pop(future)
+                        try:
+                            yield future.result()
+                        except Exception as e:
+                            yield BatchResult(index=index, error=e)
+            finally:
+                for future in pending.keys():
+                    future.cancel()
+                if owned:
+                    executor.shutdown(wait=True)
+
+        if as_completed:
+            return generate()
+
+        start = time.perf_counter()
+        results = sorted(generate(), key=lambda r: r.index)
+        return BatchReport(results=results, duration=time.perf_counter() - start)
+
+    def _sink(
+        self, chunks: Generator[bytes, Any, None], output: BinaryIO | None
+    ) -> Generator[bytes, Any, None] | None:
+        if output == None:
+            return chunks
+
+        for chunk in chunks:
+            output.write(chunk)
+        return None
+
+    def encrypt_stream(
+        self,
+        source: InputSource,
+        *recipients: Key | str,
+        output: BinaryIO | None = None,
+        compress: bool = True,
+        format: Literal["ascii", "pgp"] = "ascii",
+    ) -> Generator[bytes, Any, None] | None:
+        """Encrypt a stream of data to at least one recipient, without holding the payload in memory
+
+        Args:
+            source (InputSource): Bytes, a readable binary object, or an iterable of chunks
+            output (BinaryIO | None, optional): Writable object to write the result to. If None, returns a chunk generator. Defaults to None.
+            compress (bool, optional): Whether to compress data. Defaults to True.
+            format (ascii | pgp, optional): What format to output. Defaults to "ascii".
+
+        Raises:
+            ValueError: If no recipients were specified
+            ExecutionError: If the operation fails
+
+        Returns:
+            Generator[bytes, Any, None] | None: Encrypted chunks, or None if `output` was specified
+        """
+        cmd = self._encrypt_command(recipients, compress, format)
+        return self._sink(
+            self._run_stream(cmd, source, None, "Failed to encrypt"), output
+        )
+
     def encrypt(
         self,
         data: bytes,
@@ -27,25 +371,35 @@ class MessageOperator(BaseOperator):
         Returns:
             bytes: Encrypted data
         """
-        if len(recipients) == 0:
-            raise ValueError("Must specify at least one recipient")
-        parsed_recipients = " ".join(
-            [
-                f"-r {shlex.quote(r.key_id if isinstance(r, Key) else r)}"
-                for r in recipients
-            ]
-        )
-        cmd = (
-            "gpg {compress} --batch --encrypt {recipients} {armored} --output -".format(
-                compress="-z 0" if not compress else "",
-                recipients=parsed_recipients,
-                armored="--armor" if format == "ascii" else "",
-            )
+        return b"".join(
+            self.encrypt_stream(data, *recipients, compress=compress, format=format)
+        )
+
+    def decrypt_stream(
+        self,
+        source: InputSource,
+        key: Key | None = None,
+        passphrase: str | None = None,
+        output: BinaryIO | None = None,
+    ) -> Generator[bytes, Any, None] | None:
+        """Decrypt a stream of PGP-encrypted data, without holding the payload in memory
+
+        Args:
+            source (InputSource): Bytes, a readable binary object, or an iterable of chunks
+            key (Key | None, optional): Recipient key. Defaults to None
+            passphrase (str | None, optional): Passphrase, if required. Defaults to None.
+            output (BinaryIO | None, optional): Writable object to write the result to. If None, returns a chunk generator. Defaults to None.
+
+        Raises:
+            ExecutionError: If the operation fails
+
+        Returns:
+            Generator[bytes, Any, None] | None: Decrypted chunks, or None if `output` was specified
+        """
+        cmd = self._decrypt_command(key)
+        return self._sink(
+            self._run_stream(cmd, source, passphrase, "Failed to decrypt"), output
         )
-        result = self.session.run(cmd, decode=False, input=data)
-        if result.code == 0:
-            return result.output
-        raise ExecutionError(f"Failed to encrypt:\n{result.output}")
 
     def decrypt(
         self, data: bytes, key: Key | None = None, passphrase: str | None = None
@@ -61,18 +415,9 @@ class MessageOperator(BaseOperator):
             ExecutionError: If the operation fails
 
         Returns:
-            bytes: Decrypted data (with header info removed)
+            bytes: Decrypted data
         """
-        with NamedTemporaryFile() as datafile:
-            datafile.write(data)
-            datafile.seek(0)
-            cmd = f"gpg {'-u ' + key.fingerprint if key else ''} --batch --pinentry-mode loopback --passphrase-fd 0 --output - --decrypt {datafile.name}"
-            result = self.session.run(
-                cmd, decode=False, input=passphrase + "\n" if passphrase else None
-            )
-        if result.code == 0:
-            return result.output.split(b"\n", maxsplit=2)[-1]
-        raise ExecutionError(f"Failed to decrypt:\n{result.output}")
+        return b"".join(self.decrypt_stream(data, key=key, passphrase=passphrase))
 
     def encrypt_symmetric(
         self,
@@ -95,30 +440,23 @@ class MessageOperator(BaseOperator):
         Returns:
             bytes: Encrypted data
         """
-        with NamedTemporaryFile() as datafile:
-            datafile.write(data)
-            datafile.seek(0)
-            result = self.session.run(
-                f"gpg {'--armor' if format == 'ascii' else ''} --cipher-algo {shlex.quote(algo)} --output - --passphrase-fd 0 --pinentry-mode loopback --symmetric {datafile.name}",
-                decode=False,
-                input=passphrase,
-            )
-
-            if result.code == 0:
-                return result.output
-            raise ExecutionError(f"Failed to encrypt:\n{result.output}")
+        cmd = self._symmetric_command(algo, format)
+        return b"".join(
+            self._run_stream(cmd, data, passphrase, "Failed to encrypt")
+        )
 
     def get_recipients(
         self,
-        data: bytes,
+        data: bytes | BinaryIO | Iterable[bytes],
         translate: bool = True,
         include: list[Literal["known", "unknown"]] = ["known", "unknown"],
     ) -> list[Key | str]:
-        """Gets all recipients associated with an encrypted message
+        """Gets all recipients associated with an encrypted message.
+        Recipients are read in-process from the message's leading packets, without reading the encrypted payload or running gpg.
 
         Args:
-            data (bytes): Encrypted message
-            translate (bool, optional): Whether to find existing keys
+            data (bytes | BinaryIO | Iterable[bytes]): Encrypted message (armored or binary), as bytes, a binary file or an iterable of chunks
+            translate (bool, optional): Whether to find existing keys, using a single batched lookup
             include (list[known | unknown], optional): Which keys to include (keys that are known vs keys that are not). Defaults to ["known", "unknown"].
 
         Raises:
@@ -127,30 +465,43 @@ class MessageOperator(BaseOperator):
         Returns:
             list[Key | str]: List of Key objects or, if none match, key IDs
         """
-        with NamedTemporaryFile() as datafile:
-            datafile.write(data)
-            datafile.seek(0)
-            cmd = f"gpg -d --list-only -v {datafile.name}"
-            result = self.session.run(cmd)
-        if result.code == 0:
-            key_ids = [
-                i.split()[-1] for i in result.output.split("\n") if "public key is" in i
-            ]
-            if translate:
-                keys = []
-                for i in key_ids:
-                    existing = self.gpg.keys.get_key(i)
-                    if i:
-                        if "known" in include:
-                            keys.append(existing)
-                    else:
-                        if "unknown" in include:
-                            keys.append(i)
-
-                return keys
-            else:
-                return key_ids
-        raise ExecutionError(f"Failed to get recipients:\n{result.output}")
+        key_ids = self._scan_recipients(data)
+        if translate:
+            return self._resolve_recipients(
+                key_ids, self.gpg.keys.get_keys(*key_ids), include
+            )
+        return key_ids
+
+    def sign_stream(
+        self,
+        source: InputSource,
+        key: Key,
+        mode: Literal["standard", "clear", "detach"] = "standard",
+        passphrase: str | None = None,
+        format: Literal["ascii", "pgp"] = "ascii",
+        output: BinaryIO | None = None,
+    ) -> Generator[bytes, Any, None] | None:
+        """Signs a stream of data with the specified key, without holding the payload in memory
+
+        Args:
+            source (InputSource): Bytes, a readable binary object, or an iterable of chunks
+            key (Key): Key to sign with
+            mode (standard | clear | detach, optional): What kind of signature to create. Defaults to "standard".
+            passphrase (str | None, optional): Key passphrase, if required. Defaults to None.
+            format (ascii | pgp, optional): Output format. Defaults to "ascii".
+            output (BinaryIO | None, optional): Writable object to write the result to. If None, returns a chunk generator. Defaults to None.
+
+        Raises:
+            ExecutionError: If the operation fails
+
+        Returns:
+            Generator[bytes, Any, None] | None: Signed data/detached signature chunks, or None if `output` was specified
+        """
+        cmd = self._sign_command(key, mode, format)
+        return self._sink(
+            self._run_stream(cmd, source, passphrase, "Failed to sign message"),
+            output,
+        )
 
     def sign(
         self,
@@ -175,33 +526,418 @@ class MessageOperator(BaseOperator):
         Returns:
             bytes: Signed data/detached signature
         """
-        with NamedTemporaryFile() as datafile:
-            datafile.write(data)
-            datafile.seek(0)
-            cmd = "gpg --default-key {key} --batch --yes --pinentry-mode loopback {format} --passphrase-fd 0 -o - {operation} {file}".format(
-                key=key.key_id,
-                format="--armor" if format == "ascii" else "",
-                operation={
-                    "standard": "--sign",
-                    "clear": "--clear-sign",
-                    "detach": "--detach-sign",
-                }[mode],
-                file=datafile.name,
+        return b"".join(
+            self.sign_stream(
+                data, key, mode=mode, passphrase=passphrase, format=format
             )
-            result = self.session.run(
-                cmd, decode=False, input=passphrase + "\n" if passphrase else None
-            )
-            if result.code == 0:
-                return b"\n".join(
+        )
+
+    def verify(
+        self,
+        data: bytes,
+        signature: bytes | None = None,
+    ) -> list[tuple[str, str]]:
+        """Gets a list of signatures on the given data, with an optional detached signature
+
+        Args:
+            data (bytes): Data, or in the case that `signature` is not specified, signed data.
+            signature (bytes | None, optional): A detached signature. Defaults to None.
+
+        Returns:
+            list[tuple[str, str]]: List of `(Key ID, User ID)` records
+        """
+        if signature:
+            signature_fd, _ = pipe_source(signature)
+            try:
+                result = self.session.run(
                     [
-                        i
-                        for i in result.output.splitlines()
-                        if not i.startswith(b"gpg: ")
-                    ]
+                        "gpg",
+                        "--batch",
+                        "--enable-special-filenames",
+                        "--verify",
+                        "--",
+                        f"-&{signature_fd}",
+                        "-",
+                    ],
+                    input=data,
+                    pass_fds=(signature_fd,),
+                    status=True,
                 )
-            raise ExecutionError(f"Failed to sign message:\n{result.output}")
+            finally:
+                os.close(signature_fd)
+        else:
+            result = self.session.run(
+                ["gpg", "--batch", "--verify"], input=data, status=True
+            )
+        return self._parse_verification(result)
 
-    def verify(
+    def encrypt_many(
+        self,
+        items: Iterable[bytes],
+        *recipients: Key | str,
+        compress: bool = True,
+        format: Literal["ascii", "pgp"] = "ascii",
+        concurrency: int | None = None,
+        pool: Literal["thread", "process"] | Executor = "thread",
+        as_completed: bool = False,
+    ) -> BatchReport | Generator[BatchResult, Any, None]:
+        """Encrypt many messages concurrently. Failures are reported per item rather than aborting the batch.
+
+        Args:
+            items (Iterable[bytes]): Messages to encrypt
+            compress (bool, optional): Whether to compress data. Defaults to True.
+            format (ascii | pgp, optional): What format to output. Defaults to "ascii".
+            concurrency (int | None, optional): Maximum operations in flight, or the CPU count if None. Defaults to None.
+            pool (thread | process | Executor, optional): Pool type to fan out over, or an existing Executor. Defaults to "thread".
+            as_completed (bool, optional): Yield BatchResults as they finish instead of returning an ordered BatchReport. Defaults to False.
+
+        Returns:
+            BatchReport | Generator[BatchResult, Any, None]: Results, with encrypted bytes as values
+        """
+        return self._run_many(
+            "encrypt",
+            items,
+            recipients,
+            dict(compress=compress, format=format),
+            concurrency,
+            pool,
+            as_completed,
+        )
+
+    def decrypt_many(
+        self,
+        items: Iterable[bytes],
+        key: Key | None = None,
+        passphrase: str | None = None,
+        concurrency: int | None = None,
+        pool: Literal["thread", "process"] | Executor = "thread",
+        as_completed: bool = False,
+    ) -> BatchReport | Generator[BatchResult, Any, None]:
+        """Decrypt many messages concurrently. Failures are reported per item rather than aborting the batch.
+
+        Args:
+            items (Iterable[bytes]): Messages to decrypt
+            key (Key | None, optional): Recipient key. Defaults to None
+            passphrase (str | None, optional): Passphrase, if required. Defaults to None.
+            concurrency (int | None, optional): Maximum operations in flight, or the CPU count if None. Defaults to None.
+            pool (thread | process | Executor, optional): Pool type to fan out over, or an existing Executor. Defaults to "thread".
+            as_completed (bool, optional): Yield BatchResults as they finish instead of returning an ordered BatchReport. Defaults to False.
+
+        Returns:
+            BatchReport | Generator[BatchResult, Any, None]: Results, with decrypted bytes as values
+        """
+        return self._run_many(
+            "decrypt",
+            items,
+            (),
+            dict(key=key, passphrase=passphrase),
+            concurrency,
+            pool,
+            as_completed,
+        )
+
+    def sign_many(
+        self,
+        items: Iterable[bytes],
+        key: Key,
+        mode: Literal["standard", "clear", "detach"] = "standard",
+        passphrase: str | None = None,
+        format: Literal["ascii", "pgp"] = "ascii",
+        concurrency: int | None = None,
+        pool: Literal["thread", "process"] | Executor = "thread",
+        as_completed: bool = False,
+    ) -> BatchReport | Generator[BatchResult, Any, None]:
+        """Sign many messages concurrently. Failures are reported per item rather than aborting the batch.
+
+        Args:
+            items (Iterable[bytes]): Messages to sign
+            key (Key): Key to sign with
+            mode (standard | clear | detach, optional): What kind of signature to create. Defaults to "standard".
+            passphrase (str | None, optional): Key passphrase, if required. Defaults to None.
+            format (ascii | pgp, optional): Output format. Defaults to "ascii".
+            concurrency (int | None, optional): Maximum operations in flight, or the CPU count if None. Defaults to None.
+            pool (thread | process | Executor, optional): Pool type to fan out over, or an existing Executor. Defaults to "thread".
+            as_completed (bool, optional): Yield BatchResults as they finish instead of returning an ordered BatchReport. Defaults to False.
+
+        Returns:
+            BatchReport | Generator[BatchResult, Any, None]: Results, with signed data/signatures as values
+        """
+        return self._run_many(
+            "sign",
+            items,
+            (),
+            dict(key=key, mode=mode, passphrase=passphrase, format=format),
+            concurrency,
+            pool,
+            as_completed,
+        )
+
+    def verify_many(
+        self,
+        items: Iterable[bytes | tuple[bytes, bytes]],
+        concurrency: int | None = None,
+        pool: Literal["thread", "process"] | Executor = "thread",
+        as_completed: bool = False,
+    ) -> BatchReport | Generator[BatchResult, Any, None]:
+        """Verify many messages concurrently. Failures are reported per item rather than aborting the batch.
+
+        Args:
+            items (Iterable[bytes | tuple[bytes, bytes]]): Signed messages, or `(data, detached signature)` pairs
+            concurrency (int | None, optional): Maximum operations in flight, or the CPU count if None. Defaults to None.
+            pool (thread | process | Executor, optional): Pool type to fan out over, or an existing Executor. Defaults to "thread".
+            as_completed (bool, optional): Yield BatchResults as they finish instead of returning an ordered BatchReport. Defaults to False.
+
+        Returns:
+            BatchReport | Generator[BatchResult, Any, None]: Results, with lists of `(Key ID, User ID)` records as values
+        """
+        return self._run_many(
+            "verify", items, (), {}, concurrency, pool, as_completed
+        )
+
+
+class AsyncMessageOperator(AsyncBaseOperator):
+    """Awaitable counterpart to MessageOperator"""
+
+    def __init__(self, gpg: Any) -> None:
+        super().__init__(gpg)
+        self.operator = MessageOperator(gpg)
+
+    async def _run_stream(
+        self,
+        command: list[str],
+        source: AsyncInputSource,
+        passphrase: str | None,
+        message: str,
+    ) -> AsyncGenerator[bytes, Any]:
+        passphrase_fd = pipe_input(passphrase + "\n") if passphrase != None else None
+        try:
+            process = await self.session.spawn(
+                self.operator._with_passphrase_fd(command, passphrase_fd),
+                decode=False,
+                merge_stderr=False,
+                pass_fds=(passphrase_fd,) if passphrase_fd else (),
+            )
+        finally:
+            if passphrase_fd:
+                os.close(passphrase_fd)
+
+        async for chunk in process.stream(input=source):
+            yield chunk
+
+        if process.code != 0:
+            raise ExecutionError(
+                f"{message}:\n{process.errors.decode(errors='replace')}"
+            )
+
+    async def _collect(self, chunks: AsyncGenerator[bytes, Any]) -> bytes:
+        return b"".join([chunk async for chunk in chunks])
+
+    def encrypt_stream(
+        self,
+        source: AsyncInputSource,
+        *recipients: Key | str,
+        compress: bool = True,
+        format: Literal["ascii", "pgp"] = "ascii",
+    ) -> AsyncGenerator[bytes, Any]:
+        """Encrypt a stream of data to at least one recipient, yielding encrypted chunks
+
+        Args:
+            source (AsyncInputSource): Bytes, a readable binary object, or a (possibly async) iterable of chunks
+            compress (bool, optional): Whether to compress data. Defaults to True.
+            format (ascii | pgp, optional): What format to output. Defaults to "ascii".
+
+        Raises:
+            ValueError: If no recipients were specified
+            ExecutionError: If the operation fails
+
+        Returns:
+            AsyncGenerator[bytes, Any]: Encrypted chunks
+        """
+        cmd = self.operator._encrypt_command(recipients, compress, format)
+        return self._run_stream(cmd, source, None, "Failed to encrypt")
+
+    async def encrypt(
+        self,
+        data: bytes,
+        *recipients: Key | str,
+        compress: bool = True,
+        format: Literal["ascii", "pgp"] = "ascii",
+    ) -> bytes:
+        """Encrypt a message to at least one recipient
+
+        Args:
+            data (bytes): Data to encrypt
+            compress (bool, optional): Whether to compress data. Defaults to True.
+            format (ascii | pgp, optional): What format to output. Defaults to "ascii".
+
+        Raises:
+            ValueError: If no recipients were specified
+
+        Returns:
+            bytes: Encrypted data
+        """
+        return await self._collect(
+            self.encrypt_stream(data, *recipients, compress=compress, format=format)
+        )
+
+    def decrypt_stream(
+        self,
+        source: AsyncInputSource,
+        key: Key | None = None,
+        passphrase: str | None = None,
+    ) -> AsyncGenerator[bytes, Any]:
+        """Decrypt a stream of PGP-encrypted data, yielding decrypted chunks
+
+        Args:
+            source (AsyncInputSource): Bytes, a readable binary object, or a (possibly async) iterable of chunks
+            key (Key | None, optional): Recipient key. Defaults to None
+            passphrase (str | None, optional): Passphrase, if required. Defaults to None.
+
+        Raises:
+            ExecutionError: If the operation fails
+
+        Returns:
+            AsyncGenerator[bytes, Any]: Decrypted chunks
+        """
+        return self._run_stream(
+            self.operator._decrypt_command(key), source, passphrase, "Failed to decrypt"
+        )
+
+    async def decrypt(
+        self, data: bytes, key: Key | None = None, passphrase: str | None = None
+    ) -> bytes:
+        """Decrypt PGP-encrypted data
+
+        Args:
+            data (bytes): Data to decrypt
+            key (Key | None, optional): Recipient key. Defaults to None
+            passphrase (str | None, optional): Passphrase, if required. Defaults to None.
+
+        Raises:
+            ExecutionError: If the operation fails
+
+        Returns:
+            bytes: Decrypted data
+        """
+        return await self._collect(
+            self.decrypt_stream(data, key=key, passphrase=passphrase)
+        )
+
+    async def encrypt_symmetric(
+        self,
+        data: bytes,
+        passphrase: str,
+        algo: str = "AES",
+        format: Literal["ascii", "pgp"] = "ascii",
+    ) -> bytes:
+        """Symmetrically encrypt data with <algo> and <passphrase>
+
+        Args:
+            data (bytes): Data to encrypt
+            passphrase (str): Passphrase to use
+            algo (str, optional): Algorithm selection. Defaults to "AES".
+            format (ascii | pgp, optional): Output format. Defaults to "ascii".
+
+        Raises:
+            ExecutionError: If operation fails
+
+        Returns:
+            bytes: Encrypted data
+        """
+        return await self._collect(
+            self._run_stream(
+                self.operator._symmetric_command(algo, format),
+                data,
+                passphrase,
+                "Failed to encrypt",
+            )
+        )
+
+    async def get_recipients(
+        self,
+        data: bytes | BinaryIO | Iterable[bytes],
+        translate: bool = True,
+        include: list[Literal["known", "unknown"]] = ["known", "unknown"],
+    ) -> list[Key | str]:
+        """Gets all recipients associated with an encrypted message.
+        Recipients are read in-process from the message's leading packets, without reading the encrypted payload or running gpg.
+
+        Args:
+            data (bytes | BinaryIO | Iterable[bytes]): Encrypted message (armored or binary), as bytes, a binary file or an iterable of chunks
+            translate (bool, optional): Whether to find existing keys, using a single batched lookup
+            include (list[known | unknown], optional): Which keys to include (keys that are known vs keys that are not). Defaults to ["known", "unknown"].
+
+        Raises:
+            ExecutionError: If operation fails
+
+        Returns:
+            list[Key | str]: List of Key objects or, if none match, key IDs
+        """
+        key_ids = self.operator._scan_recipients(data)
+        if translate:
+            return self.operator._resolve_recipients(
+                key_ids, await self.gpg.keys.get_keys(*key_ids), include
+            )
+        return key_ids
+
+    def sign_stream(
+        self,
+        source: AsyncInputSource,
+        key: Key,
+        mode: Literal["standard", "clear", "detach"] = "standard",
+        passphrase: str | None = None,
+        format: Literal["ascii", "pgp"] = "ascii",
+    ) -> AsyncGenerator[bytes, Any]:
+        """Signs a stream of data with the specified key, yielding output chunks
+
+        Args:
+            source (AsyncInputSource): Bytes, a readable binary object, or a (possibly async) iterable of chunks
+            key (Key): Key to sign with
+            mode (standard | clear | detach, optional): What kind of signature to create. Defaults to "standard".
+            passphrase (str | None, optional): Key passphrase, if required. Defaults to None.
+            format (ascii | pgp, optional): Output format. Defaults to "ascii".
+
+        Raises:
+            ExecutionError: If the operation fails
+
+        Returns:
+            AsyncGenerator[bytes, Any]: Signed data/detached signature chunks
+        """
+        return self._run_stream(
+            self.operator._sign_command(key, mode, format),
+            source,
+            passphrase,
+            "Failed to sign message",
+        )
+
+    async def sign(
+        self,
+        data: bytes,
+        key: Key,
+        mode: Literal["standard", "clear", "detach"] = "standard",
+        passphrase: str | None = None,
+        format: Literal["ascii", "pgp"] = "ascii",
+    ) -> bytes:
+        """Signs data with the specified key.
+
+        Args:
+            data (bytes): Data to sign
+            key (Key): Key to sign with
+            mode (standard | clear | detach, optional): What kind of signature to create. Defaults to "standard".
+            passphrase (str | None, optional): Key passphrase, if required. Defaults to None.
+            format (ascii | pgp, optional): Output format. Defaults to "ascii".
+
+        Raises:
+            ExecutionError: If the operation fails
+
+        Returns:
+            bytes: Signed data/detached signature
+        """
+        return await self._collect(
+            self.sign_stream(data, key, mode=mode, passphrase=passphrase, format=format)
+        )
+
+    async def verify(
         self,
         data: bytes,
         signature: bytes | None = None,
@@ -215,20 +951,27 @@ class MessageOperator(BaseOperator):
         Returns:
             list[tuple[str, str]]: List of `(Key ID, User ID)` records
         """
-        with NamedTemporaryFile() as datafile:
-            datafile.write(data)
-            datafile.seek(0)
-            if signature:
-                with NamedTemporaryFile() as sigfile:
-                    sigfile.write(signature)
-                    sigfile.seek(0)
-                    cmd = f"gpg --status-fd 1 --batch -v --verify {sigfile.name} {datafile.name}"
-                    result = self.session.run(cmd)
-            else:
-                cmd = f"gpg --status-fd 1 --batch -v --verify {datafile.name}"
-                result = self.session.run(cmd)
-        return [
-            (i.split(" ")[2], i.split(" ", maxsplit=3)[3])
-            for i in result.output.splitlines()
-            if i.startswith("[GNUPG:] GOODSIG")
-        ]
+        if signature:
+            signature_fd, _ = pipe_source(signature)
+            try:
+                result = await self.session.run(
+                    [
+                        "gpg",
+                        "--batch",
+                        "--enable-special-filenames",
+                        "--verify",
+                        "--",
+                        f"-&{signature_fd}",
+                        "-",
+                    ],
+                    input=data,
+                    pass_fds=(signature_fd,),
+                    status=True,
+                )
+            finally:
+                os.close(signature_fd)
+        else:
+            result = await self.session.run(
+                ["gpg", "--batch", "--verify"], input=data, status=True
+            )
+        return self.operator._parse_verification(result)
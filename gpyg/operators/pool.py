@@ -0,0 +1,265 @@
+from collections import deque
+from datetime import datetime, timedelta
+import shutil
+from tempfile import mkdtemp
+from threading import Condition, Lock, Thread
+from typing import Any, Literal
+from uuid import uuid4
+
+from ..models import InfoRecord, KeySpec
+from ..util import ExecutionError, kill_agent
+from .keys import Key, KeyOperator
+
+PLACEHOLDER_NAME = "GPyG Pool Key"
+"""Name part of the placeholder UID that pooled keys are generated with"""
+
+
+class KeyPool:
+    """A pool of pre-generated, unassigned keys for a single algorithm/usage profile.
+
+    Keys are generated in batches by a background worker in a scratch homedir, and kept topped up to
+    `size` whenever fewer than `low_water` remain. `take` personalizes a pooled key (UID and passphrase)
+    and moves it into the live keyring, so its latency does not depend on key generation. Note that
+    pooled keys keep the creation date (and, for relative expirations, the expiration) from when they
+    were pre-generated.
+
+    Args:
+        gpg (GPG): The GPG instance whose keyring receives claimed keys
+        size (int, optional): Number of keys to keep ready. Defaults to 4.
+        low_water (int, optional): Refill once this many or fewer keys remain. Defaults to 1.
+        algorithm (str | None, optional): Key algorithm, as in `generate_key`. Defaults to None.
+        usage (list[sign | auth | encr | cert] | None, optional): Key usages, as in `generate_key`. Defaults to None.
+        expiration (datetime | timedelta | int | None, optional): Key expiration, as in `generate_key`. Defaults to None.
+        batch_size (int | None, optional): Maximum keys per gpg generation run, or `size` if None. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        gpg: Any,
+        size: int = 4,
+        low_water: int = 1,
+        algorithm: str | None = None,
+        usage: list[Literal["sign", "auth", "encr", "cert"]] | None = None,
+        expiration: datetime | timedelta | int | None = None,
+        batch_size: int | None = None,
+    ) -> None:
+        if size < 1 or low_water < 0 or low_water >= size:
+            raise ValueError("Pool size must be positive and above the low-water mark")
+
+        self.gpg = gpg
+        # Claims run synchronously, even when the instance is an AsyncGPG
+        self.operator = KeyOperator(gpg)
+        self.size = size
+        self.low_water = low_water
+        self.algorithm = algorithm
+        self.usage = usage
+        self.expiration = expiration
+        self.batch_size = batch_size if batch_size else size
+        self.homedir = mkdtemp(prefix="gpyg-pool-")
+        self.error: Exception | None = None
+
+        self._keys: deque[str] = deque()
+        self._condition = Condition()
+        self._claim_lock = Lock()
+        self._closed = False
+        self._refill = True
+        self._worker = Thread(target=self._run, name="gpyg-key-pool", daemon=True)
+        self._worker.start()
+
+    def __enter__(self) -> "KeyPool":
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.close()
+
+    @property
+    def available(self) -> int:
+        """Number of keys ready to be claimed
+
+        Returns:
+            int: Pooled key count
+        """
+        with self._condition:
+            return len(self._keys)
+
+    def matches(
+        self,
+        algorithm: str | None = None,
+        usage: list[str] | None = None,
+        expiration: datetime | timedelta | int | None = None,
+    ) -> bool:
+        """Whether a key with these parameters can be served from this pool
+
+        Args:
+            algorithm (str | None, optional): Key algorithm. Defaults to None.
+            usage (list[str] | None, optional): Key usages. Defaults to None.
+            expiration (datetime | timedelta | int | None, optional): Key expiration. Defaults to None.
+
+        Returns:
+            bool: True if the parameters equal the pool's profile
+        """
+        return (
+            algorithm == self.algorithm
+            and usage == self.usage
+            and expiration == self.expiration
+        )
+
+    def wait(self, count: int | None = None, timeout: float | None = None) -> bool:
+        """Blocks until the pool holds at least `count` keys
+
+        Args:
+            count (int | None, optional): Keys to wait for, or the full pool size. Defaults to None.
+            timeout (float | None, optional): Time limit, or no limit. Defaults to None.
+
+        Returns:
+            bool: Whether enough keys are available
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: len(self._keys) >= (count if count != None else self.size)
+                or self._closed
+                or self.error != None,
+                timeout=timeout,
+            ) and len(self._keys) >= (count if count != None else self.size)
+
+    def take(
+        self,
+        name: str,
+        email: str | None = None,
+        comment: str | None = None,
+        passphrase: str | None = None,
+    ) -> Key:
+        """Claims a pooled key, giving it the requested UID and passphrase, and moves it into the live keyring.
+        If the pool is empty, the key is generated directly instead.
+
+        Args:
+            name (str): UID Name
+            email (str | None, optional): Optional UID email. Defaults to None.
+            comment (str | None, optional): Optional UID comment. Defaults to None.
+            passphrase (str | None, optional): Key passphrase (if left empty, no passphrase). Defaults to None.
+
+        Raises:
+            ExecutionError: If the key could not be moved into the live keyring
+
+        Returns:
+            Key: The claimed key, as listed in the live keyring
+        """
+        with self._condition:
+            fingerprint = self._keys.popleft() if len(self._keys) > 0 else None
+            if len(self._keys) <= self.low_water:
+                self._refill = True
+                self._condition.notify_all()
+
+        if fingerprint == None:
+            return self.operator._generate_key(
+                name,
+                email=email,
+                comment=comment,
+                algorithm=self.algorithm,
+                usage=self.usage,
+                expiration=self.expiration,
+                passphrase=passphrase,
+                force=True,
+            )
+
+        with self._claim_lock:
+            return self._claim(fingerprint, name, email, comment, passphrase)
+
+    def close(self) -> None:
+        """Stops the worker and removes the scratch homedir along with any unclaimed keys"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join()
+        if getattr(self.gpg, "pool", None) is self:
+            self.gpg.pool = None
+
+        kill_agent(self.homedir)
+        shutil.rmtree(self.homedir, ignore_errors=True)
+
+    def _scratch(self) -> Any:
+        from ..gpg import GPG
+
+        return GPG(homedir=self.homedir)
+
+    def _run(self) -> None:
+        scratch = self._scratch()
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._refill or self._closed)
+                if self._closed:
+                    return
+                missing = min(self.size - len(self._keys), self.batch_size)
+                if missing <= 0:
+                    self._refill = False
+                    continue
+
+            try:
+                keys = scratch.keys.generate_keys(
+                    [
+                        KeySpec(
+                            name=f"{PLACEHOLDER_NAME} {uuid4().hex}",
+                            algorithm=self.algorithm,
+                            usage=self.usage,
+                            expiration=self.expiration,
+                        )
+                        for _ in range(missing)
+                    ]
+                )
+            except Exception as error:
+                with self._condition:
+                    self.error = error
+                    self._refill = False
+                    self._condition.notify_all()
+                continue
+
+            with self._condition:
+                self.error = None
+                self._keys.extend([k.fingerprint for k in keys if k != None])
+                self._condition.notify_all()
+
+    def _claim(
+        self,
+        fingerprint: str,
+        name: str,
+        email: str | None,
+        comment: str | None,
+        passphrase: str | None,
+    ) -> Key:
+        scratch = self._scratch()
+        key = scratch.keys.get_key(fingerprint, key_type="secret")
+        key = key.add_user_id(name=name, email=email, comment=comment)
+        with key.edit() as editor:
+            uids = [
+                line.uid
+                for line in editor.list()
+                if line.record_type == InfoRecord.USER_ID
+            ]
+            editor.set_uid(
+                str(1 + [i.startswith(PLACEHOLDER_NAME) for i in uids].index(True))
+            )
+            editor.delete_uid()
+            if passphrase:
+                editor.change_password(None, passphrase)
+            editor.save()
+
+        exported = scratch.keys.export_keys(
+            [fingerprint], mode="gpg", secret=True, password=passphrase
+        )
+        with self.gpg.writer:
+            report = self.operator.import_data(exported)
+            if report.code != 0 or len(report.failed_keys) > 0:
+                raise ExecutionError(report.errors)
+
+            proc = self.gpg.session.run(
+                ["gpg", "--batch", "--import-ownertrust"],
+                input=f"{fingerprint}:6:\n",
+            )
+            if proc.code != 0:
+                raise ExecutionError(proc.errors)
+        key.delete()
+
+        self.operator.invalidate()
+        return self.operator.get_key(fingerprint)
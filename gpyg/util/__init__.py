@@ -1,3 +1,53 @@
-from .process import ProcessSession, Process
+from .process import (
+    ProcessSession,
+    Process,
+    ProcessRecord,
+    InputSource,
+    pump,
+    iter_chunks,
+    pipe_input,
+    pipe_source,
+    CHUNK_SIZE,
+)
 from .errors import *
-from .interactive import Interactive, StatusInteractive, StatusLine
+from .status import StatusLine
+from .interactive import Interactive, StatusInteractive
+from .async_process import AsyncProcessSession, AsyncProcess, AsyncInputSource
+from .packets import (
+    PUBLIC_KEY,
+    SECRET_KEY,
+    PUBLIC_SUBKEY,
+    USER_ID,
+    USER_ATTRIBUTE,
+    SIGNATURE,
+    PUBLIC_KEY_SESSION_KEY,
+    SYMMETRIC_SESSION_KEY,
+    MARKER,
+    WILDCARD_KEY_ID,
+    CURVES,
+    PacketError,
+    SignaturePacket,
+    iter_packets,
+    key_fingerprint,
+    key_parameters,
+    compute_keygrip,
+    parse_signature,
+    scan_recipients,
+    split_keys,
+    crc24,
+    armor,
+)
+from .snapshot import clone_homedir, clone_file, SNAPSHOT_EXCLUDE
+from .assuan import (
+    AssuanClient,
+    AssuanResponse,
+    AgentPool,
+    AgentKeyInfo,
+    agent_socket,
+    agent_running,
+    launch_agent,
+    kill_agent,
+    parse_sexp,
+    encode_sexp,
+)
+from .locking import WriterLock, LockMetrics
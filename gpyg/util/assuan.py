@@ -0,0 +1,607 @@
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from functools import lru_cache
+import os
+import re
+import socket
+import subprocess
+from threading import Lock
+import time
+from typing import Any, Literal
+from urllib.parse import unquote_to_bytes
+
+from pydantic import BaseModel
+
+from .errors import AssuanError, ExecutionError
+
+LINE_LENGTH = 1000
+"""Maximum length of an Assuan line, including the trailing LF"""
+
+DATA_CHUNK = 300
+"""Raw bytes sent per D line; percent-escaping can at most triple this"""
+
+HASH_ALGORITHMS = {
+    "md5": 1,
+    "sha1": 2,
+    "rmd160": 3,
+    "sha256": 8,
+    "sha384": 9,
+    "sha512": 10,
+    "sha224": 11,
+}
+"""libgcrypt digest algorithm IDs, as expected by SETHASH"""
+
+ESCAPED = re.compile(rb"[%\r\n]")
+
+Inquiry = dict[str, bytes | str] | Callable[[str, list[str]], bytes | str | None]
+
+
+@lru_cache
+def agent_socket(homedir: str | None = None) -> str:
+    """Locates the gpg-agent socket of a homedir with `gpgconf --list-dirs`
+
+    Args:
+        homedir (str | None, optional): Homedir, or the default homedir if None. Defaults to None.
+
+    Raises:
+        ExecutionError: If gpgconf fails
+
+    Returns:
+        str: Path to the agent's socket
+    """
+    result = subprocess.run(
+        ["gpgconf", "--list-dirs", "agent-socket"],
+        env=_environment(homedir),
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise ExecutionError(result.stderr.decode(errors="replace"))
+    return unquote_to_bytes(result.stdout.strip()).decode()
+
+
+def agent_running(homedir: str | None = None) -> bool:
+    """Checks whether gpg-agent is accepting connections for a homedir
+
+    Args:
+        homedir (str | None, optional): Homedir, or the default homedir if None. Defaults to None.
+
+    Returns:
+        bool: True if the agent's socket accepts connections
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(agent_socket(homedir))
+            return True
+        except OSError:
+            return False
+
+
+def launch_agent(
+    homedir: str | None = None, timeout: float = 10.0, gpgconf: str = "gpgconf"
+) -> None:
+    """Starts gpg-agent for a homedir, if it is not already running, and waits until it accepts connections
+
+    Args:
+        homedir (str | None, optional): Homedir, or the default homedir if None. Defaults to None.
+        timeout (float, optional): Seconds to wait for the agent's socket. Defaults to 10.0.
+        gpgconf (str, optional): gpgconf executable. Defaults to "gpgconf".
+
+    Raises:
+        ExecutionError: If the agent did not come up in time
+    """
+    subprocess.run(
+        [gpgconf, "--launch", "gpg-agent"],
+        env=_environment(homedir),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while not agent_running(homedir):
+        if time.monotonic() > deadline:
+            raise ExecutionError(f"gpg-agent for {homedir or 'the default homedir'} did not start")
+        time.sleep(0.01)
+
+
+def kill_agent(homedir: str | None = None, gpgconf: str = "gpgconf") -> None:
+    """Stops the gpg-agent of a single homedir, leaving other homedirs' agents alone
+
+    Args:
+        homedir (str | None, optional): Homedir, or the default homedir if None. Defaults to None.
+        gpgconf (str, optional): gpgconf executable. Defaults to "gpgconf".
+    """
+    subprocess.run(
+        [gpgconf, "--kill", "gpg-agent"],
+        env=_environment(homedir),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _environment(homedir: str | None) -> dict[str, str]:
+    if homedir:
+        return {**os.environ, "GNUPGHOME": homedir}
+    return dict(os.environ)
+
+
+def parse_sexp(data: bytes) -> list:
+    """Parses a canonical S-expression, as returned by gpg-agent
+
+    Args:
+        data (bytes): Canonical S-expression
+
+    Raises:
+        ValueError: If the expression is malformed
+
+    Returns:
+        list: Nested lists of bytes atoms
+    """
+    stack: list[list] = [[]]
+    offset = 0
+    while offset < len(data):
+        char = data[offset : offset + 1]
+        if char == b"(":
+            stack.append([])
+            offset += 1
+        elif char == b")":
+            if len(stack) < 2:
+                raise ValueError(f"Unbalanced S-expression at offset {offset}")
+            closed = stack.pop()
+            stack[-1].append(closed)
+            offset += 1
+        elif char.isdigit():
+            colon = data.index(b":", offset)
+            length = int(data[offset:colon])
+            stack[-1].append(data[colon + 1 : colon + 1 + length])
+            offset = colon + 1 + length
+        elif char in b" \t\r\n\x00":
+            offset += 1
+        else:
+            raise ValueError(f"Invalid S-expression at offset {offset}")
+
+    if len(stack) != 1 or len(stack[0]) != 1:
+        raise ValueError("Incomplete S-expression")
+    return stack[0][0]
+
+
+def encode_sexp(value: list | bytes | str | int) -> bytes:
+    """Encodes nested lists of atoms as a canonical S-expression
+
+    Args:
+        value (list | bytes | str | int): Expression. Integers are encoded as unsigned big-endian MPIs.
+
+    Returns:
+        bytes: Canonical S-expression
+    """
+    if isinstance(value, list):
+        return b"(" + b"".join([encode_sexp(i) for i in value]) + b")"
+    if isinstance(value, int):
+        value = value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big")
+    if isinstance(value, str):
+        value = value.encode()
+    return str(len(value)).encode() + b":" + value
+
+
+class AgentKeyInfo(BaseModel):
+    """Information about a secret key held by gpg-agent, as reported by KEYINFO
+
+    Attributes:
+        keygrip (str): The key's keygrip
+        storage (disk | smartcard | unknown | missing): Where the key is stored
+        serial_number (str | None): Smartcard serial number, if stored on a card
+        card_id (str | None): Key ID on the smartcard, if stored on a card
+        cached (bool): Whether the key's passphrase is currently cached
+        protection (protected | clear | unknown): Whether the key is passphrase-protected
+        ssh_fingerprint (str | None): SSH fingerprint, if available
+        ttl (int | None): TTL of the key in sshcontrol, if any
+        flags (str): Additional flags (ie "D" for disabled, "c" for confirmation required)
+    """
+
+    keygrip: str
+    storage: Literal["disk", "smartcard", "unknown", "missing"]
+    serial_number: str | None = None
+    card_id: str | None = None
+    cached: bool = False
+    protection: Literal["protected", "clear", "unknown"] = "unknown"
+    ssh_fingerprint: str | None = None
+    ttl: int | None = None
+    flags: str = ""
+
+    @classmethod
+    def from_status(cls, arguments: list[str]) -> "AgentKeyInfo":
+        """Builds a model from the arguments of a `S KEYINFO` line
+
+        Args:
+            arguments (list[str]): Status arguments, starting with the keygrip
+
+        Returns:
+            AgentKeyInfo: The parsed info
+        """
+        fields = arguments + ["-"] * (9 - len(arguments))
+        value = lambda i: None if fields[i] == "-" else fields[i]
+        return cls(
+            keygrip=fields[0],
+            storage={"D": "disk", "T": "smartcard", "X": "unknown"}.get(
+                fields[1], "missing"
+            ),
+            serial_number=value(2),
+            card_id=value(3),
+            cached=fields[4] == "1",
+            protection={"P": "protected", "C": "clear"}.get(fields[5], "unknown"),
+            ssh_fingerprint=value(6),
+            ttl=int(fields[7]) if fields[7].isdigit() else None,
+            flags="" if fields[8] == "-" else fields[8],
+        )
+
+
+class AssuanResponse(BaseModel):
+    """The outcome of a single Assuan transaction
+
+    Attributes:
+        data (bytes): Concatenated (unescaped) D lines
+        status (list[tuple[str, list[str]]]): Status lines, as `(keyword, arguments)`
+        message (str): Text following the final OK
+    """
+
+    data: bytes = b""
+    status: list[tuple[str, list[str]]] = []
+    message: str = ""
+
+    def get_status(self, keyword: str) -> list[list[str]]:
+        """Gets the arguments of all status lines with a given keyword
+
+        Args:
+            keyword (str): Status keyword
+
+        Returns:
+            list[list[str]]: Arguments of each matching line
+        """
+        return [arguments for name, arguments in self.status if name == keyword]
+
+
+class AssuanClient:
+    """A persistent Assuan connection to gpg-agent, for talking to the agent without spawning gpg.
+    Connections are not thread-safe; use an AgentPool to share them between threads.
+
+    Args:
+        homedir (str | None, optional): Homedir whose agent to connect to, or the default homedir if None. Defaults to None.
+        loopback (bool, optional): Whether to answer passphrase inquiries directly rather than through pinentry. Defaults to True.
+        timeout (float | None, optional): Socket timeout, or no timeout. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        homedir: str | None = None,
+        loopback: bool = True,
+        timeout: float | None = None,
+    ) -> None:
+        self.homedir = homedir
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(timeout)
+        try:
+            self.socket.connect(agent_socket(homedir))
+        except (FileNotFoundError, ConnectionRefusedError):
+            launch_agent(homedir)
+            self.socket.connect(agent_socket(homedir))
+        self.reader = self.socket.makefile("rb")
+        self._read_response()
+        if loopback:
+            self.option("pinentry-mode", "loopback")
+
+    def __enter__(self) -> "AssuanClient":
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the connection has been closed
+
+        Returns:
+            bool: Closed state
+        """
+        return self.socket.fileno() == -1
+
+    def close(self) -> None:
+        """Says goodbye to the agent and closes the connection"""
+        if self.closed:
+            return
+        try:
+            self._write(b"BYE\n")
+        except OSError:
+            pass
+        self.reader.close()
+        self.socket.close()
+
+    def transact(
+        self,
+        command: str,
+        inquire: Inquiry | None = None,
+    ) -> AssuanResponse:
+        """Sends a raw command and collects its response
+
+        Args:
+            command (str): Command line (without the trailing LF)
+            inquire (dict[str, bytes | str] | Callable[[str, list[str]], bytes | str | None] | None, optional): Answers to INQUIRE requests, by keyword, or a function returning them (None to cancel). Defaults to None.
+
+        Raises:
+            AssuanError: If the agent answers with ERR
+
+        Returns:
+            AssuanResponse: Data, status lines and final message
+        """
+        encoded = command.encode()
+        if b"\n" in encoded or len(encoded) >= LINE_LENGTH:
+            raise ValueError("Assuan commands must be a single line of under 1000 bytes")
+        self._write(encoded + b"\n")
+        return self._read_response(inquire)
+
+    def option(self, name: str, value: str | None = None) -> None:
+        """Sets a session option
+
+        Args:
+            name (str): Option name
+            value (str | None, optional): Option value, if any. Defaults to None.
+        """
+        self.transact(f"OPTION {name}" + (f"={value}" if value != None else ""))
+
+    def reset(self) -> None:
+        """Resets the session state (selected keys & hashes)"""
+        self.transact("RESET")
+
+    def pid(self) -> int:
+        """Gets the process ID of the agent
+
+        Returns:
+            int: Agent PID
+        """
+        return int(self.transact("GETINFO pid").data.decode())
+
+    def havekey(self, *keygrips: str) -> bool:
+        """Checks whether the agent holds the secret key of any of the given keygrips
+
+        Args:
+            *keygrips (str): Keygrips to check
+
+        Returns:
+            bool: True if at least one secret key is available
+        """
+        try:
+            self.transact("HAVEKEY " + " ".join(keygrips))
+            return True
+        except AssuanError:
+            return False
+
+    def keyinfo(self, keygrip: str) -> AgentKeyInfo | None:
+        """Gets information about a secret key
+
+        Args:
+            keygrip (str): Keygrip of the key
+
+        Returns:
+            AgentKeyInfo | None: Key info, or None if the agent does not hold the key
+        """
+        try:
+            response = self.transact(f"KEYINFO {keygrip}")
+        except AssuanError:
+            return None
+        lines = response.get_status("KEYINFO")
+        return AgentKeyInfo.from_status(lines[0]) if len(lines) > 0 else None
+
+    def readkey(self, keygrip: str) -> bytes:
+        """Reads the public key of a keygrip
+
+        Args:
+            keygrip (str): Keygrip of the key
+
+        Returns:
+            bytes: The public key, as a canonical S-expression
+        """
+        return self.transact(f"READKEY {keygrip}").data
+
+    def preset_passphrase(self, keygrip: str, passphrase: str) -> None:
+        """Caches a passphrase for a keygrip until it is cleared or the agent stops.
+        Requires `allow-preset-passphrase` in gpg-agent.conf.
+
+        Args:
+            keygrip (str): Keygrip of the key
+            passphrase (str): The key's passphrase
+
+        Raises:
+            AssuanError: If presetting is not allowed
+        """
+        self.transact(
+            f"PRESET_PASSPHRASE {keygrip} -1 {passphrase.encode().hex().upper()}"
+        )
+
+    def clear_passphrase(self, keygrip: str) -> None:
+        """Removes a cached passphrase for a keygrip
+
+        Args:
+            keygrip (str): Keygrip of the key
+        """
+        self.transact(f"CLEAR_PASSPHRASE --mode=normal {keygrip}")
+
+    def pksign(
+        self,
+        keygrip: str,
+        digest: bytes,
+        hash_algorithm: str = "sha256",
+        passphrase: str | None = None,
+    ) -> bytes:
+        """Signs a precomputed digest with a secret key
+
+        Args:
+            keygrip (str): Keygrip of the signing key
+            digest (bytes): Digest to sign
+            hash_algorithm (str, optional): Name of the digest algorithm. Defaults to "sha256".
+            passphrase (str | None, optional): Passphrase, if the key is protected and not cached. Defaults to None.
+
+        Raises:
+            AssuanError: If signing fails (ie bad passphrase)
+
+        Returns:
+            bytes: The signature, as a canonical `sig-val` S-expression
+        """
+        self.transact(f"SIGKEY {keygrip}")
+        self.transact(
+            f"SETHASH {HASH_ALGORITHMS[hash_algorithm.lower()]} {digest.hex().upper()}"
+        )
+        return self.transact("PKSIGN", inquire=self._passphrase(passphrase)).data
+
+    def pkdecrypt(
+        self,
+        keygrip: str,
+        ciphertext: bytes,
+        passphrase: str | None = None,
+    ) -> bytes:
+        """Decrypts a ciphertext with a secret key
+
+        Args:
+            keygrip (str): Keygrip of the decryption key
+            ciphertext (bytes): Ciphertext, as a canonical `enc-val` S-expression
+            passphrase (str | None, optional): Passphrase, if the key is protected and not cached. Defaults to None.
+
+        Raises:
+            AssuanError: If decryption fails (ie bad passphrase)
+
+        Returns:
+            bytes: The result, as a canonical `value` S-expression
+        """
+        self.transact(f"SETKEY {keygrip}")
+        inquiries = {"CIPHERTEXT": ciphertext}
+        if passphrase != None:
+            inquiries["PASSPHRASE"] = passphrase
+        return self.transact("PKDECRYPT", inquire=inquiries).data
+
+    def _passphrase(self, passphrase: str | None) -> dict[str, str] | None:
+        return {"PASSPHRASE": passphrase} if passphrase != None else None
+
+    def _write(self, data: bytes) -> None:
+        self.socket.sendall(data)
+
+    def _send_data(self, data: bytes) -> None:
+        lines = []
+        for offset in range(0, len(data), DATA_CHUNK):
+            chunk = ESCAPED.sub(
+                lambda match: b"%%%02X" % match.group()[0],
+                data[offset : offset + DATA_CHUNK],
+            )
+            lines.append(b"D " + chunk + b"\n")
+        self._write(b"".join(lines) + b"END\n")
+
+    def _read_response(self, inquire: Inquiry | None = None) -> AssuanResponse:
+        data = bytearray()
+        status: list[tuple[str, list[str]]] = []
+        while True:
+            line = self.reader.readline()
+            if not line:
+                raise ConnectionError("gpg-agent closed the connection")
+            line = line.rstrip(b"\n")
+
+            if line.startswith(b"D "):
+                data.extend(unquote_to_bytes(line[2:]))
+            elif line.startswith(b"S "):
+                parts = line[2:].decode(errors="replace").split(" ")
+                status.append((parts[0], parts[1:]))
+            elif line == b"OK" or line.startswith(b"OK "):
+                return AssuanResponse(
+                    data=bytes(data),
+                    status=status,
+                    message=line[3:].decode(errors="replace"),
+                )
+            elif line.startswith(b"ERR "):
+                code, _, description = line[4:].decode(errors="replace").partition(" ")
+                raise AssuanError(int(code), description)
+            elif line.startswith(b"INQUIRE "):
+                keyword, *arguments = line[8:].decode(errors="replace").split(" ")
+                if callable(inquire):
+                    answer = inquire(keyword, arguments)
+                else:
+                    answer = inquire.get(keyword) if inquire else None
+                if answer == None:
+                    self._write(b"CAN\n")
+                else:
+                    self._send_data(
+                        answer.encode() if isinstance(answer, str) else answer
+                    )
+
+
+class AgentPool:
+    """A thread-safe pool of persistent AssuanClient connections to one gpg-agent
+
+    Args:
+        homedir (str | None, optional): Homedir whose agent to connect to, or the default homedir if None. Defaults to None.
+        size (int, optional): Maximum number of idle connections kept open. Defaults to 4.
+        loopback (bool, optional): Whether connections answer passphrase inquiries directly. Defaults to True.
+    """
+
+    def __init__(
+        self, homedir: str | None = None, size: int = 4, loopback: bool = True
+    ) -> None:
+        self.homedir = homedir
+        self.size = size
+        self.loopback = loopback
+        self._idle: list[AssuanClient] = []
+        self._lock = Lock()
+
+    def __enter__(self) -> "AgentPool":
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.close()
+
+    @contextmanager
+    def connection(self) -> Generator[AssuanClient, Any, None]:
+        """Borrows a connection, opening a new one if none are idle.
+        Connections that fail with anything but an agent-side error, or whose agent has since stopped, are discarded.
+
+        Yields:
+            AssuanClient: A connected client
+        """
+        client = None
+        while client == None:
+            with self._lock:
+                if len(self._idle) == 0:
+                    break
+                client = self._idle.pop()
+            if _hung_up(client):
+                client.close()
+                client = None
+        if client == None:
+            client = AssuanClient(self.homedir, loopback=self.loopback)
+
+        try:
+            yield client
+        except AssuanError:
+            self._release(client)
+            raise
+        except BaseException:
+            client.close()
+            raise
+        else:
+            self._release(client)
+
+    def close(self) -> None:
+        """Closes all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for client in idle:
+            client.close()
+
+    def _release(self, client: AssuanClient) -> None:
+        with self._lock:
+            if len(self._idle) < self.size and not client.closed:
+                self._idle.append(client)
+                return
+        client.close()
+
+
+def _hung_up(client: AssuanClient) -> bool:
+    # An idle connection never has pending data, so a readable socket means the agent closed it
+    try:
+        return client.socket.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b""
+    except BlockingIOError:
+        return False
+    except OSError:
+        return True
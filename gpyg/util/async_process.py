@@ -0,0 +1,485 @@
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterable, Callable
+from datetime import datetime
+from io import BytesIO
+import os
+import shlex
+import time
+from typing import Any, Literal
+
+from .process import CHUNK_SIZE, InputSource, ProcessSession, iter_chunks
+from .status import StatusLine
+
+AsyncInputSource = InputSource | AsyncIterable[bytes]
+
+
+class AsyncProcess:
+    """Wrapper around an asyncio subprocess, mirroring the interface of Process"""
+
+    def __init__(
+        self,
+        process: asyncio.subprocess.Process,
+        command: str | list[str],
+        options: dict[str, Any],
+        decode_output: bool = True,
+        status_reader: asyncio.StreamReader | None = None,
+        status_transport: asyncio.ReadTransport | None = None,
+        on_exit: Callable[["AsyncProcess"], None] | None = None,
+    ):
+        """Initialization routine
+
+        Args:
+            process (asyncio.subprocess.Process): asyncio Process object
+            command (str | list[str]): The command being run
+            options (dict[str, Any]): Options passed to the subprocess constructor
+            decode_output (bool, optional): Whether to convert the output to str. Defaults to True.
+            status_reader (asyncio.StreamReader | None, optional): Reader for the process's `--status-fd` pipe. Defaults to None.
+            status_transport (asyncio.ReadTransport | None, optional): Transport backing `status_reader`. Defaults to None.
+            on_exit (Callable[[AsyncProcess], None] | None, optional): Called once the process has finished and its output was collected. Defaults to None.
+        """
+        self.process = process
+        self.options = options
+        self.argv = command
+        self.output = "" if decode_output else b""
+        self.errors = "" if decode_output else b""
+        self.status: list[StatusLine] = []
+        self.status_reader = status_reader
+        self.status_transport = status_transport
+        self.code: int | None = None
+        self.decode = decode_output
+        self.on_exit = on_exit
+        self.started = datetime.now()
+        self.duration: float | None = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.bytes_err = 0
+        self._start = time.monotonic()
+
+    @property
+    def command(self) -> str:
+        """The command being run, quoted as a single string
+
+        Returns:
+            str: Command string
+        """
+        return shlex.join(self.argv) if type(self.argv) == list else self.argv
+
+    def _set_status(self, data: bytes):
+        if self.status_transport:
+            self.status_transport.close()
+        self.status = [
+            StatusLine.from_line(line) for line in data.splitlines() if len(line) > 0
+        ]
+
+    def _returncode(self) -> int | None:
+        return self.process.returncode
+
+    def _exited(self):
+        if self.code == None:
+            return
+        if self.duration == None:
+            self.duration = time.monotonic() - self._start
+        if self.on_exit != None:
+            callback, self.on_exit = self.on_exit, None
+            callback(self)
+
+    def get_status(self, *code: str) -> list[StatusLine]:
+        """Gets all status lines matching any of the given codes
+
+        Arguments:
+            *code (str): Any number of StatusCodes to look for, or none for all lines
+
+        Returns:
+            list[StatusLine]: Matching status lines
+        """
+        return [i for i in self.status if len(code) == 0 or i.code in code]
+
+    @property
+    def pid(self) -> int:
+        """Returns the PID of the process
+
+        Returns:
+            int: Process PID
+        """
+        return self.process.pid
+
+    def poll(self) -> int | None:
+        """Gets the return code, if available
+
+        Returns:
+            int | None: Returncode or None if the process is running
+        """
+        if self.code == None:
+            self.code = self.process.returncode
+        return self.code
+
+    def kill(self):
+        """Attempts to kill the Process"""
+        try:
+            if self.poll() == None:
+                self.process.kill()
+        except:
+            pass
+
+    async def _feed(self, input: AsyncInputSource | None):
+        stdin = self.process.stdin
+        if stdin == None:
+            return
+        try:
+            if isinstance(input, AsyncIterable):
+                async for chunk in input:
+                    for part in iter_chunks(chunk):
+                        stdin.write(part)
+                        self.bytes_in += len(part)
+                        await stdin.drain()
+            else:
+                chunks = iter_chunks(input)
+                # Reading files and sync iterables may block, so those are pulled off the event loop
+                blocking = input != None and not isinstance(
+                    input, (str, bytes, bytearray, memoryview)
+                )
+                while True:
+                    if blocking:
+                        chunk = await asyncio.to_thread(next, chunks, None)
+                    else:
+                        chunk = next(chunks, None)
+                    if chunk == None:
+                        break
+                    stdin.write(chunk)
+                    self.bytes_in += len(chunk)
+                    await stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            stdin.close()
+
+    async def _drain(self, stream: asyncio.StreamReader | None, target: BytesIO):
+        if stream == None:
+            return
+        while True:
+            chunk = await stream.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            target.write(chunk)
+
+    async def wait(
+        self,
+        timeout: float | None = None,
+        kill_on_timeout: bool = True,
+        input: AsyncInputSource | None = None,
+    ) -> int | None:
+        """Waits for a timeout/for the process to stop, feeding `input` to STDIN while reading output
+
+        Args:
+            timeout (float | None, optional): Time to wait, or no limit. Defaults to None.
+            kill_on_timeout (bool, optional): Whether to kill the process on timeout. Defaults to True.
+            input (AsyncInputSource | None, optional): Data to stream to STDIN. Defaults to None.
+
+        Returns:
+            int | None: The returncode
+        """
+        if self.code != None:
+            return self.code
+
+        output = BytesIO()
+        errors = BytesIO()
+        status = BytesIO()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    self._feed(input),
+                    self._drain(self.process.stdout, output),
+                    self._drain(self.process.stderr, errors),
+                    self._drain(self.status_reader, status),
+                    self.process.wait(),
+                ),
+                timeout,
+            )
+        except TimeoutError:
+            if kill_on_timeout:
+                self.kill()
+                await self.process.wait()
+
+        self.bytes_out = output.tell()
+        self.bytes_err = errors.tell()
+        self.output = output.getvalue().decode(errors="replace") if self.decode else output.getvalue()
+        self.errors = errors.getvalue().decode(errors="replace") if self.decode else errors.getvalue()
+        self._set_status(status.getvalue())
+        code = self.poll()
+        self._exited()
+        return code
+
+    async def stream(
+        self,
+        input: AsyncInputSource | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> AsyncGenerator[bytes, Any]:
+        """Yields STDOUT chunks as they are produced while streaming `input` to STDIN.
+        Output is not retained in `output`; STDERR (if piped separately) is collected into `errors`.
+        The process is killed if the generator is closed early.
+
+        Args:
+            input (AsyncInputSource | None, optional): Data to stream to STDIN. Defaults to None.
+            chunk_size (int, optional): Maximum size of each chunk. Defaults to CHUNK_SIZE.
+
+        Yields:
+            AsyncGenerator[bytes, Any]: STDOUT chunks
+        """
+        errors = BytesIO()
+        status = BytesIO()
+        tasks = [
+            asyncio.ensure_future(self._feed(input)),
+            asyncio.ensure_future(self._drain(self.process.stderr, errors)),
+            asyncio.ensure_future(self._drain(self.status_reader, status)),
+        ]
+        try:
+            while True:
+                chunk = await self.process.stdout.read(chunk_size)
+                if not chunk:
+                    break
+                self.bytes_out += len(chunk)
+                yield chunk
+            await asyncio.gather(*tasks)
+            await self.process.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.kill()
+            await self.process.wait()
+            self.bytes_err = errors.tell()
+            self.errors = (
+                errors.getvalue().decode(errors="replace")
+                if self.decode
+                else errors.getvalue()
+            )
+            self._set_status(status.getvalue())
+            self.poll()
+            self._exited()
+
+
+class AsyncProcessSession(ProcessSession):
+    """A persistent session that creates AsyncProcesses through asyncio subprocesses"""
+
+    def __init__(
+        self,
+        shell: bool | None = None,
+        environment: dict[str, str] | None = None,
+        working_directory: str | None = None,
+        cleanup_mode: Literal["kill", "wait", "ignore"] = "kill",
+        executables: dict[str, str] | None = None,
+        history_size: int = 0,
+        retain_output: bool = False,
+    ) -> None:
+        """Initialization routine
+
+        Args:
+            shell (bool | None, optional): Whether to use shell. Defaults to None.
+            environment (dict[str, str] | None, optional): Environment vars. Defaults to None.
+            working_directory (str | None, optional): Workding directory path. Defaults to None.
+            cleanup_mode (kill | wait | ignore, optional): What to do when deactivated to all child processes. Defaults to "kill".
+            executables (dict[str, str] | None, optional): Absolute paths of program names, which are otherwise looked up (once) on the session's PATH. Defaults to None.
+            history_size (int, optional): Number of finished processes to keep a ProcessRecord of, or 0 to keep none. Defaults to 0.
+            retain_output (bool, optional): Whether records in `history` keep the processes' output and errors. Defaults to False.
+        """
+        super().__init__(
+            shell=shell,
+            environment=environment,
+            working_directory=working_directory,
+            cleanup_mode=cleanup_mode,
+            executables=executables,
+            history_size=history_size,
+            retain_output=retain_output,
+        )
+        self.processes: dict[int, AsyncProcess] = {}
+
+    def deactivate(self):
+        """Deactivates the Session and kills remaining processes (if cleanup mode is "kill")"""
+        if self.cleanup == "kill":
+            with self._lock:
+                running, self.processes = self.processes, {}
+            for process in running.values():
+                process.kill()
+
+    async def adeactivate(self):
+        """Deactivates the Session and cleans up, awaiting processes if needed"""
+        match self.cleanup:
+            case "wait":
+                with self._lock:
+                    running = list(self.processes.values())
+                for process in running:
+                    await process.wait()
+                self.reap()
+            case _:
+                self.deactivate()
+
+    async def __aenter__(self):
+        return self.activate()
+
+    async def __aexit__(self, *args, **kwargs):
+        await self.adeactivate()
+
+    async def spawn(
+        self,
+        command: str | list[str],
+        shell: bool | None = None,
+        environment: dict[str, str] | None = None,
+        working_directory: str | None = None,
+        decode: bool = True,
+        merge_stderr: bool = False,
+        pass_fds: tuple[int, ...] = (),
+        status: bool = False,
+    ) -> AsyncProcess:
+        """Spawns a process, then returns to the caller
+
+        Args:
+            command (str | list[str]): Command to run
+            shell (bool | None, optional): Whether to run in shell. Defaults to None.
+            environment (dict[str, str] | None, optional): Environment override. Defaults to None.
+            working_directory (str | None, optional): Working directory. Defaults to None.
+            decode (bool, optional): Whether to decode the output bytes. Defaults to True.
+            merge_stderr (bool, optional): Whether to merge STDERR into STDOUT, or pipe it separately. Defaults to False.
+            pass_fds (tuple[int, ...], optional): Extra file descriptors to leave open in the child. Defaults to ().
+            status (bool, optional): Whether to pass a dedicated `--status-fd` pipe to the (gpg) command, collected into `AsyncProcess.status`. Defaults to False.
+
+        Returns:
+            AsyncProcess: Running AsyncProcess
+        """
+        self.reap()
+        options = self.make_kwargs(shell=shell, env=environment, cwd=working_directory)
+        use_shell = bool(options.pop("shell", False))
+        parsed_command = self.parse_cmd(
+            command, shell=use_shell, environment=options.get("env")
+        )
+
+        status_read, status_write = os.pipe() if status else (None, None)
+        if status:
+            parsed_command = self.with_status_fd(parsed_command, status_write)
+            pass_fds = (*pass_fds, status_write)
+
+        streams = dict(
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT if merge_stderr else asyncio.subprocess.PIPE,
+            pass_fds=pass_fds,
+            close_fds=len(pass_fds) > 0,
+        )
+
+        try:
+            if use_shell:
+                process = await asyncio.create_subprocess_shell(
+                    parsed_command, **streams, **options
+                )
+            else:
+                process = await asyncio.create_subprocess_exec(
+                    *parsed_command, **streams, **options
+                )
+        except:
+            if status:
+                os.close(status_read)
+            raise
+        finally:
+            if status:
+                os.close(status_write)
+
+        status_reader, status_transport = None, None
+        if status:
+            status_reader = asyncio.StreamReader()
+            status_transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(status_reader),
+                open(status_read, "rb", buffering=0),
+            )
+
+        return self._register(
+            AsyncProcess(
+                process,
+                parsed_command,
+                options,
+                decode_output=decode,
+                status_reader=status_reader,
+                status_transport=status_transport,
+                on_exit=self._evict,
+            )
+        )
+
+    async def run(
+        self,
+        command: str | list[str],
+        shell: bool | None = None,
+        environment: dict[str, str] | None = None,
+        working_directory: str | None = None,
+        timeout: int | None = None,
+        decode: bool = True,
+        input: AsyncInputSource | None = None,
+        merge_stderr: bool = False,
+        pass_fds: tuple[int, ...] = (),
+        status: bool = False,
+    ) -> AsyncProcess:
+        """Runs an AsyncProcess & waits for it to complete.
+
+        Args:
+            command (str | list[str]): Command to run
+            shell (bool | None, optional): Whether to run in shell. Defaults to None.
+            environment (dict[str, str] | None, optional): Environment var override. Defaults to None.
+            working_directory (str | None, optional): Working directory. Defaults to None.
+            timeout (int | None, optional): How long to wait, or no wait limit. Defaults to None.
+            decode (bool, optional): Whether to decode the output. Defaults to True.
+            input (AsyncInputSource | None, optional): String/bytes, a readable binary object, or a (possibly async) iterable of chunks to stream to STDIN. Files and sync iterables are read in a worker thread. Defaults to None.
+            merge_stderr (bool, optional): Whether to merge STDERR into STDOUT, or pipe it separately. Defaults to False.
+            pass_fds (tuple[int, ...], optional): Extra file descriptors to leave open in the child. Defaults to ().
+            status (bool, optional): Whether to pass a dedicated `--status-fd` pipe to the (gpg) command. Defaults to False.
+
+        Returns:
+            AsyncProcess: Finished AsyncProcess
+        """
+        process = await self.spawn(
+            command,
+            shell=shell,
+            environment=environment,
+            working_directory=working_directory,
+            decode=decode,
+            merge_stderr=merge_stderr,
+            pass_fds=pass_fds,
+            status=status,
+        )
+        await process.wait(
+            timeout=timeout, kill_on_timeout=True, input=input if input else None
+        )
+        return process
+
+    async def stream(
+        self,
+        command: str | list[str],
+        input: AsyncInputSource | None = None,
+        shell: bool | None = None,
+        environment: dict[str, str] | None = None,
+        working_directory: str | None = None,
+        pass_fds: tuple[int, ...] = (),
+        status: bool = False,
+    ) -> AsyncGenerator[bytes, Any]:
+        """Runs an AsyncProcess, streaming `input` to STDIN and yielding STDOUT chunks as they arrive.
+        STDERR is kept separate from the yielded payload, and the finished process is recorded
+        in `history` (if enabled).
+
+        Args:
+            command (str | list[str]): Command to run
+            input (AsyncInputSource | None, optional): Data to stream to STDIN. Defaults to None.
+            shell (bool | None, optional): Whether to run in shell. Defaults to None.
+            environment (dict[str, str] | None, optional): Environment var override. Defaults to None.
+            working_directory (str | None, optional): Working directory. Defaults to None.
+            pass_fds (tuple[int, ...], optional): Extra file descriptors to leave open in the child. Defaults to ().
+            status (bool, optional): Whether to pass a dedicated `--status-fd` pipe to the (gpg) command. Defaults to False.
+
+        Yields:
+            AsyncGenerator[bytes, Any]: STDOUT chunks
+        """
+        process = await self.spawn(
+            command,
+            shell=shell,
+            environment=environment,
+            working_directory=working_directory,
+            decode=False,
+            pass_fds=pass_fds,
+            status=status,
+        )
+        async for chunk in process.stream(input=input):
+            yield chunk
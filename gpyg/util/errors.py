@@ -2,7 +2,15 @@ class ExecutionError(Exception):
     """Raised in the general case if a GPG command fails unexpectedly. Includes most relevant output."""
     def __init__(self, output: str, *args: object) -> None:
         self.output = output
-        super().__init__(*args)
+        super().__init__(output, *args)
 
     def __str__(self) -> str:
         return f"Encountered an error executing a GPG command:\n\n=====\n{self.output}\n====="
+
+
+class AssuanError(ExecutionError):
+    """Raised when gpg-agent answers an Assuan command with ERR. Includes the gpg-error code and description."""
+    def __init__(self, code: int, description: str, *args: object) -> None:
+        self.code = code
+        self.description = description
+        super().__init__(f"ERR {code} {description}", *args)
@@ -1,49 +1,19 @@
 from collections.abc import Generator
+import os
+import selectors
 import subprocess
-from tempfile import NamedTemporaryFile
+import time
 from typing import Any
 
-from pydantic import BaseModel, computed_field
-from .process import ProcessSession
+from .errors import ExecutionError
+from .process import CHUNK_SIZE, ProcessSession
+from .status import StatusLine
 
+TRANSCRIPT_SIZE = 1024 * 1024
+"""Default number of trailing output bytes an Interactive keeps for `seek`/`read`"""
 
-class StatusLine(BaseModel):
-    """Representation of a single status line
-    See https://github.com/gpg/gnupg/blob/master/doc/DETAILS
-    """
-    content: str
-    code: str | None = None
-    arguments: list[str] | None = None
-
-    @computed_field
-    @property
-    def is_status(self) -> bool:
-        """Determines if a line is a status line or not (ie contains a status code)
-
-        Returns:
-            bool: Whether this line is status
-        """
-        return self.code != None
-
-    @classmethod
-    def from_line(cls, line: bytes) -> "StatusLine":
-        """Creates a StatusLine from raw bytes
-
-        Args:
-            line (bytes): Input data
-
-        Returns:
-            StatusLine: A constructed StatusLine
-        """
-        decoded = line.decode().rstrip("\n")
-        if decoded.startswith("[GNUPG:]"):
-            return StatusLine(
-                content=decoded,
-                code=decoded.split(" ")[1].strip(),
-                arguments=decoded.split(" ")[2:],
-            )
-        else:
-            return StatusLine(content=decoded)
+POLL_INTERVAL = 0.1
+"""How long `readlines(yield_empty=True)` blocks before yielding None"""
 
 
 class Interactive:
@@ -55,6 +25,7 @@ class Interactive:
         shell: bool | None = None,
         environment: dict[str, str] | None = None,
         working_directory: str | None = None,
+        transcript_size: int = TRANSCRIPT_SIZE,
     ):
         """Initializes the Interactive instance
 
@@ -64,30 +35,45 @@ class Interactive:
             shell (bool | None, optional): Whether to run as shell. Defaults to None.
             environment (dict[str, str] | None, optional): Environment variable overrides. Defaults to None.
             working_directory (str | None, optional): Working directory override. Defaults to None.
+            transcript_size (int, optional): Maximum number of trailing output bytes kept in memory. Defaults to TRANSCRIPT_SIZE.
         """
         self.session = session
         self.options = self.session.make_kwargs(
             shell=shell, env=environment, cwd=working_directory
         )
         self.parsed_command = self.session.parse_cmd(
-            command, shell=bool(self.options.get("shell", False))
+            command,
+            shell=bool(self.options.get("shell", False)),
+            environment=self.options.get("env"),
         )
 
-        self.output_file = None
-        self.output_handle = None
+        self.transcript_size = transcript_size
+        self.transcript = bytearray()
+        self.transcript_start = 0
+        self.position = 0
+        self.pending = bytearray()
+        self.eof = False
+        self.selector = None
         self.process = None
         self.code = None
 
     def __enter__(self) -> "Interactive":
-        self.output_file = NamedTemporaryFile()
-        self.output_handle = open(self.output_file.name, "rb")
+        self.transcript = bytearray()
+        self.transcript_start = 0
+        self.position = 0
+        self.pending = bytearray()
+        self.eof = False
         self.process = subprocess.Popen(
             self.parsed_command,
             stdin=subprocess.PIPE,
-            stdout=self.output_file,
-            stderr=self.output_file,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            close_fds=False,
             **self.options,
         )
+        os.set_blocking(self.process.stdout.fileno(), False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.process.stdout, selectors.EVENT_READ)
         return self
 
     def __exit__(self, *args, **kwargs):
@@ -98,20 +84,56 @@ class Interactive:
             except:
                 pass
         self.code = self.process.poll()
-        self.output_handle.close()
-        self.output_file.close()
+        self.selector.close()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except:
+                pass
         del self.process
 
+    def _fill(self, timeout: float | None) -> bool:
+        """Waits up to `timeout` for output and appends whatever is available to the buffers
+
+        Args:
+            timeout (float | None): Time to block, 0 to poll, or None to wait indefinitely
+
+        Returns:
+            bool: Whether any bytes were read
+        """
+        if self.eof:
+            return False
+        if len(self.selector.select(timeout)) == 0:
+            return False
+
+        try:
+            data = os.read(self.process.stdout.fileno(), CHUNK_SIZE)
+        except BlockingIOError:
+            return False
+
+        if not data:
+            self.eof = True
+            self.selector.unregister(self.process.stdout)
+            return False
+
+        self.pending.extend(data)
+        self.transcript.extend(data)
+        overflow = len(self.transcript) - self.transcript_size
+        if overflow > 0:
+            del self.transcript[:overflow]
+            self.transcript_start += overflow
+        return True
+
     def seek(self, position: int = 0):
-        """Seeks to a position within the STDOUT
+        """Seeks to a position within the retained STDOUT transcript
 
         Args:
-            position (int, optional): Position to seek to. Defaults to 0.
+            position (int, optional): Position to seek to. Positions older than the retained transcript map to its start. Defaults to 0.
         """
-        self.output_handle.seek(position)
+        self.position = max(position, self.transcript_start)
 
     def read(self, amount: int = -1) -> bytes | None:
-        """Returns up to `amount` bytes of STDOUT
+        """Returns up to `amount` bytes of the STDOUT transcript from the current position
 
         Args:
             amount (int, optional): Amount to return. Defaults to -1.
@@ -119,35 +141,103 @@ class Interactive:
         Returns:
             bytes | None: Read bytes
         """
-        return self.output_handle.read(amount)
+        while self._fill(0):
+            pass
+        self.seek(self.position)
+        start = self.position - self.transcript_start
+        end = len(self.transcript) if amount < 0 else start + amount
+        result = bytes(self.transcript[start:end])
+        self.position += len(result)
+        return result
+
+    def readline(self, timeout: float | None = 0) -> bytes | None:
+        """Reads a single line (or the remainder at EOF) of STDOUT
 
-    def readline(self) -> bytes | None:
-        """Reads a single line (or until EOF) of STDOUT
+        Args:
+            timeout (float | None, optional): How long to wait for a full line, or None to wait indefinitely. Defaults to 0.
 
         Returns:
-            bytes | None: Line data
+            bytes | None: Line data, or None if no full line arrived in time
         """
-        line = self.output_handle.readline()
-        if len(line) == 0:
-            return None
-        return line
+        deadline = time.monotonic() + timeout if timeout != None else None
+        while True:
+            index = self.pending.find(b"\n")
+            if index >= 0:
+                line = bytes(self.pending[: index + 1])
+                del self.pending[: index + 1]
+                return line
+
+            if self.eof:
+                if len(self.pending) > 0:
+                    line = bytes(self.pending)
+                    self.pending.clear()
+                    return line
+                return None
+
+            remaining = None
+            if deadline != None:
+                remaining = deadline - time.monotonic()
+                if remaining < 0:
+                    return None
+            self._fill(remaining)
 
-    def readlines(self, yield_empty: bool = True) -> Generator[bytes | None, Any, Any]:
-        """Reads lines as an iterator from STDOUT
+    def readlines(
+        self, yield_empty: bool = True, timeout: float | None = None
+    ) -> Generator[bytes | None, Any, Any]:
+        """Reads lines as an iterator from STDOUT, ending once the process closes its output
 
         Args:
-            yield_empty (bool, optional): Whether to yield None when no line is read. Defaults to True.
+            yield_empty (bool, optional): Whether to yield None when no line arrives within POLL_INTERVAL. Defaults to True.
+            timeout (float | None, optional): Raise TimeoutError if no line arrives for this long. Defaults to None.
+
+        Raises:
+            TimeoutError: If `timeout` elapses without a line
 
         Yields:
             Generator[bytes | None, Any, Any]: The line generator
         """
+        last_line = time.monotonic()
         while True:
-            try:
-                line = self.readline()
-                if line != None or yield_empty:
-                    yield line
-            except:
-                break
+            wait = POLL_INTERVAL if yield_empty else None
+            if timeout != None:
+                remaining = max(0, last_line + timeout - time.monotonic())
+                wait = remaining if wait == None else min(wait, remaining)
+
+            line = self.readline(timeout=wait)
+            if line != None:
+                last_line = time.monotonic()
+                yield line
+            elif self.eof:
+                return
+            else:
+                if timeout != None and time.monotonic() - last_line >= timeout:
+                    raise TimeoutError("Timed out waiting for output")
+                if yield_empty:
+                    yield None
+
+    def wait(self, timeout: float | None = None) -> int | None:
+        """Waits for the process to exit, draining its output meanwhile
+
+        Args:
+            timeout (float | None, optional): Time to wait, or no limit. Defaults to None.
+
+        Returns:
+            int | None: The returncode, or None if still running
+        """
+        deadline = time.monotonic() + timeout if timeout != None else None
+        while not self.eof:
+            remaining = None
+            if deadline != None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+            self._fill(remaining)
+        try:
+            return self.process.wait(
+                timeout=max(0, deadline - time.monotonic()) if deadline else None
+            )
+        except subprocess.TimeoutExpired:
+            return None
 
     def write(self, content: bytes):
         """Write some content to STDIN
@@ -178,36 +268,40 @@ class Interactive:
 
 class StatusInteractive(Interactive):
     """Wrapper around Interactive that generates StatusLines instead of bytes"""
-    def readline(self) -> StatusLine | None:
-        line = super().readline()
+    def readline(self, timeout: float | None = 0) -> StatusLine | None:
+        line = super().readline(timeout=timeout)
         return StatusLine.from_line(line) if line else None
 
     def __enter__(self) -> "StatusInteractive":
         return super().__enter__()
 
     def readlines(
-        self, yield_empty: bool = True
+        self, yield_empty: bool = True, timeout: float | None = None
     ) -> Generator[StatusLine | None, Any, Any]:
-        while True:
-            try:
-                line = self.readline()
-                if line != None or yield_empty:
-                    yield line
-            except:
-                break
+        yield from super().readlines(yield_empty=yield_empty, timeout=timeout)
 
-    def wait_for_status(self, *code: str) -> list[StatusLine]:
+    def wait_for_status(
+        self, *code: str, timeout: float | None = None
+    ) -> list[StatusLine]:
         """Waits for status(es) to appear in the output, then returns logs up to that point
 
         Arguments:
             *code (StatusCode): Any number of StatusCodes to look for
+            timeout (float | None, optional): Maximum time to wait between lines. Defaults to None.
+
+        Raises:
+            TimeoutError: If no line arrives within `timeout`
+            ExecutionError: If the process exits before the status appears
 
         Returns:
             list[StatusLine]: List of log lines
         """
         lines: list[StatusLine] = []
-        for line in self.readlines():
-            if line:
-                lines.append(line)
-                if line.is_status and (len(code) == 0 or line.code in code):
-                    return lines
+        for line in self.readlines(yield_empty=False, timeout=timeout):
+            lines.append(line)
+            if line.is_status and (len(code) == 0 or line.code in code):
+                return lines
+
+        raise ExecutionError(
+            "\n".join([i.content for i in lines]) or "Process exited unexpectedly"
+        )
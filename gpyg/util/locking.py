@@ -0,0 +1,142 @@
+import asyncio
+from threading import Lock, get_ident
+import time
+from typing import Any
+
+from pydantic import BaseModel, computed_field
+
+
+class LockMetrics(BaseModel):
+    """Snapshot of a WriterLock's contention counters. Times are in seconds."""
+
+    acquisitions: int = 0
+    contended: int = 0
+    wait_time: float = 0.0
+    max_wait: float = 0.0
+    hold_time: float = 0.0
+
+    @computed_field
+    @property
+    def mean_wait(self) -> float:
+        """Average time an acquisition waited for the lock
+
+        Returns:
+            float: Mean wait, or 0 if the lock was never acquired
+        """
+        return self.wait_time / self.acquisitions if self.acquisitions > 0 else 0.0
+
+
+class WriterLock:
+    """Reentrant lock that serializes keyring mutations within a process, recording how long callers waited for it.
+    Only the outermost acquisition of a thread (or, through `async with`, of an asyncio task) is counted, so nested
+    mutating operations are measured once.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._counters = Lock()
+        self._owner: Any = None
+        self._depth = 0
+        self._acquired_at = 0.0
+        self._metrics = LockMetrics()
+
+    def __enter__(self) -> "WriterLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.release()
+
+    async def __aenter__(self) -> "WriterLock":
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, *args, **kwargs) -> None:
+        self.release(owner=asyncio.current_task())
+
+    @property
+    def locked(self) -> bool:
+        """Whether any thread holds the lock
+
+        Returns:
+            bool: True if held
+        """
+        return self._lock.locked()
+
+    def _acquired(self, owner: Any, start: float, contended: bool) -> None:
+        self._acquired_at = time.perf_counter()
+        self._owner = owner
+        self._depth = 1
+
+        waited = self._acquired_at - start
+        with self._counters:
+            self._metrics.acquisitions += 1
+            self._metrics.contended += 1 if contended else 0
+            self._metrics.wait_time += waited
+            self._metrics.max_wait = max(self._metrics.max_wait, waited)
+
+    def acquire(self) -> None:
+        """Acquires the lock, blocking until it is available"""
+        if self._owner == get_ident():
+            self._depth += 1
+            return
+
+        start = time.perf_counter()
+        contended = not self._lock.acquire(blocking=False)
+        if contended:
+            self._lock.acquire()
+        self._acquired(get_ident(), start, contended)
+
+    async def acquire_async(self) -> None:
+        """Acquires the lock for the current asyncio task, waiting for it in a worker thread so the event loop keeps running"""
+        task = asyncio.current_task()
+        if self._owner is task:
+            self._depth += 1
+            return
+
+        start = time.perf_counter()
+        contended = not self._lock.acquire(blocking=False)
+        if contended:
+            waiter = asyncio.ensure_future(asyncio.to_thread(self._lock.acquire))
+            try:
+                await asyncio.shield(waiter)
+            except asyncio.CancelledError:
+                # The worker thread still takes the lock; hand it straight back
+                waiter.add_done_callback(lambda _: self._lock.release())
+                raise
+        self._acquired(task, start, contended)
+
+    def release(self, owner: Any = None) -> None:
+        """Releases one level of the lock
+
+        Args:
+            owner (Any, optional): Asyncio task that holds the lock, or None for the calling thread. Defaults to None.
+
+        Raises:
+            RuntimeError: If the caller does not hold the lock
+        """
+        if self._owner != (owner if owner != None else get_ident()):
+            raise RuntimeError("Cannot release a WriterLock held by another thread")
+        self._depth -= 1
+        if self._depth > 0:
+            return
+
+        held = time.perf_counter() - self._acquired_at
+        self._owner = None
+        self._lock.release()
+        with self._counters:
+            self._metrics.hold_time += held
+
+    def metrics(self) -> LockMetrics:
+        """Returns a snapshot of the lock's counters
+
+        Returns:
+            LockMetrics: Current counters
+        """
+        with self._counters:
+            return self._metrics.model_copy()
+
+    def reset_metrics(self) -> None:
+        """Resets all counters to zero"""
+        with self._counters:
+            self._metrics = LockMetrics()
@@ -0,0 +1,713 @@
+from base64 import b64decode, b64encode
+from collections.abc import Generator, Iterable
+import hashlib
+from typing import Any, BinaryIO, Literal
+
+PUBLIC_KEY = 6
+"""Packet tag of a primary public key"""
+
+SECRET_KEY = 5
+"""Packet tag of a primary secret key"""
+
+PUBLIC_SUBKEY = 14
+"""Packet tag of a public subkey"""
+
+USER_ID = 13
+"""Packet tag of a user ID"""
+
+USER_ATTRIBUTE = 17
+"""Packet tag of a user attribute (ie a photo ID)"""
+
+SIGNATURE = 2
+"""Packet tag of a signature"""
+
+PUBLIC_KEY_SESSION_KEY = 1
+"""Packet tag of a public-key encrypted session key (one per recipient of an encrypted message)"""
+
+SYMMETRIC_SESSION_KEY = 3
+"""Packet tag of a symmetric-key (passphrase) encrypted session key"""
+
+MARKER = 10
+"""Packet tag of the obsolete marker packet, which may precede a message"""
+
+WILDCARD_KEY_ID = "0000000000000000"
+"""Key ID of anonymous recipients (ie from `--throw-keyids`)"""
+
+CURVES = {
+    bytes.fromhex("2B06010401DA470F01"): ("ed25519", 255),
+    bytes.fromhex("2B060104019755010501"): ("cv25519", 255),
+    bytes.fromhex("2A8648CE3D030107"): ("nistp256", 256),
+    bytes.fromhex("2B81040022"): ("nistp384", 384),
+    bytes.fromhex("2B81040023"): ("nistp521", 521),
+    bytes.fromhex("2B2403030208010107"): ("brainpoolP256r1", 256),
+    bytes.fromhex("2B240303020801010B"): ("brainpoolP384r1", 384),
+    bytes.fromhex("2B240303020801010D"): ("brainpoolP512r1", 512),
+    bytes.fromhex("2B8104000A"): ("secp256k1", 256),
+    bytes.fromhex("2B6571"): ("ed448", 448),
+    bytes.fromhex("2B656F"): ("cv448", 448),
+}
+"""Curve OID -> (gpg curve name, key length) of the ECC curves gpg knows"""
+
+
+class PacketError(ValueError):
+    """Raised when binary OpenPGP data is malformed or truncated"""
+
+
+def iter_packets(data: bytes | memoryview) -> Generator[tuple[int, int, int, int], Any, None]:
+    """Walks the packet headers of binary (non-armored) OpenPGP data without copying it
+
+    Args:
+        data (bytes | memoryview): Binary OpenPGP data
+
+    Raises:
+        PacketError: If a header is invalid or a packet is truncated
+
+    Yields:
+        tuple[int, int, int, int]: `(tag, start, body_start, end)` offsets for each packet
+    """
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        start = offset
+        first = view[offset]
+        if not first & 0x80:
+            raise PacketError(f"Invalid packet header at offset {offset}")
+
+        if first & 0x40:
+            tag = first & 0x3F
+            offset += 1
+            body_start = None
+            while True:
+                if offset >= len(view):
+                    raise PacketError(f"Truncated packet header at offset {start}")
+                octet = view[offset]
+                if octet < 192:
+                    length, offset = octet, offset + 1
+                    partial = False
+                elif octet < 224:
+                    if offset + 1 >= len(view):
+                        raise PacketError(f"Truncated packet header at offset {start}")
+                    length = ((octet - 192) << 8) + view[offset + 1] + 192
+                    offset, partial = offset + 2, False
+                elif octet == 255:
+                    if offset + 4 >= len(view):
+                        raise PacketError(f"Truncated packet header at offset {start}")
+                    length = int.from_bytes(view[offset + 1 : offset + 5], "big")
+                    offset, partial = offset + 5, False
+                else:
+                    length, offset, partial = 1 << (octet & 0x1F), offset + 1, True
+
+                if body_start == None:
+                    body_start = offset
+                offset += length
+                if not partial:
+                    break
+        else:
+            tag = (first >> 2) & 0x0F
+            length_type = first & 0x03
+            if length_type == 3:
+                body_start, offset = offset + 1, len(view)
+            else:
+                size = 1 << length_type
+                if offset + size >= len(view):
+                    raise PacketError(f"Truncated packet header at offset {start}")
+                length = int.from_bytes(view[offset + 1 : offset + 1 + size], "big")
+                body_start = offset + 1 + size
+                offset = body_start + length
+
+        if offset > len(view):
+            raise PacketError(f"Truncated packet at offset {start}")
+        yield tag, start, body_start, offset
+
+
+def key_fingerprint(body: bytes | memoryview) -> str:
+    """Computes the fingerprint of a public or secret key packet
+
+    Args:
+        body (bytes | memoryview): Packet body (without its header)
+
+    Raises:
+        PacketError: If the key version is unsupported
+
+    Returns:
+        str: Upper-case hex fingerprint
+    """
+    version = body[0]
+    if version == 4:
+        # The public part ends where secret key material would start: version, time, algorithm + MPIs
+        public = _public_key_body(body)
+        return hashlib.sha1(b"\x99" + len(public).to_bytes(2, "big") + public).hexdigest().upper()
+    if version in (5, 6):
+        public = _public_key_body(body)
+        prefix = b"\x9a" if version == 5 else b"\x9b"
+        return hashlib.sha256(prefix + len(public).to_bytes(4, "big") + public).hexdigest().upper()
+    raise PacketError(f"Unsupported key version {version}")
+
+
+def _public_key_body(body: bytes | memoryview) -> bytes:
+    body = bytes(body)
+    version = body[0]
+    if version in (5, 6):
+        # Version 5/6 keys carry an explicit length of their public key material
+        material = int.from_bytes(body[6:10], "big")
+        return body[: 10 + material]
+
+    algorithm = body[5]
+    offset = 6
+    count = {1: 2, 2: 2, 3: 2, 16: 3, 17: 4, 18: 0, 19: 0, 22: 0}.get(algorithm)
+    if algorithm in (18, 19, 22):
+        # ECC: curve OID, then MPI point (plus KDF parameters for ECDH)
+        offset += 1 + body[offset]
+        offset = _skip_mpi(body, offset)
+        if algorithm == 18:
+            offset += 1 + body[offset]
+        return body[:offset]
+    if count == None:
+        raise PacketError(f"Unsupported public key algorithm {algorithm}")
+    for _ in range(count):
+        offset = _skip_mpi(body, offset)
+    return body[:offset]
+
+
+def _skip_mpi(body: bytes, offset: int) -> int:
+    bits = int.from_bytes(body[offset : offset + 2], "big")
+    return offset + 2 + (bits + 7) // 8
+
+
+def _read_mpis(body: bytes, offset: int, count: int) -> list[bytes]:
+    values = []
+    for _ in range(count):
+        end = _skip_mpi(body, offset)
+        values.append(body[offset + 2 : end])
+        offset = end
+    return values
+
+
+def _key_material(body: bytes) -> tuple[int, bytes | None, list[bytes]]:
+    # Returns (algorithm, curve OID, MPIs/points) of a v4/v5/v6 key packet body
+    version = body[0]
+    offset = 10 if version in (5, 6) else 6
+    algorithm = body[5]
+    if algorithm in (18, 19, 22):
+        oid = body[offset + 1 : offset + 1 + body[offset]]
+        return algorithm, oid, _read_mpis(body, offset + 1 + body[offset], 1)
+    count = {1: 2, 2: 2, 3: 2, 16: 3, 20: 3, 17: 4}.get(algorithm, 0)
+    return algorithm, None, _read_mpis(body, offset, count)
+
+
+def key_parameters(body: bytes | memoryview) -> tuple[int, int, str | None]:
+    """Reads the algorithm, length and curve of a public or secret key packet, as gpg lists them
+
+    Args:
+        body (bytes | memoryview): Packet body (without its header)
+
+    Returns:
+        tuple[int, int, str | None]: Algorithm ID, key length in bits (0 if unknown) and ECC curve name
+    """
+    algorithm, oid, values = _key_material(bytes(body))
+    if oid != None:
+        name, bits = CURVES.get(oid, (None, 0))
+        return algorithm, bits, name
+    if len(values) == 0:
+        return algorithm, 0, None
+    return algorithm, int.from_bytes(values[0], "big").bit_length(), None
+
+
+_CURVE_PARAMETERS = {
+    # Curve parameters as libgcrypt hashes them into keygrips: p, a, b, G (uncompressed), n
+    "ed25519": (
+        "7FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFED",
+        "01",
+        "2DFC9311D490018C7338BF8688861767FF8FF5B2BEBE27548A14B235ECA6874A",
+        "04216936D3CD6E53FEC0A4E231FDD6DC5C692CC7609525A7B2C9562D608F25D51A"
+        "6666666666666666666666666666666666666666666666666666666666666658",
+        "1000000000000000000000000000000014DEF9DEA2F79CD65812631A5CF5D3ED",
+    ),
+    "cv25519": (
+        "7FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFED",
+        "01DB41",
+        "01",
+        "040000000000000000000000000000000000000000000000000000000000000009"
+        "20AE19A1B8A086B4E01EDD2C7748D14C923D4D7E6D7C61B229E9C5A27ECED3D9",
+        "1000000000000000000000000000000014DEF9DEA2F79CD65812631A5CF5D3ED",
+    ),
+    "nistp256": (
+        "FFFFFFFF00000001000000000000000000000000FFFFFFFFFFFFFFFFFFFFFFFF",
+        "FFFFFFFF00000001000000000000000000000000FFFFFFFFFFFFFFFFFFFFFFFC",
+        "5AC635D8AA3A93E7B3EBBD55769886BC651D06B0CC53B0F63BCE3C3E27D2604B",
+        "046B17D1F2E12C4247F8BCE6E563A440F277037D812DEB33A0F4A13945D898C296"
+        "4FE342E2FE1A7F9B8EE7EB4A7C0F9E162BCE33576B315ECECBB6406837BF51F5",
+        "FFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551",
+    ),
+    "nistp384": (
+        "FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFE"
+        "FFFFFFFF0000000000000000FFFFFFFF",
+        "FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFE"
+        "FFFFFFFF0000000000000000FFFFFFFC",
+        "B3312FA7E23EE7E4988E056BE3F82D19181D9C6EFE8141120314088F5013875A"
+        "C656398D8A2ED19D2A85C8EDD3EC2AEF",
+        "04AA87CA22BE8B05378EB1C71EF320AD746E1D3B628BA79B9859F741E082542A"
+        "385502F25DBF55296C3A545E3872760AB73617DE4A96262C6F5D9E98BF9292DC"
+        "29F8F41DBD289A147CE9DA3113B5F0B8C00A60B1CE1D7E819D7A431D7C90EA0E5F",
+        "FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFC7634D81F4372DDF"
+        "581A0DB248B0A77AECEC196ACCC52973",
+    ),
+    "nistp521": (
+        "01FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF"
+        "FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF",
+        "01FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF"
+        "FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFC",
+        "51953EB9618E1C9A1F929A21A0B68540EEA2DA725B99B315F3B8B489918EF109"
+        "E156193951EC7E937B1652C0BD3BB1BF073573DF883D2C34F1EF451FD46B503F00",
+        "0400C6858E06B70404E9CD9E3ECB662395B4429C648139053FB521F828AF606B4D"
+        "3DBAA14B5E77EFE75928FE1DC127A2FFA8DE3348B3C1856A429BF97E7E31C2E5BD66"
+        "011839296A789A3BC0045C8A5FB42C7D1BD998F54449579B446817AFBD17273E66"
+        "2C97EE72995EF42640C550B9013FAD0761353C7086A272C24088BE94769FD16650",
+        "01FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF"
+        "FA51868783BF2F966B7FCC0148F709A5D03BB5C9B8899C47AEBB6FB71E91386409",
+    ),
+}
+
+
+def _grip_element(name: str, value: bytes) -> bytes:
+    return f"(1:{name}{len(value)}:".encode() + value + b")"
+
+
+def _signed(value: bytes) -> bytes:
+    # libgcrypt's standard MPI format: a leading zero keeps the value positive
+    value = value.lstrip(b"\x00")
+    return b"\x00" + value if len(value) > 0 and value[0] & 0x80 else value
+
+
+def compute_keygrip(body: bytes | memoryview) -> str | None:
+    """Computes the keygrip (gpg-agent's protocol-independent key ID) of a public or secret key packet
+
+    Args:
+        body (bytes | memoryview): Packet body (without its header)
+
+    Returns:
+        str | None: Upper-case hex keygrip, or None for algorithms/curves whose keygrip isn't supported (brainpool, secp256k1, 448-bit curves)
+    """
+    algorithm, oid, values = _key_material(bytes(body))
+    if algorithm in (1, 2, 3) and len(values) == 2:
+        return hashlib.sha1(_signed(values[0])).hexdigest().upper()
+
+    elements = {17: "pqgy", 16: "pgy", 20: "pgy"}.get(algorithm)
+    if elements and len(values) == len(elements):
+        digest = hashlib.sha1()
+        for name, value in zip(elements, values):
+            digest.update(_grip_element(name, _signed(value)))
+        return digest.hexdigest().upper()
+
+    curve = CURVES.get(oid, (None, 0))[0] if oid != None else None
+    if curve not in _CURVE_PARAMETERS or len(values) != 1:
+        return None
+    digest = hashlib.sha1()
+    for name, value in zip("pabgn", _CURVE_PARAMETERS[curve]):
+        digest.update(_grip_element(name, bytes.fromhex(value)))
+    point = values[0]
+    if curve in ("ed25519", "cv25519") and point[:1] == b"\x40":
+        # Native (compressed) 25519 points are hashed without their 0x40 prefix
+        point = point[1:]
+    digest.update(_grip_element("q", point))
+    return digest.hexdigest().upper()
+
+
+class SignaturePacket:
+    """The fields of a signature packet needed to interpret a keyblock, read from its (hashed and unhashed) subpackets
+
+    Args:
+        signature_class (int): Signature type (ie 0x13 for a positive UID certification)
+        algorithm (int): Public key algorithm ID
+        hash_algorithm (int): Hash algorithm ID
+        created (int): Creation timestamp
+        issuer (str | None): Key ID of the issuer, if known
+        issuer_fingerprint (str | None): Fingerprint of the issuer, if included
+        expires (int | None): Seconds after creation when the signature expires. Defaults to None.
+        key_expires (int | None): Seconds after key creation when the signed key expires. Defaults to None.
+        key_flags (int | None): Key usage flags. Defaults to None.
+        primary_uid (bool): Whether the signed UID is marked as primary. Defaults to False.
+        exportable (bool): Whether the signature is exportable. Defaults to True.
+        revocation_reason (int | None): Reason code of a revocation. Defaults to None.
+    """
+
+    __slots__ = (
+        "signature_class",
+        "algorithm",
+        "hash_algorithm",
+        "created",
+        "issuer",
+        "issuer_fingerprint",
+        "expires",
+        "key_expires",
+        "key_flags",
+        "primary_uid",
+        "exportable",
+        "revocation_reason",
+    )
+
+    def __init__(
+        self,
+        signature_class: int,
+        algorithm: int,
+        hash_algorithm: int,
+        created: int,
+        issuer: str | None,
+        issuer_fingerprint: str | None,
+        expires: int | None = None,
+        key_expires: int | None = None,
+        key_flags: int | None = None,
+        primary_uid: bool = False,
+        exportable: bool = True,
+        revocation_reason: int | None = None,
+    ) -> None:
+        self.signature_class = signature_class
+        self.algorithm = algorithm
+        self.hash_algorithm = hash_algorithm
+        self.created = created
+        self.issuer = issuer
+        self.issuer_fingerprint = issuer_fingerprint
+        self.expires = expires
+        self.key_expires = key_expires
+        self.key_flags = key_flags
+        self.primary_uid = primary_uid
+        self.exportable = exportable
+        self.revocation_reason = revocation_reason
+
+    @property
+    def is_revocation(self) -> bool:
+        """Whether this is a key, subkey or certification revocation
+
+        Returns:
+            bool: True for revocations
+        """
+        return self.signature_class in (0x20, 0x28, 0x30)
+
+    def __repr__(self) -> str:
+        return f"SignaturePacket(0x{self.signature_class:02X}, issuer={self.issuer!r}, created={self.created})"
+
+
+def parse_signature(body: bytes | memoryview) -> SignaturePacket:
+    """Parses a signature packet
+
+    Args:
+        body (bytes | memoryview): Packet body (without its header)
+
+    Raises:
+        PacketError: If the signature version is unsupported or the packet is truncated
+
+    Returns:
+        SignaturePacket: The parsed signature
+    """
+    body = bytes(body)
+    version = body[0] if len(body) > 0 else None
+    if version in (2, 3):
+        if len(body) < 19:
+            raise PacketError("Truncated signature packet")
+        return SignaturePacket(
+            signature_class=body[2],
+            algorithm=body[15],
+            hash_algorithm=body[16],
+            created=int.from_bytes(body[3:7], "big"),
+            issuer=body[7:15].hex().upper(),
+            issuer_fingerprint=None,
+        )
+    if version not in (4, 5, 6):
+        raise PacketError(f"Unsupported signature version {version}")
+
+    size = 4 if version == 6 else 2
+    hashed_length = int.from_bytes(body[4 : 4 + size], "big")
+    hashed = body[4 + size : 4 + size + hashed_length]
+    offset = 4 + size + hashed_length
+    unhashed_length = int.from_bytes(body[offset : offset + size], "big")
+    unhashed = body[offset + size : offset + size + unhashed_length]
+    if len(hashed) != hashed_length or len(unhashed) != unhashed_length:
+        raise PacketError("Truncated signature packet")
+
+    signature = SignaturePacket(
+        signature_class=body[1],
+        algorithm=body[2],
+        hash_algorithm=body[3],
+        created=0,
+        issuer=None,
+        issuer_fingerprint=None,
+    )
+    for area, trusted in ((hashed, True), (unhashed, False)):
+        for kind, data in _iter_subpackets(area):
+            if kind == 16 and signature.issuer == None:
+                signature.issuer = data.hex().upper()
+            elif kind == 33 and signature.issuer_fingerprint == None and len(data) > 1:
+                signature.issuer_fingerprint = data[1:].hex().upper()
+            elif not trusted:
+                # Everything else only counts if it is covered by the signature
+                continue
+            elif kind == 2:
+                signature.created = int.from_bytes(data, "big")
+            elif kind == 3:
+                signature.expires = int.from_bytes(data, "big") or None
+            elif kind == 4:
+                signature.exportable = data[:1] != b"\x00"
+            elif kind == 9:
+                signature.key_expires = int.from_bytes(data, "big") or None
+            elif kind == 25:
+                signature.primary_uid = data[:1] != b"\x00"
+            elif kind == 27:
+                signature.key_flags = data[0] if len(data) > 0 else 0
+            elif kind == 29 and len(data) > 0:
+                signature.revocation_reason = data[0]
+
+    if signature.issuer == None and signature.issuer_fingerprint:
+        fingerprint = signature.issuer_fingerprint
+        signature.issuer = fingerprint[-16:] if len(fingerprint) == 40 else fingerprint[:16]
+    return signature
+
+
+def _iter_subpackets(area: bytes) -> Generator[tuple[int, bytes], Any, None]:
+    offset = 0
+    while offset < len(area):
+        first = area[offset]
+        if first < 192:
+            length, offset = first, offset + 1
+        elif first < 255:
+            length = ((first - 192) << 8) + area[offset + 1] + 192
+            offset += 2
+        else:
+            length = int.from_bytes(area[offset + 1 : offset + 5], "big")
+            offset += 5
+        if length == 0 or offset + length > len(area):
+            raise PacketError("Malformed signature subpacket")
+        # The high bit of the type only marks the subpacket as critical
+        yield area[offset] & 0x7F, area[offset + 1 : offset + length]
+        offset += length
+
+
+def split_keys(
+    data: bytes | memoryview,
+) -> Generator[tuple[str, Literal["public", "secret"], bytes], Any, None]:
+    """Splits a binary export of several keys into one blob per primary key
+
+    Args:
+        data (bytes | memoryview): Binary OpenPGP data, as from `gpg --export`
+
+    Raises:
+        PacketError: If the data is malformed or doesn't start with a key
+
+    Yields:
+        tuple[str, public | secret, bytes]: Fingerprint, key type and binary data of each key
+    """
+    view = memoryview(data)
+    current: tuple[str, str, int] | None = None
+    for tag, start, body_start, end in iter_packets(view):
+        if tag in (PUBLIC_KEY, SECRET_KEY):
+            if current:
+                yield current[0], current[1], bytes(view[current[2] : start])
+            current = (
+                key_fingerprint(view[body_start:end]),
+                "public" if tag == PUBLIC_KEY else "secret",
+                start,
+            )
+        elif current == None:
+            raise PacketError("Key data does not start with a primary key packet")
+
+    if current:
+        yield current[0], current[1], bytes(view[current[2] :])
+
+
+def _crc24_table() -> list[int]:
+    table = []
+    for index in range(256):
+        crc = index << 16
+        for _ in range(8):
+            crc <<= 1
+            if crc & 0x1000000:
+                crc ^= 0x1864CFB
+        table.append(crc & 0xFFFFFF)
+    return table
+
+
+_CRC24_TABLE = _crc24_table()
+
+
+def crc24(data: bytes) -> int:
+    """Computes the OpenPGP armor checksum
+
+    Args:
+        data (bytes): Binary data
+
+    Returns:
+        int: 24-bit CRC
+    """
+    crc = 0xB704CE
+    table = _CRC24_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFF) ^ table[(crc >> 16) ^ byte]
+    return crc
+
+
+def armor(data: bytes, block: str = "PGP PUBLIC KEY BLOCK") -> bytes:
+    """ASCII-armors binary OpenPGP data, in the same layout gpg uses
+
+    Args:
+        data (bytes): Binary data
+        block (str, optional): Armor header label. Defaults to "PGP PUBLIC KEY BLOCK".
+
+    Returns:
+        bytes: Armored data, without a trailing newline
+    """
+    encoded = b64encode(data)
+    lines = [encoded[i : i + 64] for i in range(0, len(encoded), 64)]
+    return b"\n".join(
+        [
+            f"-----BEGIN {block}-----".encode(),
+            b"",
+            *lines,
+            b"=" + b64encode(crc24(data).to_bytes(3, "big")),
+            f"-----END {block}-----".encode(),
+        ]
+    )
+
+
+class _MessageReader:
+    # Pulls exactly as many bytes as requested from bytes, a binary file or an iterable of chunks
+    def __init__(self, source: bytes | memoryview | BinaryIO | Iterable[bytes], chunk_size: int) -> None:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.chunks = iter([bytes(source)])
+        elif hasattr(source, "read"):
+            self.chunks = iter(lambda: source.read(chunk_size), b"")
+        else:
+            self.chunks = iter(source)
+        self.buffer = b""
+
+    def fill(self, size: int) -> bytes:
+        while len(self.buffer) < size:
+            chunk = next(self.chunks, None)
+            if chunk == None:
+                break
+            self.buffer += chunk
+        return self.buffer[:size]
+
+    def read(self, size: int) -> bytes:
+        result = self.fill(size)
+        self.buffer = self.buffer[len(result) :]
+        return result
+
+    def lines(self) -> Generator[bytes, Any, None]:
+        while True:
+            end = self.buffer.find(b"\n")
+            while end < 0:
+                chunk = next(self.chunks, None)
+                if chunk == None:
+                    if self.buffer:
+                        yield self.buffer
+                        self.buffer = b""
+                    return
+                end = len(self.buffer) + chunk.find(b"\n") if b"\n" in chunk else -1
+                self.buffer += chunk
+            line, self.buffer = self.buffer[:end], self.buffer[end + 1 :]
+            yield line.rstrip(b"\r")
+
+
+def _dearmor(reader: _MessageReader) -> Generator[bytes, Any, None]:
+    lines = reader.lines()
+    for line in lines:
+        if line.startswith(b"-----BEGIN PGP"):
+            break
+    for line in lines:
+        # Armor headers (ie "Comment: ...") end at the first blank line
+        if line.strip() == b"":
+            break
+
+    pending = b""
+    for line in lines:
+        line = line.strip()
+        if line.startswith(b"-----") or (line.startswith(b"=") and len(line) == 5):
+            break
+        pending += line
+        usable = len(pending) - len(pending) % 4
+        if usable > 0:
+            yield b64decode(pending[:usable])
+            pending = pending[usable:]
+    if pending:
+        yield b64decode(pending + b"=" * (-len(pending) % 4))
+
+
+def scan_recipients(
+    source: bytes | memoryview | BinaryIO | Iterable[bytes], chunk_size: int = 4096
+) -> list[str]:
+    """Reads the recipients of an encrypted message from its leading session key packets, without
+    touching the encrypted payload. Only the bytes up to the first packet that isn't a session key are consumed.
+
+    Args:
+        source (bytes | memoryview | BinaryIO | Iterable[bytes]): Armored or binary message, as bytes, a binary file or an iterable of chunks
+        chunk_size (int, optional): Bytes read from files at a time. Defaults to 4096.
+
+    Raises:
+        PacketError: If the data isn't an OpenPGP message or a session key packet is malformed
+
+    Returns:
+        list[str]: Upper-case key IDs (fingerprints for v6 session keys) of each recipient, in message order. Anonymous recipients are listed as `WILDCARD_KEY_ID`.
+    """
+    reader = _MessageReader(source, chunk_size)
+    while reader.fill(1)[:1].isspace():
+        reader.read(1)
+    if reader.fill(1)[:1] == b"-":
+        reader = _MessageReader(_dearmor(reader), chunk_size)
+
+    recipients = []
+    while True:
+        first = reader.fill(1)
+        if len(first) == 0:
+            break
+        if not first[0] & 0x80:
+            raise PacketError("Not an OpenPGP message")
+
+        first = first[0]
+        if first & 0x40:
+            tag = first & 0x3F
+            header = reader.fill(6)
+            if len(header) < 2:
+                raise PacketError("Truncated packet header")
+            if header[1] < 192:
+                length, size = header[1], 2
+            elif header[1] < 224:
+                if len(header) < 3:
+                    raise PacketError("Truncated packet header")
+                length, size = ((header[1] - 192) << 8) + header[2] + 192, 3
+            elif header[1] == 255:
+                if len(header) < 6:
+                    raise PacketError("Truncated packet header")
+                length, size = int.from_bytes(header[2:6], "big"), 6
+            else:
+                length, size = None, 2
+        else:
+            tag = (first >> 2) & 0x0F
+            size = 1 + (1 << (first & 0x03)) if first & 0x03 != 3 else 1
+            header = reader.fill(size)
+            if len(header) < size:
+                raise PacketError("Truncated packet header")
+            length = int.from_bytes(header[1:], "big") if size > 1 else None
+
+        if tag not in (PUBLIC_KEY_SESSION_KEY, SYMMETRIC_SESSION_KEY, MARKER):
+            # The encrypted payload (or any other packet) starts here
+            break
+        if length == None:
+            raise PacketError("Session key packets cannot have partial lengths")
+
+        reader.read(size)
+        body = reader.read(length)
+        if len(body) < length:
+            raise PacketError("Truncated session key packet")
+        if tag == PUBLIC_KEY_SESSION_KEY:
+            recipients.append(_session_key_recipient(body))
+    return recipients
+
+
+def _session_key_recipient(body: bytes) -> str:
+    if len(body) >= 9 and body[0] == 3:
+        return body[1:9].hex().upper()
+    if len(body) >= 2 and body[0] == 6:
+        # v6: length of (key version + fingerprint), which is empty for anonymous recipients
+        if body[1] == 0:
+            return WILDCARD_KEY_ID
+        return body[3 : 2 + body[1]].hex().upper()
+    raise PacketError(f"Unsupported session key packet version {body[0] if body else None}")
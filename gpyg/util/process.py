@@ -1,12 +1,227 @@
-from collections.abc import Generator
+from collections import deque
+from collections.abc import Callable, Generator, Iterable
+from datetime import datetime
 from io import BytesIO
+import os
 import re
+import selectors
 import shlex
+import shutil
 import subprocess
 import threading
 import time
 from traceback import print_exc
-from typing import Any, Literal
+from typing import Any, BinaryIO, Literal
+
+from pydantic import BaseModel
+
+from .status import StatusLine
+
+CHUNK_SIZE = 64 * 1024
+"""Maximum number of bytes moved through a pipe in a single read/write"""
+
+InputSource = str | bytes | BinaryIO | Iterable[bytes]
+
+
+def iter_chunks(
+    source: InputSource | None, chunk_size: int = CHUNK_SIZE
+) -> Generator[bytes, Any, None]:
+    """Normalizes an input source into an iterator of bounded byte chunks
+
+    Args:
+        source (str | bytes | BinaryIO | Iterable[bytes] | None): Data, a readable binary object, or an iterable of chunks
+        chunk_size (int, optional): Maximum size of each chunk. Defaults to CHUNK_SIZE.
+
+    Yields:
+        Generator[bytes, Any, None]: Chunks of at most `chunk_size` bytes
+    """
+    if source == None:
+        return
+    if isinstance(source, str):
+        source = source.encode()
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for offset in range(0, len(view), chunk_size):
+            yield view[offset : offset + chunk_size]
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        for chunk in source:
+            view = memoryview(chunk.encode() if isinstance(chunk, str) else chunk)
+            for offset in range(0, len(view), chunk_size):
+                yield view[offset : offset + chunk_size]
+
+
+def pump(
+    popen: subprocess.Popen,
+    input: InputSource | None = None,
+    timeout: float | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    status: BinaryIO | None = None,
+) -> Generator[tuple[Literal["stdout", "stderr", "status"], bytes], Any, None]:
+    """Full-duplex pump: feeds STDIN while draining STDOUT and STDERR at the same time.
+
+    Nothing is buffered beyond a single chunk per pipe, so neither side can block the other
+    regardless of payload size. STDIN is closed once the input is exhausted.
+
+    Args:
+        popen (subprocess.Popen): Process to pump. Any of its standard streams may be PIPEs.
+        input (InputSource | None, optional): Data to feed to STDIN. Defaults to None.
+        timeout (float | None, optional): Overall time limit, or no limit. Defaults to None.
+        chunk_size (int, optional): Maximum bytes per read/write. Defaults to CHUNK_SIZE.
+        status (BinaryIO | None, optional): Readable end of a status pipe to drain as well. Defaults to None.
+
+    Raises:
+        subprocess.TimeoutExpired: If the timeout elapses before the process closes its output
+
+    Yields:
+        tuple[stdout | stderr | status, bytes]: Pairs of (stream name, chunk) in the order they were read
+    """
+    deadline = time.monotonic() + timeout if timeout != None else None
+    chunks = iter_chunks(input, chunk_size=chunk_size)
+    pending = memoryview(b"")
+
+    with selectors.DefaultSelector() as selector:
+        if popen.stdin:
+            if input == None:
+                popen.stdin.close()
+            else:
+                os.set_blocking(popen.stdin.fileno(), False)
+                selector.register(popen.stdin, selectors.EVENT_WRITE)
+        if popen.stdout:
+            selector.register(popen.stdout, selectors.EVENT_READ, "stdout")
+        if popen.stderr:
+            selector.register(popen.stderr, selectors.EVENT_READ, "stderr")
+        if status and not status.closed:
+            selector.register(status, selectors.EVENT_READ, "status")
+
+        while selector.get_map():
+            remaining = None
+            if deadline != None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(popen.args, timeout)
+
+            for key, _ in selector.select(remaining):
+                if key.fileobj is popen.stdin:
+                    if len(pending) == 0:
+                        pending = memoryview(next(chunks, b""))
+                        if len(pending) == 0:
+                            selector.unregister(popen.stdin)
+                            popen.stdin.close()
+                            continue
+                    try:
+                        written = os.write(key.fd, pending)
+                    except BlockingIOError:
+                        continue
+                    except BrokenPipeError:
+                        selector.unregister(popen.stdin)
+                        popen.stdin.close()
+                        continue
+                    pending = pending[written:]
+                else:
+                    data = os.read(key.fd, chunk_size)
+                    if data:
+                        yield key.data, data
+                    else:
+                        selector.unregister(key.fileobj)
+                        key.fileobj.close()
+
+
+def pipe_input(data: str | bytes) -> int:
+    """Creates a pipe pre-filled with a small payload (ie a passphrase) and returns its read end,
+    for use with options like `--passphrase-fd` so that STDIN stays free for payload data.
+    The caller must pass the descriptor to the child and close it afterwards.
+
+    Args:
+        data (str | bytes): Payload, which must fit in the pipe buffer
+
+    Returns:
+        int: Readable file descriptor
+    """
+    read_fd, write_fd = os.pipe()
+    try:
+        os.write(write_fd, data.encode() if isinstance(data, str) else data)
+    finally:
+        os.close(write_fd)
+    return read_fd
+
+
+def pipe_source(
+    source: InputSource, chunk_size: int = CHUNK_SIZE
+) -> tuple[int, threading.Thread]:
+    """Streams an input source of any size into a new pipe from a background thread, and returns its read end.
+    Useful for handing several payloads to one process as separate descriptors (ie gpg's `-&<fd>` filenames).
+    The caller must pass the descriptor to the child and close it once the child has exited; the writer
+    thread stops on its own if the child stops reading.
+
+    Args:
+        source (InputSource): Data, a readable binary object, or an iterable of chunks
+        chunk_size (int, optional): Maximum size of each write. Defaults to CHUNK_SIZE.
+
+    Returns:
+        tuple[int, threading.Thread]: Readable file descriptor and the (started) writer thread
+    """
+    read_fd, write_fd = os.pipe()
+
+    def writer():
+        try:
+            for chunk in iter_chunks(source, chunk_size=chunk_size):
+                view = memoryview(chunk)
+                while len(view) > 0:
+                    view = view[os.write(write_fd, view) :]
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            os.close(write_fd)
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    return read_fd, thread
+
+
+class ProcessRecord(BaseModel):
+    """Metadata of a finished process, as kept in `ProcessSession.history`"""
+
+    pid: int
+    command: str
+    code: int | None
+    started: datetime
+    duration: float
+    bytes_in: int
+    bytes_out: int
+    bytes_err: int
+    output: str | bytes | None = None
+    errors: str | bytes | None = None
+
+    @classmethod
+    def from_process(cls, process: Any, retain_output: bool = False) -> "ProcessRecord":
+        """Creates a record from a finished Process or AsyncProcess
+
+        Args:
+            process (Process | AsyncProcess): Finished process
+            retain_output (bool, optional): Whether to keep the process's output and errors. Defaults to False.
+
+        Returns:
+            ProcessRecord: The record
+        """
+        return ProcessRecord(
+            pid=process.pid,
+            command=process.command,
+            code=process.code,
+            started=process.started,
+            duration=process.duration if process.duration != None else 0.0,
+            bytes_in=process.bytes_in,
+            bytes_out=process.bytes_out,
+            bytes_err=process.bytes_err,
+            output=process.output if retain_output else None,
+            errors=process.errors if retain_output else None,
+        )
 
 
 class Process:
@@ -18,6 +233,8 @@ class Process:
         command: str | list[str],
         options: dict[str, Any],
         decode_output: bool = True,
+        status_stream: BinaryIO | None = None,
+        on_exit: Callable[["Process"], None] | None = None,
     ):
         """Initialization routine
 
@@ -26,13 +243,75 @@ class Process:
             command (str | list[str]): The command being run
             options (dict[str, Any]): Options passed to the Popen constructor
             decode_output (bool, optional): Whether to convert the output to str. Defaults to True.
+            status_stream (BinaryIO | None, optional): Readable end of the process's `--status-fd` pipe. Defaults to None.
+            on_exit (Callable[[Process], None] | None, optional): Called once the process has finished and its output was collected. Defaults to None.
         """
         self.popen = popen
         self.options = options
-        self.command: str = shlex.join(command) if type(command) == list else command
+        self.argv = command
         self.output = "" if decode_output else b""
+        self.errors = "" if decode_output else b""
+        self.status: list[StatusLine] = []
+        self.status_stream = status_stream
         self.code: int | None = None
         self.decode = decode_output
+        self.on_exit = on_exit
+        self.started = datetime.now()
+        self.duration: float | None = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.bytes_err = 0
+        self._start = time.monotonic()
+
+    @property
+    def command(self) -> str:
+        """The command being run, quoted as a single string
+
+        Returns:
+            str: Command string
+        """
+        return shlex.join(self.argv) if type(self.argv) == list else self.argv
+
+    def _set_status(self, data: bytes):
+        self.status = [
+            StatusLine.from_line(line) for line in data.splitlines() if len(line) > 0
+        ]
+
+    def _counted(
+        self, input: InputSource | None, chunk_size: int = CHUNK_SIZE
+    ) -> Generator[bytes, Any, None] | None:
+        if input == None:
+            return None
+
+        def chunks():
+            for chunk in iter_chunks(input, chunk_size=chunk_size):
+                self.bytes_in += len(chunk)
+                yield chunk
+
+        return chunks()
+
+    def _returncode(self) -> int | None:
+        return self.popen.poll()
+
+    def _exited(self):
+        if self.code == None:
+            return
+        if self.duration == None:
+            self.duration = time.monotonic() - self._start
+        if self.on_exit != None:
+            callback, self.on_exit = self.on_exit, None
+            callback(self)
+
+    def get_status(self, *code: str) -> list[StatusLine]:
+        """Gets all status lines matching any of the given codes
+
+        Arguments:
+            *code (str): Any number of StatusCodes to look for, or none for all lines
+
+        Returns:
+            list[StatusLine]: Matching status lines
+        """
+        return [i for i in self.status if len(code) == 0 or i.code in code]
 
     @property
     def pid(self) -> int:
@@ -70,41 +349,110 @@ class Process:
         if self.poll() == None:
             self.popen.stdin.write(data)
             self.popen.stdin.flush()
+            self.bytes_in += len(data)
 
     def wait(
-        self, timeout: float | None = None, kill_on_timeout: bool = True
+        self,
+        timeout: float | None = None,
+        kill_on_timeout: bool = True,
+        input: InputSource | None = None,
     ) -> int | None:
-        """Waits for a timeout/for the process to stop
+        """Waits for a timeout/for the process to stop, feeding `input` to STDIN while reading output
 
         Args:
             timeout (float | None, optional): Time to wait, or no limit. Defaults to None.
             kill_on_timeout (bool, optional): Whether to kill the process on timeout. Defaults to True.
+            input (InputSource | None, optional): Data to stream to STDIN. Defaults to None.
 
         Returns:
             int | None: The returncode
         """
         if self.code == None:
+            streams = {"stdout": BytesIO(), "stderr": BytesIO(), "status": BytesIO()}
+            output, errors = streams["stdout"], streams["stderr"]
             try:
-                self.output = (
-                    self.popen.communicate(timeout=timeout)[0].decode()
-                    if self.decode
-                    else self.popen.communicate(timeout=timeout)[0]
-                )
+                for name, chunk in pump(
+                    self.popen,
+                    input=self._counted(input),
+                    timeout=timeout,
+                    status=self.status_stream,
+                ):
+                    streams[name].write(chunk)
+                self.popen.wait()
             except subprocess.TimeoutExpired:
                 if kill_on_timeout:
                     self.kill()
-
-            return self.poll()
+            finally:
+                if self.status_stream:
+                    self.status_stream.close()
+
+            self.bytes_out = output.tell()
+            self.bytes_err = errors.tell()
+            self.output = output.getvalue().decode(errors="replace") if self.decode else output.getvalue()
+            self.errors = errors.getvalue().decode(errors="replace") if self.decode else errors.getvalue()
+            self._set_status(streams["status"].getvalue())
+            code = self.poll()
+            self._exited()
+            return code
         else:
             return self.code
 
+    def stream(
+        self,
+        input: InputSource | None = None,
+        timeout: float | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Generator[bytes, Any, None]:
+        """Yields STDOUT chunks as they are produced while streaming `input` to STDIN.
+        Output is not retained in `output`; STDERR (if piped separately) is collected into `errors`.
+        The process is killed if the generator is closed early.
+
+        Args:
+            input (InputSource | None, optional): Data to stream to STDIN. Defaults to None.
+            timeout (float | None, optional): Overall time limit, or no limit. Defaults to None.
+            chunk_size (int, optional): Maximum size of each chunk. Defaults to CHUNK_SIZE.
+
+        Yields:
+            Generator[bytes, Any, None]: STDOUT chunks
+        """
+        errors = BytesIO()
+        status = BytesIO()
+        try:
+            for name, chunk in pump(
+                self.popen,
+                input=self._counted(input, chunk_size=chunk_size),
+                timeout=timeout,
+                chunk_size=chunk_size,
+                status=self.status_stream,
+            ):
+                if name == "stdout":
+                    self.bytes_out += len(chunk)
+                    yield chunk
+                else:
+                    (errors if name == "stderr" else status).write(chunk)
+            self.popen.wait()
+        finally:
+            self.kill()
+            if self.status_stream:
+                self.status_stream.close()
+            self.bytes_err = errors.tell()
+            self.errors = errors.getvalue().decode(errors="replace") if self.decode else errors.getvalue()
+            self._set_status(status.getvalue())
+            self.poll()
+            self._exited()
+
     def send_line(self, line: str):
         if self.poll() == None:
             self.write(line.encode().strip() + b"\n")
 
 
 class ProcessSession:
-    """A persistent session that creates Processes"""
+    """A persistent session that creates Processes.
+
+    Running processes are tracked in `processes` until their `wait`/`stream` completes. Processes that exit
+    without being waited on are evicted on the next `spawn` (or `reap`). Only a bounded `history` of metadata
+    is kept about finished processes, and their output only if `retain_output` is set.
+    """
 
     def __init__(
         self,
@@ -112,6 +460,9 @@ class ProcessSession:
         environment: dict[str, str] | None = None,
         working_directory: str | None = None,
         cleanup_mode: Literal["kill", "wait", "ignore"] = "kill",
+        executables: dict[str, str] | None = None,
+        history_size: int = 0,
+        retain_output: bool = False,
     ) -> None:
         """Initialization routine
 
@@ -120,6 +471,9 @@ class ProcessSession:
             environment (dict[str, str] | None, optional): Environment vars. Defaults to None.
             working_directory (str | None, optional): Workding directory path. Defaults to None.
             cleanup_mode (kill | wait | ignore, optional): What to do when deactivated to all child processes. Defaults to "kill".
+            executables (dict[str, str] | None, optional): Absolute paths of program names, which are otherwise looked up (once) on the session's PATH. Defaults to None.
+            history_size (int, optional): Number of finished processes to keep a ProcessRecord of, or 0 to keep none. Defaults to 0.
+            retain_output (bool, optional): Whether records in `history` keep the processes' output and errors. Defaults to False.
         """
         self.default_options = {
             "shell": shell,
@@ -128,6 +482,10 @@ class ProcessSession:
         }
         self.cleanup = cleanup_mode
         self.processes: dict[int, Process] = {}
+        self.executables: dict[str, str] = dict(executables) if executables else {}
+        self.retain_output = retain_output
+        self.history: deque[ProcessRecord] = deque(maxlen=history_size)
+        self._lock = threading.Lock()
 
     def make_kwargs(self, **passed_kwargs: dict[str, Any]) -> dict[str, Any]:
         """Utility function to remove duplicate kwargs from defaults
@@ -150,21 +508,26 @@ class ProcessSession:
         Returns:
             ProcessSession: The activated session
         """
-        self.processes = {}
+        with self._lock:
+            self.processes = {}
         return self
 
     def deactivate(self):
         """Deactivates the Session and cleans up"""
         match self.cleanup:
             case "kill":
-                for pid, process in list(self.processes.items()):
+                with self._lock:
+                    running, self.processes = self.processes, {}
+                for process in running.values():
                     process.kill()
-                    del self.processes[pid]
 
             case "wait":
-                for process in self.processes.values():
+                with self._lock:
+                    running = list(self.processes.values())
+                for process in running:
                     if process.poll() == None:
                         process.popen.communicate()
+                self.reap()
 
             case _:
                 pass
@@ -175,26 +538,117 @@ class ProcessSession:
     def __exit__(self, *args, **kwargs):
         self.deactivate()
 
-    def parse_cmd(self, cmd: str | list[str], shell: bool) -> str | list[str]:
-        """Parse a command with shlex and return a quoted and escaped version
+    def reap(self) -> int:
+        """Evicts processes that have exited from `processes`. Their Process objects remain usable,
+        and are recorded in `history` once their output has been collected.
+
+        Returns:
+            int: Number of evicted processes
+        """
+        with self._lock:
+            running = list(self.processes.values())
+        exited = [process for process in running if process._returncode() != None]
+        with self._lock:
+            for process in exited:
+                if self.processes.get(process.pid) is process:
+                    del self.processes[process.pid]
+        return len(exited)
+
+    def _register(self, process: Any) -> Any:
+        # A pid can only have been reused once the previous holder exited, so replacing it is safe
+        with self._lock:
+            self.processes[process.pid] = process
+        return process
+
+    def _evict(self, process: Any) -> None:
+        record = (
+            ProcessRecord.from_process(process, retain_output=self.retain_output)
+            if self.history.maxlen
+            else None
+        )
+        with self._lock:
+            if self.processes.get(process.pid) is process:
+                del self.processes[process.pid]
+            if record != None:
+                self.history.append(record)
+
+    def resolve_executable(
+        self, program: str, environment: dict[str, str] | None = None
+    ) -> str:
+        """Resolves a program name to an absolute path, searching the PATH the child would be spawned with.
+        Lookups against the session's own environment are cached, so each program is only searched for once.
+
+        Args:
+            program (str): Program name or path
+            environment (dict[str, str] | None, optional): Environment the program will run with, or the session's. Defaults to None.
+
+        Returns:
+            str: Absolute path, or `program` unchanged if it contains a directory or was not found
+        """
+        if os.sep in program:
+            return program
+        cached = environment == None or environment is self.default_options["env"]
+        if cached and program in self.executables:
+            return self.executables[program]
+
+        resolved = shutil.which(
+            program,
+            path=os.pathsep.join(
+                os.get_exec_path(
+                    environment if environment != None else self.default_options["env"]
+                )
+            ),
+        )
+        if resolved == None:
+            return program
+        resolved = os.path.abspath(resolved)
+        if cached:
+            self.executables[program] = resolved
+        return resolved
+
+    def parse_cmd(
+        self,
+        cmd: str | list[str],
+        shell: bool,
+        environment: dict[str, str] | None = None,
+    ) -> str | list[str]:
+        """Parse a command into the form Popen expects. Argument lists are used as-is and strings are split once;
+        outside of shell mode, the program is resolved to an absolute path.
 
         Args:
             cmd (str | list[str]): Command to parse
             shell (bool): Whether to run in shell mode or not
+            environment (dict[str, str] | None, optional): Environment the command will run with, or the session's. Defaults to None.
 
         Returns:
             str | list[str]: Parsed command
         """
-        if type(cmd) == list:
-            result = shlex.join(cmd)
-        else:
-            result = shlex.join(shlex.split(cmd))
-
-        if not shell:
-            result = shlex.split(result)
+        if shell:
+            return shlex.join(cmd) if type(cmd) == list else shlex.join(shlex.split(cmd))
 
+        result = list(cmd) if type(cmd) == list else shlex.split(cmd)
+        if len(result) > 0:
+            result[0] = self.resolve_executable(result[0], environment)
         return result
 
+    def with_status_fd(
+        self, command: str | list[str], fd: int
+    ) -> str | list[str]:
+        """Inserts `--status-fd <fd>` directly after the program name of a parsed command
+
+        Args:
+            command (str | list[str]): Parsed command
+            fd (int): Status file descriptor
+
+        Returns:
+            str | list[str]: Updated command
+        """
+        if type(command) == list:
+            return [command[0], "--status-fd", str(fd), *command[1:]]
+
+        program, _, arguments = command.partition(" ")
+        return f"{program} --status-fd {fd} {arguments}".strip()
+
     def spawn(
         self,
         command: str | list[str],
@@ -202,6 +656,9 @@ class ProcessSession:
         environment: dict[str, str] | None = None,
         working_directory: str | None = None,
         decode: bool = True,
+        merge_stderr: bool = False,
+        pass_fds: tuple[int, ...] = (),
+        status: bool = False,
     ) -> Process:
         """Spawns a process, then returns to the caller
 
@@ -211,26 +668,54 @@ class ProcessSession:
             environment (dict[str, str] | None, optional): Environment override. Defaults to None.
             working_directory (str | None, optional): Working directory. Defaults to None.
             decode (bool, optional): Whether to decode the output bytes. Defaults to True.
+            merge_stderr (bool, optional): Whether to merge STDERR into STDOUT, or pipe it separately. Defaults to False.
+            pass_fds (tuple[int, ...], optional): Extra file descriptors to leave open in the child. Defaults to ().
+            status (bool, optional): Whether to pass a dedicated `--status-fd` pipe to the (gpg) command, collected into `Process.status`. Defaults to False.
 
         Returns:
             Process: Running Process
         """
+        self.reap()
         options = self.make_kwargs(shell=shell, env=environment, cwd=working_directory)
         parsed_command = self.parse_cmd(
-            command, shell=bool(options.get("shell", False))
+            command, shell=bool(options.get("shell", False)), environment=options.get("env")
         )
 
-        popen = subprocess.Popen(
-            parsed_command,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            **options,
-        )
-        self.processes[popen.pid] = Process(
-            popen, parsed_command, options, decode_output=decode
+        status_read, status_write = os.pipe() if status else (None, None)
+        if status:
+            parsed_command = self.with_status_fd(parsed_command, status_write)
+            pass_fds = (*pass_fds, status_write)
+
+        # Descriptors opened by Python are non-inheritable, so the close_fds sweep is only needed to honor
+        # pass_fds. Without it (and with an absolute program path), CPython can spawn through posix_spawn.
+        try:
+            popen = subprocess.Popen(
+                parsed_command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
+                pass_fds=pass_fds,
+                close_fds=len(pass_fds) > 0,
+                **options,
+            )
+        except:
+            if status:
+                os.close(status_read)
+            raise
+        finally:
+            if status:
+                os.close(status_write)
+
+        return self._register(
+            Process(
+                popen,
+                parsed_command,
+                options,
+                decode_output=decode,
+                status_stream=open(status_read, "rb", buffering=0) if status else None,
+                on_exit=self._evict,
+            )
         )
-        return self.processes[popen.pid]
 
     def run(
         self,
@@ -240,7 +725,10 @@ class ProcessSession:
         working_directory: str | None = None,
         timeout: int | None = None,
         decode: bool = True,
-        input: str | bytes | None = None,
+        input: InputSource | None = None,
+        merge_stderr: bool = False,
+        pass_fds: tuple[int, ...] = (),
+        status: bool = False,
     ) -> Process:
         """Runs a Process & waits for it to complete.
 
@@ -251,34 +739,67 @@ class ProcessSession:
             working_directory (str | None, optional): Working directory. Defaults to None.
             timeout (int | None, optional): How long to wait, or no wait limit. Defaults to None.
             decode (bool, optional): Whether to decode the output. Defaults to True.
-            input (str | bytes | None, optional): String/bytes to send to STDIN. Defaults to None.
+            input (InputSource | None, optional): String/bytes, a readable binary object, or an iterable of chunks to stream to STDIN. Defaults to None.
+            merge_stderr (bool, optional): Whether to merge STDERR into STDOUT, or pipe it separately. Defaults to False.
+            pass_fds (tuple[int, ...], optional): Extra file descriptors to leave open in the child. Defaults to ().
+            status (bool, optional): Whether to pass a dedicated `--status-fd` pipe to the (gpg) command, collected into `Process.status`. Defaults to False.
 
         Returns:
             Process: Finished Process
         """
-        options = self.make_kwargs(shell=shell, env=environment, cwd=working_directory)
-        parsed_command = self.parse_cmd(
-            command, shell=bool(options.get("shell", False))
-        )
-
-        popen = subprocess.Popen(
-            parsed_command,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            **options,
+        process = self.spawn(
+            command,
+            shell=shell,
+            environment=environment,
+            working_directory=working_directory,
+            decode=decode,
+            merge_stderr=merge_stderr,
+            pass_fds=pass_fds,
+            status=status,
         )
-        self.processes[popen.pid] = Process(
-            popen, parsed_command, options, decode_output=decode
+        process.wait(
+            timeout=timeout, kill_on_timeout=True, input=input if input else None
         )
+        return process
 
-        if input:
-            self.processes[popen.pid].write(
-                input.encode() if type(input) == str else input
-            )
+    def stream(
+        self,
+        command: str | list[str],
+        input: InputSource | None = None,
+        shell: bool | None = None,
+        environment: dict[str, str] | None = None,
+        working_directory: str | None = None,
+        timeout: int | None = None,
+        pass_fds: tuple[int, ...] = (),
+        status: bool = False,
+    ) -> Generator[bytes, Any, Process]:
+        """Runs a Process, streaming `input` to STDIN and yielding STDOUT chunks as they arrive.
+        STDERR is kept separate from the yielded payload.
 
-        self.processes[popen.pid].wait(timeout=timeout, kill_on_timeout=True)
-        return self.processes[popen.pid]
+        Args:
+            command (str | list[str]): Command to run
+            input (InputSource | None, optional): String/bytes, a readable binary object, or an iterable of chunks to stream to STDIN. Defaults to None.
+            shell (bool | None, optional): Whether to run in shell. Defaults to None.
+            environment (dict[str, str] | None, optional): Environment var override. Defaults to None.
+            working_directory (str | None, optional): Working directory. Defaults to None.
+            timeout (int | None, optional): How long to wait, or no wait limit. Defaults to None.
+            pass_fds (tuple[int, ...], optional): Extra file descriptors to leave open in the child. Defaults to ().
+            status (bool, optional): Whether to pass a dedicated `--status-fd` pipe to the (gpg) command, collected into `Process.status`. Defaults to False.
+
+        Yields:
+            Generator[bytes, Any, Process]: STDOUT chunks, returning the finished Process
+        """
+        process = self.spawn(
+            command,
+            shell=shell,
+            environment=environment,
+            working_directory=working_directory,
+            decode=False,
+            pass_fds=pass_fds,
+            status=status,
+        )
+        yield from process.stream(input=input, timeout=timeout)
+        return process
 
     def __getitem__(self, pid: int) -> Process:
         return self.processes[pid]
@@ -0,0 +1,74 @@
+import fnmatch
+import os
+import shutil
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+FICLONE = 0x40049409
+"""Linux ioctl that shares a file's extents with another file (reflink) on btrfs/xfs"""
+
+SNAPSHOT_EXCLUDE = ["S.*", "*.lock", ".#lk*", "*~", "random_seed", "*.tmp"]
+"""Homedir entries that are never captured: agent sockets, lock files, backups and runtime state"""
+
+
+def clone_file(source: str, target: str) -> None:
+    """Copies a file as cheaply as the filesystem allows: a reflink where supported, otherwise a regular copy.
+    Files are never hardlinked, since gpg-agent rewrites key files in place (ie on passphrase changes).
+
+    Args:
+        source (str): File to copy
+        target (str): Destination path
+    """
+    if fcntl:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            except OSError:
+                shutil.copyfileobj(src, dst)
+    else:
+        shutil.copyfile(source, target)
+    shutil.copystat(source, target)
+
+
+def clone_homedir(source: str, target: str) -> str:
+    """Clones a gpg homedir, skipping sockets and lock files
+
+    Args:
+        source (str): Homedir (or snapshot) to clone
+        target (str): Destination, which must not exist or be empty
+
+    Raises:
+        FileExistsError: If `target` is not empty
+
+    Returns:
+        str: The absolute target path
+    """
+    target = os.path.abspath(target)
+    if os.path.isdir(target) and len(os.listdir(target)) > 0:
+        raise FileExistsError(f"{target} is not empty")
+    os.makedirs(target, mode=0o700, exist_ok=True)
+    os.chmod(target, 0o700)
+
+    for root, directories, files in os.walk(source):
+        relative = os.path.relpath(root, source)
+        destination = target if relative == "." else os.path.join(target, relative)
+        directories[:] = [
+            i
+            for i in directories
+            if not _excluded(i) and not os.path.islink(os.path.join(root, i))
+        ]
+        for name in directories:
+            os.mkdir(os.path.join(destination, name), mode=0o700)
+        for name in files:
+            path = os.path.join(root, name)
+            if _excluded(name) or not os.path.isfile(path) or os.path.islink(path):
+                continue
+            clone_file(path, os.path.join(destination, name))
+    return target
+
+
+def _excluded(name: str) -> bool:
+    return any([fnmatch.fnmatch(name, pattern) for pattern in SNAPSHOT_EXCLUDE])
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, computed_field
+
+
+class StatusLine(BaseModel):
+    """Representation of a single status line
+    See https://github.com/gpg/gnupg/blob/master/doc/DETAILS
+    """
+    content: str
+    code: str | None = None
+    arguments: list[str] | None = None
+
+    @computed_field
+    @property
+    def is_status(self) -> bool:
+        """Determines if a line is a status line or not (ie contains a status code)
+
+        Returns:
+            bool: Whether this line is status
+        """
+        return self.code != None
+
+    @classmethod
+    def from_line(cls, line: bytes) -> "StatusLine":
+        """Creates a StatusLine from raw bytes
+
+        Args:
+            line (bytes): Input data
+
+        Returns:
+            StatusLine: A constructed StatusLine
+        """
+        decoded = line.decode(errors="replace").rstrip("\n")
+        if decoded.startswith("[GNUPG:]"):
+            return StatusLine(
+                content=decoded,
+                code=decoded.split(" ")[1].strip(),
+                arguments=decoded.split(" ")[2:],
+            )
+        else:
+            return StatusLine(content=decoded)
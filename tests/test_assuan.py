@@ -0,0 +1,59 @@
+import hashlib
+import os
+import pytest
+from gpyg import *
+
+SHA256_INFO = bytes.fromhex("3031300d060960864801650304020105000420")
+
+
+def public_numbers(client: AssuanClient, keygrip: str) -> tuple[int, int]:
+    key = parse_sexp(client.readkey(keygrip))
+    params = {i[0]: int.from_bytes(i[1], "big") for i in key[1][1:]}
+    return params[b"n"], params[b"e"]
+
+
+def test_sexp():
+    value = [b"sig-val", [b"rsa", [b"s", 65537]]]
+    assert encode_sexp(value) == b"(7:sig-val(3:rsa(1:s3:\x01\x00\x01)))"
+    assert parse_sexp(encode_sexp(value)) == [b"sig-val", [b"rsa", [b"s", b"\x01\x00\x01"]]]
+
+
+def test_agent_operations(instance):
+    key = instance.keys.generate_key("Agent User", passphrase="agent")
+    with AssuanClient(instance.homedir) as client:
+        assert client.havekey(key.keygrip)
+        assert not client.havekey("0" * 40)
+        info = client.keyinfo(key.keygrip)
+        assert info.storage == "disk" and info.protection == "protected"
+
+        digest = hashlib.sha256(b"data").digest()
+        with pytest.raises(AssuanError):
+            client.pksign(key.keygrip, digest, passphrase="wrong")
+
+        signature = parse_sexp(client.pksign(key.keygrip, digest, passphrase="agent"))
+        n, e = public_numbers(client, key.keygrip)
+        value = pow(int.from_bytes(signature[1][1][1], "big"), e, n)
+        assert value.to_bytes((n.bit_length() + 7) // 8, "big").endswith(SHA256_INFO + digest)
+
+        keygrip = key.subkeys[0].keygrip
+        n, e = public_numbers(client, keygrip)
+        size = (n.bit_length() + 7) // 8
+        padding = bytes([i % 255 + 1 for i in os.urandom(size - 3 - 4)])
+        message = int.from_bytes(b"\x00\x02" + padding + b"\x00" + b"data", "big")
+        result = client.pkdecrypt(
+            keygrip, encode_sexp([b"enc-val", [b"rsa", [b"a", pow(message, e, n)]]])
+        )
+        assert parse_sexp(result)[1].endswith(b"\x00data")
+
+
+def test_agent_pool(instance):
+    key = instance.keys.generate_key("Pool User")
+    with AgentPool(instance.homedir, size=1) as pool:
+        with pool.connection() as client:
+            assert client.havekey(key.keygrip)
+        with pool.connection() as reused:
+            assert reused is client
+            with pool.connection() as other:
+                assert other is not client
+        assert client.closed and not other.closed
+    assert other.closed
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import time
+from gpyg import *
+
+
+def test_async_process_session():
+    async def run():
+        async with AsyncProcessSession() as session:
+            DATA = b"0123456789" * 500000
+            result = await session.run(["cat"], decode=False, input=DATA)
+            assert result.code == 0
+            assert result.output == DATA
+
+            undecodable = await session.run(["sh", "-c", "printf 'M\\374ller' >&2"])
+            assert undecodable.errors == "M\ufffdller"
+
+            chunks = [chunk async for chunk in session.stream(["cat"], input=DATA)]
+            assert b"".join(chunks) == DATA
+
+            process = await session.spawn(["cat", "/dev/zero"], decode=False)
+            stream = process.stream()
+            assert len(await anext(stream)) > 0
+            await stream.aclose()
+            assert process.code != None
+
+            # Blocking sync sources must not stall the event loop while they are read
+            def slow_source():
+                for _ in range(5):
+                    time.sleep(0.05)
+                    yield b"x" * 10
+
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticker = asyncio.ensure_future(tick())
+            result = await session.run(["cat"], decode=False, input=slow_source())
+            ticker.cancel()
+            assert result.output == b"x" * 50
+            assert ticks > 10
+
+    asyncio.run(run())
+
+
+def test_async_operations(homedir):
+    async def run():
+        with AsyncGPG(homedir=homedir, kill_existing_agent=True) as gpg:
+            key = await gpg.keys.generate_key(
+                "Async User", email="async@example.com", passphrase="async"
+            )
+            assert key != None
+            assert (await gpg.keys.get_key(key.fingerprint)).fingerprint == key.fingerprint
+
+            DATA = b"test-data"
+            encrypted = await asyncio.gather(
+                *[gpg.messages.encrypt(DATA, key) for _ in range(8)]
+            )
+            decrypted = await asyncio.gather(
+                *[gpg.messages.decrypt(i, key, passphrase="async") for i in encrypted]
+            )
+            assert all([i == DATA for i in decrypted])
+
+            recipients = await gpg.messages.get_recipients(encrypted[0])
+            assert recipients[0].key_id == key.key_id
+
+            signed = await gpg.messages.sign(DATA, key, passphrase="async")
+            assert (await gpg.messages.verify(signed))[0][0] == key.key_id
+
+            streamed = b"".join(
+                [chunk async for chunk in gpg.messages.encrypt_stream([DATA] * 1000, key)]
+            )
+            assert await gpg.messages.decrypt(streamed, passphrase="async") == DATA * 1000
+
+            assert [i.fingerprint async for i in gpg.keys.iter_keys()] == [key.fingerprint]
+
+            report = await gpg.keys.import_keys(key.export())
+            assert [i.status for i in report.keys] == ["unchanged"]
+
+            exported = await gpg.keys.export_keys([key], split=True)
+            assert exported == {key.fingerprint: key.export()}
+
+            # Generating and importing both went through the writer lock
+            assert gpg.lock_metrics.acquisitions == 2
+
+    asyncio.run(run())
+
+
+def test_async_writer_lock():
+    lock = WriterLock()
+
+    async def run():
+        held, release = threading.Event(), threading.Event()
+
+        def hold():
+            with lock:
+                held.set()
+                release.wait()
+
+        async def write():
+            async with lock:
+                async with lock:
+                    assert lock.locked
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        held.wait()
+        writer = asyncio.ensure_future(write())
+        await asyncio.sleep(0.05)
+        assert not writer.done()
+        release.set()
+        await writer
+        thread.join()
+        assert not lock.locked
+        assert lock.metrics().acquisitions == 2 and lock.metrics().contended == 1
+
+        # A cancelled waiter must not leave the lock held
+        held.clear()
+        release.clear()
+        thread = threading.Thread(target=hold)
+        thread.start()
+        held.wait()
+        waiter = asyncio.ensure_future(lock.acquire_async())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        release.set()
+        thread.join()
+        await asyncio.sleep(0.05)
+        assert not lock.locked
+
+    asyncio.run(run())
+
+
+def test_async_key_pool(tmp_path):
+    with AsyncGPG(homedir=str(tmp_path), kill_existing_agent=True) as gpg:
+        pool = gpg.attach_pool(size=2, low_water=0)
+        assert pool.wait(timeout=120)
+
+        key = asyncio.run(
+            gpg.keys.generate_key("Pool User", email="pool@example.com", passphrase="pool")
+        )
+        assert [i.uid for i in key.user_ids] == ["Pool User <pool@example.com>"]
+        assert key.check_password("pool")
+        assert pool.available == 1
+
+
+def test_async_key_index(tmp_path):
+    with AsyncGPG(
+        homedir=str(tmp_path), kill_existing_agent=True, index_keys=True, process_history=20
+    ) as gpg:
+
+        async def run():
+            key = await gpg.keys.generate_key("Indexed", email="indexed@example.com")
+            spawned = len(gpg.async_session.history)
+            assert spawned > 0
+
+            # Served from the index, without running gpg through the async session
+            assert (await gpg.keys.get_key(key.key_id)).fingerprint == key.fingerprint
+            assert [k.fingerprint for k in await gpg.keys.list_keys()] == [key.fingerprint]
+            found = await gpg.keys.get_keys(key.fingerprint, "indexed@example.com")
+            assert all([i.fingerprint == key.fingerprint for i in found.values()])
+            assert len(gpg.async_session.history) == spawned
+
+        asyncio.run(run())
@@ -0,0 +1,22 @@
+from gpyg.models import *
+from gpyg.models.infolines import RECORD_TYPES
+
+LISTING = """tru::1:1760723963:0:3:1:5
+sec:u:3072:1:A246697166D89628:1760723963:::u:::scESC:::+:::23::0:
+fpr:::::::::0F9C7E3C5A0A7F1C6AE0F1D5A246697166D89628:
+grp:::::::::2C8F4A6C1A3B0E6F1C9D8E7A6B5C4D3E2F1A0B9C:
+uid:u::::1760723963::9B3C0E2D8F1A4B5C6D7E8F9A0B1C2D3E4F5A6B7C::Test User <test@example.com>::::::::::0:
+sig:!::1:A246697166D89628:1760723963::::Test User <test@example.com>:13x::0F9C7E3C5A0A7F1C6AE0F1D5A246697166D89628:::10:
+rev:!::22:A246697166D89628:1760723999::::Test User <test@example.com>:30x::0F9C7E3C5A0A7F1C6AE0F1D5A246697166D89628:::10:
+ssb:u:255:18:5E1B7C2A9D4F6E3B:1760723963:1792259963:::::e:::+::cv25519::
+fpr:::::::::1A2B3C4D5E6F7A8B9C0D1E2F3A4B5C6D5E1B7C2A:"""
+
+
+def test_records_match_models():
+    for line in LISTING.splitlines():
+        record = parse_record(line)
+        model = RECORD_TYPES[record.record_type].model.from_line(line)
+        assert record.to_model().model_dump() == model.model_dump()
+        assert record.field_array == model.field_array
+        for name in type(model).model_computed_fields:
+            assert getattr(record, name) == getattr(model, name)
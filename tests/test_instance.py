@@ -1,19 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
 from gpyg import *
+from gpyg.util import agent_running
 
 
 def test_instance_creation(homedir):
-    instance = GPG(homedir=homedir, kill_existing_agent=True)
-    assert instance.session
-    assert instance._config == None
-    assert instance.config == instance._config
+    with GPG(homedir=homedir, kill_existing_agent=True) as instance:
+        assert instance.session
+        assert instance._config == None
+        assert instance.config == instance._config
 
 
 def test_instance_config(homedir):
-    instance = GPG(homedir=homedir, kill_existing_agent=True)
-    assert instance.config.version
-    assert len(instance.config.compression_algorithms) > 0
-    assert len(instance.config.digest_algorithms) > 0
-    assert len(instance.config.symmetric_algorithms) > 0
-    assert len(instance.config.public_key_algorithms) > 0
-    assert len(instance.config.ecc_curves) > 0
-    assert instance.keys
+    with GPG(homedir=homedir, kill_existing_agent=True) as instance:
+        assert instance.config.version
+        assert len(instance.config.compression_algorithms) > 0
+        assert len(instance.config.digest_algorithms) > 0
+        assert len(instance.config.symmetric_algorithms) > 0
+        assert len(instance.config.public_key_algorithms) > 0
+        assert len(instance.config.ecc_curves) > 0
+        assert instance.keys
+
+
+def test_snapshot(instance, tmp_path):
+    key = instance.keys.generate_key("Snapshot User", passphrase="snapshot")
+    snapshot = instance.snapshot(str(tmp_path / "snapshot"))
+
+    with GPG.from_snapshot(snapshot, str(tmp_path / "first")) as first:
+        cloned = first.keys.get_key(key.fingerprint, key_type="secret")
+        assert cloned.check_password("snapshot")
+        cloned.delete()
+        assert first.keys.list_keys() == []
+
+    with GPG.from_snapshot(snapshot, str(tmp_path / "second")) as second:
+        assert [k.fingerprint for k in second.keys.list_keys()] == [key.fingerprint]
+
+
+def test_agent_lifecycle(tmp_path):
+    first_home, second_home = str(tmp_path / "first"), str(tmp_path / "second")
+    os.mkdir(first_home, mode=0o700)
+    os.mkdir(second_home, mode=0o700)
+
+    first = GPG(homedir=first_home, kill_existing_agent=True)
+    second = GPG(homedir=second_home, kill_existing_agent=True)
+    assert agent_running(first_home) and agent_running(second_home)
+
+    # Restarting one homedir's agent must not touch the other's
+    restarted = GPG(homedir=first_home, kill_existing_agent=True)
+    assert agent_running(second_home)
+    first.close()
+    assert agent_running(first_home)
+    restarted.close()
+    assert not agent_running(first_home)
+
+    with GPG(homedir=second_home, index_keys=True) as shared:
+        assert shared.warmup() is shared
+        assert shared._config != None
+    assert agent_running(second_home)
+    second.close()
+    assert not agent_running(second_home)
+
+
+def test_threaded_instance(instance):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        configs = list(executor.map(lambda _: instance.config, range(8)))
+        assert all([config is configs[0] for config in configs])
+
+        generated = [
+            executor.submit(
+                instance.keys.generate_key, f"Thread User {n}", algorithm="ed25519"
+            )
+            for n in range(4)
+        ]
+        listings = [executor.submit(instance.keys.list_keys) for _ in range(8)]
+        fingerprints = {future.result().fingerprint for future in generated}
+        assert all([future.result() != None for future in listings])
+
+    assert {k.fingerprint for k in instance.keys.list_keys()} >= fingerprints
+    metrics = instance.lock_metrics
+    assert metrics.acquisitions == 4 and metrics.contended > 0
+    assert metrics.max_wait > 0 and metrics.hold_time > 0
+    assert instance.session.processes == {}
+
+    with instance.writer, instance.writer:
+        assert instance.writer.locked
+    assert not instance.writer.locked
+    assert instance.lock_metrics.acquisitions == 5
@@ -0,0 +1,58 @@
+from gpyg import *
+
+
+def _comparable(key: KeyModel) -> dict:
+    # Validity and owner trust come from the trust database, which the keybox doesn't hold
+    def strip(value):
+        if isinstance(value, dict):
+            return {
+                k: strip(v)
+                for k, v in value.items()
+                if k not in ("validity", "owner_trust", "field_array")
+            }
+        if isinstance(value, list):
+            return [strip(i) for i in value]
+        return value
+
+    return strip(key.model_dump())
+
+
+def test_keybox_listing(environment):
+    signer, signee = environment.keys.list_keys()[2:4]
+    signee.add_subkey(algorithm="ed25519", usage=["auth"])
+    signee = signee.add_user_id(name="Revoked UID", email="revoked:uid@example.com")
+    signee.revoke_uid("Revoked UID <revoked:uid@example.com>")
+    signer.sign_key(signee)
+
+    listed = environment.keys.list_keys(check_sigs=False)
+    parsed = environment.keybox.keys()
+    assert [_comparable(k) for k in parsed] == [_comparable(k) for k in listed]
+    assert all([isinstance(k, Key) for k in parsed])
+
+    revoked = [u for u in parsed[3].user_ids if u.uid.startswith("Revoked UID")][0]
+    assert revoked.validity == FieldValidity.REVOKED
+    assert parsed[0].validity == FieldValidity.UNKNOWN_VALIDITY
+
+
+def test_keybox_lookup(environment):
+    key = environment.keys.generate_key("Keybox Lookup", passphrase=None)
+    subkey = key.subkeys[0]
+
+    reader = KeyboxReader(environment.keybox.path)
+    assert reader.get_key(key.fingerprint).fingerprint == key.fingerprint
+    assert reader.get_key(subkey.key_id).fingerprint == key.fingerprint
+    assert type(reader.get_key(key.fingerprint)) == KeyModel
+    assert reader.fingerprints() == [k.fingerprint for k in environment.keys.list_keys()]
+
+    key.delete()
+    assert reader.get_key(key.fingerprint) == None
+    reader.close()
+    assert KeyboxReader("/nonexistent/pubring.kbx").keys() == []
+
+
+def test_async_keybox(environment_snapshot, tmp_path):
+    # Keys read from the keybox keep their blocking methods, even on an AsyncGPG
+    with AsyncGPG.from_snapshot(environment_snapshot, str(tmp_path / "async")) as gpg:
+        key = gpg.keybox.keys()[0]
+        assert key.reload().fingerprint == key.fingerprint
+        assert len(key.user_ids) > 0
@@ -1,3 +1,6 @@
+from concurrent.futures import ProcessPoolExecutor
+import io
+import pytest
 from gpyg import *
 
 
@@ -22,6 +25,33 @@ def test_recipients(smallenv):
     assert recipients[0].key_id == key.key_id
 
 
+def test_scan_recipients(smallenv):
+    env, key = smallenv
+    other = env.keys.generate_key("Other Recipient", passphrase=None)
+    expected = [key.subkeys[0].key_id, other.subkeys[0].key_id]
+
+    armored = env.messages.encrypt(b"test-data" * 1000, key, other)
+    binary = env.messages.encrypt(b"test-data", key, other, format="pgp")
+    assert scan_recipients(armored) == expected
+    assert scan_recipients(binary) == expected
+    assert scan_recipients(io.BytesIO(binary)) == expected
+    assert scan_recipients([armored[i : i + 7] for i in range(0, len(armored), 7)]) == expected
+
+    # Only the session key packets are consumed, never the payload
+    stream = io.BytesIO(binary)
+    scan_recipients(stream, chunk_size=1)
+    assert stream.tell() < len(binary) - 9
+
+    assert scan_recipients(env.messages.encrypt_symmetric(b"test-data", "test")) == []
+    assert [
+        i.fingerprint
+        for i in env.messages.get_recipients(io.BytesIO(binary), include=["known"])
+    ] == [key.fingerprint, other.fingerprint]
+    with pytest.raises(ExecutionError):
+        env.messages.get_recipients(b"not a message")
+    other.delete()
+
+
 def test_sign(smallenv):
     env, key = smallenv
     DATA = b"test-data"
@@ -41,3 +71,55 @@ def test_symmetric(smallenv):
     assert encrypted != DATA
     decrypted = env.messages.decrypt(encrypted, passphrase="test")
     assert decrypted == DATA
+
+
+def test_streaming(smallenv):
+    env, key = smallenv
+    DATA = b"0123456789abcdef" * 65536
+    encrypted = io.BytesIO()
+    assert env.messages.encrypt_stream(io.BytesIO(DATA), key, output=encrypted) == None
+    encrypted.seek(0)
+    decrypted = b"".join(
+        env.messages.decrypt_stream(encrypted, key, passphrase="user")
+    )
+    assert decrypted == DATA
+
+    signature = b"".join(
+        env.messages.sign_stream(
+            (DATA[i : i + 4096] for i in range(0, len(DATA), 4096)),
+            key,
+            mode="detach",
+            passphrase="user",
+        )
+    )
+    assert len(env.messages.verify(DATA, signature=signature)) == 1
+
+
+def test_batch(smallenv):
+    env, key = smallenv
+    DATA = [f"message-{i}".encode() for i in range(12)]
+    encrypted = env.messages.encrypt_many(DATA, key, concurrency=4)
+    assert encrypted.failed == 0
+    decrypted = env.messages.decrypt_many(
+        encrypted.values + [b"not encrypted"], key, passphrase="user", concurrency=4
+    )
+    assert decrypted.values[:-1] == DATA
+    assert decrypted.failed == 1
+    assert isinstance(decrypted.results[-1].error, ExecutionError)
+
+    signatures = env.messages.sign_many(
+        DATA, key, mode="detach", passphrase="user", pool="process", concurrency=2
+    )
+    assert signatures.succeeded == len(DATA)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        shared = env.messages.sign_many(
+            DATA[:4], key, mode="detach", passphrase="user", pool=executor
+        )
+    assert shared.succeeded == 4
+    verified = list(
+        env.messages.verify_many(
+            zip(DATA, signatures.values), concurrency=4, as_completed=True
+        )
+    )
+    assert sorted([i.index for i in verified]) == list(range(len(DATA)))
+    assert all([i.value[0][0] == key.key_id for i in verified])
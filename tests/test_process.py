@@ -0,0 +1,97 @@
+import io
+import pytest
+from gpyg import ProcessSession
+from gpyg.util import StatusInteractive
+
+
+def test_large_payload_roundtrip():
+    DATA = bytes(range(256)) * (64 * 1024)
+    with ProcessSession() as session:
+        result = session.run(["cat"], decode=False, input=DATA, timeout=30)
+        assert result.code == 0
+        assert result.output == DATA
+
+
+def test_decoded_roundtrip():
+    with ProcessSession() as session:
+        result = session.run(["cat"], input="test-data\n" * 100000, timeout=30)
+        assert result.code == 0
+        assert result.output == "test-data\n" * 100000
+
+
+def test_undecodable_output():
+    # ie a latin-1 UID in a gpg diagnostic
+    with ProcessSession() as session:
+        result = session.run(["sh", "-c", "printf 'M\\374ller' >&2; printf 'M\\374ller'"])
+        assert result.code == 0
+        assert result.errors == "M\ufffdller"
+        assert result.output == "M\ufffdller"
+
+
+def test_stream_inputs():
+    DATA = b"0123456789" * 100000
+    with ProcessSession() as session:
+        from_file = session.run(["cat"], decode=False, input=io.BytesIO(DATA))
+        from_iter = session.run(
+            ["cat"], decode=False, input=(DATA[i : i + 777] for i in range(0, len(DATA), 777))
+        )
+        assert from_file.output == DATA
+        assert from_iter.output == DATA
+
+
+def test_interactive_status():
+    with ProcessSession() as session:
+        script = "read line; echo \"[GNUPG:] GOT_IT $line\"; sleep 5"
+        with StatusInteractive(session, ["sh", "-c", script]) as inter:
+            with pytest.raises(TimeoutError):
+                inter.wait_for_status("GOT_IT", timeout=0.2)
+            inter.writelines("hello")
+            lines = inter.wait_for_status("GOT_IT", timeout=5)
+            assert lines[-1].arguments == ["hello"]
+            inter.seek(0)
+            assert inter.read() == b"[GNUPG:] GOT_IT hello\n"
+
+
+def test_argv_commands():
+    with ProcessSession(environment={"PATH": "/usr/bin:/bin"}) as session:
+        argv = ["printf", "%s|", "two words", "it's", "$HOME"]
+        assert session.parse_cmd(argv, shell=False)[1:] == argv[1:]
+        result = session.run(argv)
+        assert result.code == 0
+        assert result.output == "two words|it's|$HOME|"
+
+        program = session.executables["printf"]
+        assert program.startswith("/") and program.endswith("/printf")
+        assert session.parse_cmd("printf 'a b'", shell=False) == [program, "a b"]
+        assert result.command.endswith("printf '%s|' 'two words' 'it'\"'\"'s' '$HOME'")
+
+        session.executables["printf"] = "/nonexistent/printf"
+        with pytest.raises(FileNotFoundError):
+            session.run(argv)
+
+
+def test_process_registry():
+    with ProcessSession(history_size=2) as session:
+        for n in range(3):
+            result = session.run(["cat"], input=f"run {n}\n")
+            assert result.output == f"run {n}\n"
+        assert session.processes == {}
+        assert len(session.history) == 2
+        record = session.history[-1]
+        assert record.pid == result.pid and record.code == 0
+        assert (record.bytes_in, record.bytes_out, record.bytes_err) == (6, 6, 0)
+        assert record.output == None and record.duration > 0
+
+        pending = session.spawn(["echo", "pending"])
+        pending.popen.wait()
+        assert list(session.processes) == [pending.pid]
+        chunks = list(session.stream(["cat"], input=b"x" * 1000))
+        assert b"".join(chunks) == b"x" * 1000
+        assert session.processes == {}
+        assert session.history[-1].bytes_out == 1000
+        assert pending.wait() == 0 and pending.output == "pending\n"
+        assert session.history[-1].pid == pending.pid
+
+        session.retain_output = True
+        session.run(["sh", "-c", "echo out; echo err >&2"])
+        assert (session.history[-1].output, session.history[-1].errors) == ("out\n", "err\n")